@@ -0,0 +1,30 @@
+"""add streaming metrics to runs
+
+Revision ID: 4e1d2c9a7b30
+Revises: 15f54049780b
+Create Date: 2026-10-17 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1d2c9a7b30'
+down_revision: Union[str, None] = '15f54049780b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add time-to-first-token and tokens/sec to runs."""
+    op.add_column('runs', sa.Column('ttft_ms', sa.Integer(), nullable=True))
+    op.add_column('runs', sa.Column('tokens_per_second', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove streaming metrics from runs."""
+    op.drop_column('runs', 'tokens_per_second')
+    op.drop_column('runs', 'ttft_ms')
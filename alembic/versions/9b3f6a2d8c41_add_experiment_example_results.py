@@ -0,0 +1,58 @@
+"""add experiment example results
+
+Revision ID: 9b3f6a2d8c41
+Revises: 4e1d2c9a7b30
+Create Date: 2026-10-17 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f6a2d8c41'
+down_revision: Union[str, None] = '4e1d2c9a7b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - per-example experiment results, keyed for reuse."""
+    op.create_table(
+        'experiment_example_results',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('experiment_id', sa.String(), nullable=False),
+        sa.Column('prompt_version_id', sa.String(), nullable=False),
+        sa.Column('golden_example_id', sa.String(), nullable=False),
+        sa.Column('template_hash', sa.String(length=64), nullable=False),
+        sa.Column('example_hash', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('judge_version', sa.String(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('hallucination_rate', sa.Float(), nullable=True),
+        sa.Column('reason', sa.Text(), nullable=True),
+        sa.Column('output', sa.Text(), nullable=True),
+        sa.Column('reused_from_id', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['prompt_version_id'], ['prompt_versions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['golden_example_id'], ['golden_examples.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'experiment_id', 'prompt_version_id', 'golden_example_id',
+            name='uq_experiment_example_cell'
+        ),
+    )
+    op.create_index(
+        'idx_example_results_cache_key',
+        'experiment_example_results',
+        ['template_hash', 'example_hash', 'model', 'judge_version'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop per-example experiment results."""
+    op.drop_index('idx_example_results_cache_key', table_name='experiment_example_results')
+    op.drop_table('experiment_example_results')
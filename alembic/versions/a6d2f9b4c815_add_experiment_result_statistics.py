@@ -0,0 +1,50 @@
+"""add experiment result statistics
+
+Revision ID: a6d2f9b4c815
+Revises: f1c3d8e6a274
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2f9b4c815'
+down_revision: Union[str, None] = 'f1c3d8e6a274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - distribution statistics on experiment results, integer counts."""
+    op.alter_column(
+        'experiment_results', 'failure_count',
+        existing_type=sa.Float(), type_=sa.Integer(),
+        postgresql_using='round(failure_count)::integer',
+    )
+    op.alter_column(
+        'experiment_results', 'total_examples',
+        existing_type=sa.Float(), type_=sa.Integer(),
+        postgresql_using='round(total_examples)::integer',
+    )
+    op.add_column('experiment_results', sa.Column('std_score', sa.Float(), nullable=True))
+    op.add_column('experiment_results', sa.Column('median_score', sa.Float(), nullable=True))
+    op.add_column('experiment_results', sa.Column('score_percentiles', sa.JSON(), nullable=True))
+    op.add_column('experiment_results', sa.Column('ci_low', sa.Float(), nullable=True))
+    op.add_column('experiment_results', sa.Column('ci_high', sa.Float(), nullable=True))
+    op.add_column('experiment_results', sa.Column('hallucination_histogram', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop distribution statistics, counts back to float."""
+    op.drop_column('experiment_results', 'hallucination_histogram')
+    op.drop_column('experiment_results', 'ci_high')
+    op.drop_column('experiment_results', 'ci_low')
+    op.drop_column('experiment_results', 'score_percentiles')
+    op.drop_column('experiment_results', 'median_score')
+    op.drop_column('experiment_results', 'std_score')
+    op.alter_column('experiment_results', 'total_examples', existing_type=sa.Integer(), type_=sa.Float())
+    op.alter_column('experiment_results', 'failure_count', existing_type=sa.Integer(), type_=sa.Float())
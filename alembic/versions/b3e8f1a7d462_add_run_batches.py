@@ -0,0 +1,45 @@
+"""add run batches
+
+Revision ID: b3e8f1a7d462
+Revises: a6d2f9b4c815
+Create Date: 2026-10-17 16:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8f1a7d462'
+down_revision: Union[str, None] = 'a6d2f9b4c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - run batches, and the batch of each run."""
+    op.create_table(
+        'run_batches',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('prompt_version_id', sa.String(), nullable=True),
+        sa.Column('model', sa.String(), nullable=True),
+        sa.Column('total_runs', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['prompt_version_id'], ['prompt_versions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.add_column('runs', sa.Column('batch_id', sa.String(), nullable=True))
+    op.create_foreign_key(
+        'fk_runs_batch_id', 'runs', 'run_batches', ['batch_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index('idx_runs_batch_status', 'runs', ['batch_id', 'status'])
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop run batches."""
+    op.drop_index('idx_runs_batch_status', table_name='runs')
+    op.drop_constraint('fk_runs_batch_id', 'runs', type_='foreignkey')
+    op.drop_column('runs', 'batch_id')
+    op.drop_table('run_batches')
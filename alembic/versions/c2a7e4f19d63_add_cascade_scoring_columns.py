@@ -0,0 +1,32 @@
+"""add cascade scoring columns
+
+Revision ID: c2a7e4f19d63
+Revises: 9b3f6a2d8c41
+Create Date: 2026-10-17 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a7e4f19d63'
+down_revision: Union[str, None] = '9b3f6a2d8c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - record which evaluator tier scored each result."""
+    for table in ('experiment_example_results', 'evaluation_results'):
+        op.add_column(table, sa.Column('scored_by', sa.String(), nullable=True))
+        op.add_column(table, sa.Column('cheap_score', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove evaluator tier columns."""
+    for table in ('experiment_example_results', 'evaluation_results'):
+        op.drop_column(table, 'cheap_score')
+        op.drop_column(table, 'scored_by')
@@ -0,0 +1,35 @@
+"""add keyset pagination indexes
+
+Revision ID: c9a4e2d7b618
+Revises: b3e8f1a7d462
+Create Date: 2026-10-17 16:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9a4e2d7b618'
+down_revision: Union[str, None] = 'b3e8f1a7d462'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - (created_at, id) indexes for cursor pagination."""
+    op.create_index('idx_runs_created_at_id', 'runs', ['created_at', 'id'])
+    # the composite index serves every query the created_at one did
+    op.drop_index('idx_runs_created_at', table_name='runs')
+    op.create_index('idx_prompts_created_at_id', 'prompts', ['created_at', 'id'])
+    op.create_index('idx_experiments_created_at_id', 'experiments', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema - back to the created_at index on runs."""
+    op.drop_index('idx_experiments_created_at_id', table_name='experiments')
+    op.drop_index('idx_prompts_created_at_id', table_name='prompts')
+    op.create_index('idx_runs_created_at', 'runs', ['created_at'], unique=False)
+    op.drop_index('idx_runs_created_at_id', table_name='runs')
@@ -0,0 +1,48 @@
+"""add hot path indexes
+
+Revision ID: d5f7a3c1e894
+Revises: c9a4e2d7b618
+Create Date: 2026-10-17 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f7a3c1e894'
+down_revision: Union[str, None] = 'c9a4e2d7b618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - composite and partial indexes for hot lookups (checked by benchmarks/query_plans.py)."""
+    op.create_index(
+        'idx_golden_examples_prompt_created', 'golden_examples', ['prompt_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'idx_prompt_versions_prompt_created', 'prompt_versions', ['prompt_id', 'created_at']
+    )
+    op.create_index(
+        'idx_evaluation_results_version_created', 'evaluation_results', ['prompt_version_id', 'created_at']
+    )
+    op.create_index(
+        'idx_runs_active_status', 'runs', ['status', 'created_at'],
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+    op.create_index(
+        'idx_api_keys_active_key', 'api_keys', ['key'],
+        postgresql_where=sa.text('is_active = true'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop hot path indexes."""
+    op.drop_index('idx_api_keys_active_key', table_name='api_keys')
+    op.drop_index('idx_runs_active_status', table_name='runs')
+    op.drop_index('idx_evaluation_results_version_created', table_name='evaluation_results')
+    op.drop_index('idx_prompt_versions_prompt_created', table_name='prompt_versions')
+    op.drop_index('idx_golden_examples_prompt_created', table_name='golden_examples')
@@ -0,0 +1,33 @@
+"""add early stopping to experiment results
+
+Revision ID: d8e1b5c3a920
+Revises: c2a7e4f19d63
+Create Date: 2026-10-17 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e1b5c3a920'
+down_revision: Union[str, None] = 'c2a7e4f19d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - mark early-stopped versions and their sample size."""
+    op.add_column(
+        'experiment_results',
+        sa.Column('early_stopped', sa.Boolean(), nullable=True, server_default=sa.false())
+    )
+    op.add_column('experiment_results', sa.Column('samples_used', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove early stopping columns."""
+    op.drop_column('experiment_results', 'samples_used')
+    op.drop_column('experiment_results', 'early_stopped')
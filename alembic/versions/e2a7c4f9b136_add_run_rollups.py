@@ -0,0 +1,61 @@
+"""add run rollups
+
+Revision ID: e2a7c4f9b136
+Revises: d5f7a3c1e894
+Create Date: 2026-10-17 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c4f9b136'
+down_revision: Union[str, None] = 'd5f7a3c1e894'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - run finish times, hourly run rollups and their watermark."""
+    op.add_column('runs', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    # finished runs so far: the first refresh rolls them up by creation hour
+    op.execute("UPDATE runs SET finished_at = created_at WHERE status IN ('completed', 'failed')")
+    op.create_index('idx_runs_finished_at', 'runs', ['finished_at'])
+
+    op.create_table(
+        'run_rollups_hourly',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('prompt_version_id', sa.String(), nullable=False),
+        sa.Column('run_count', sa.Integer(), nullable=True),
+        sa.Column('error_count', sa.Integer(), nullable=True),
+        sa.Column('tokens_in', sa.BigInteger(), nullable=True),
+        sa.Column('tokens_out', sa.BigInteger(), nullable=True),
+        sa.Column('cost_usd', sa.Float(), nullable=True),
+        sa.Column('latency_count', sa.Integer(), nullable=True),
+        sa.Column('latency_sum_ms', sa.BigInteger(), nullable=True),
+        sa.Column('latency_max_ms', sa.Integer(), nullable=True),
+        sa.Column('latency_histogram', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('bucket', 'model', 'prompt_version_id', name='uq_run_rollups_hourly_key'),
+    )
+    op.create_table(
+        'rollup_watermarks',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('watermark', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop run rollups."""
+    op.drop_table('rollup_watermarks')
+    op.drop_table('run_rollups_hourly')
+    op.drop_index('idx_runs_finished_at', table_name='runs')
+    op.drop_column('runs', 'finished_at')
@@ -0,0 +1,38 @@
+"""add experiment progress
+
+Revision ID: e4b9c7a1f352
+Revises: d8e1b5c3a920
+Create Date: 2026-10-17 13:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c7a1f352'
+down_revision: Union[str, None] = 'd8e1b5c3a920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - progress counters on experiments, index partial results by experiment."""
+    op.add_column('experiments', sa.Column('task_id', sa.String(), nullable=True))
+    op.add_column('experiments', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('experiments', sa.Column('total_cells', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('experiments', sa.Column('completed_cells', sa.Integer(), nullable=True, server_default='0'))
+    op.create_index(
+        op.f('ix_experiment_results_experiment_id'), 'experiment_results', ['experiment_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove experiment progress."""
+    op.drop_index(op.f('ix_experiment_results_experiment_id'), table_name='experiment_results')
+    op.drop_column('experiments', 'completed_cells')
+    op.drop_column('experiments', 'total_cells')
+    op.drop_column('experiments', 'started_at')
+    op.drop_column('experiments', 'task_id')
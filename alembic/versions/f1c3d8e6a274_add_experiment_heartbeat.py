@@ -0,0 +1,28 @@
+"""add experiment heartbeat
+
+Revision ID: f1c3d8e6a274
+Revises: e4b9c7a1f352
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3d8e6a274'
+down_revision: Union[str, None] = 'e4b9c7a1f352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - worker heartbeat on experiments, to detect interrupted runs."""
+    op.add_column('experiments', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove experiment heartbeat."""
+    op.drop_column('experiments', 'heartbeat_at')
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.rate_limit import rate_limit
+from app.core.security import get_api_key
+from app.services.analytics import run_analytics_summary, run_analytics_timeseries
+
+router = APIRouter()
+
+
+def _window_start(hours: int) -> datetime:
+    if not 1 <= hours <= settings.analytics_max_range_hours:
+        raise HTTPException(
+            status_code=400,
+            detail=f"hours must be between 1 and {settings.analytics_max_range_hours}",
+        )
+    start = datetime.utcnow() - timedelta(hours=hours)
+    return start.replace(minute=0, second=0, microsecond=0)
+
+
+# Runs, tokens, cost, error rate and latency percentiles over the last `hours`,
+# in total, per model and per prompt version (from the hourly rollups)
+@router.get("/analytics/summary")
+async def analytics_summary(
+    hours: int = 24,
+    model: Optional[str] = None,
+    prompt_version_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    api_key: str = Depends(get_api_key),
+):
+    await run_in_threadpool(rate_limit, api_key)
+    return await run_analytics_summary(db, _window_start(hours), model, prompt_version_id)
+
+
+# The same metrics hour by hour, optionally one series per model
+@router.get("/analytics/timeseries")
+async def analytics_timeseries(
+    hours: int = 24,
+    model: Optional[str] = None,
+    prompt_version_id: Optional[str] = None,
+    by_model: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    api_key: str = Depends(get_api_key),
+):
+    await run_in_threadpool(rate_limit, api_key)
+    return await run_analytics_timeseries(db, _window_start(hours), model, prompt_version_id, by_model)
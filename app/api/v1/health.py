@@ -1,5 +1,9 @@
 from fastapi import APIRouter
 from app.schemas.run import RunRequest, RunResponse
+from app.core.hedging import hedging_stats
+from app.core.llm_cache import llm_cache
+from app.core.llm_singleton import LLMService
+from app.services.evaluator import cascade_stats
 import time
 
 router = APIRouter()
@@ -10,3 +14,39 @@ def health_check():
     Health check endpoint to verify that the API is running.
     """
     return {"status": "ok", "timestamp": int(time.time())}
+
+
+@router.get("/health/llm-cache")
+def llm_cache_stats():
+    """
+    Hit/miss counters of the LLM response cache (this process and shared Redis tier).
+    """
+    return llm_cache.stats()
+
+
+@router.get("/health/llm-limits")
+def llm_limits():
+    """
+    Current cluster-wide AIMD concurrency window per model used by this process.
+    """
+    return [
+        service.limiter.state()
+        for service in list(LLMService._instances.values())
+        if service.limiter is not None
+    ]
+
+
+@router.get("/health/llm-hedging")
+def llm_hedging():
+    """
+    Hedged-request counters per model: hedges fired, hedge wins, primary wins.
+    """
+    return hedging_stats()
+
+
+@router.get("/health/evaluator-cascade")
+def evaluator_cascade():
+    """
+    Cascade evaluator tier hit rates in this process: exact match, cheap metric, LLM judge.
+    """
+    return cascade_stats.stats()
@@ -1,19 +1,30 @@
+import csv
 import logging
 import time
 import json
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Optional
+import anyio
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal, get_db
+from app.core.config import settings
+from app.core.database import SessionLocal, get_async_db, get_db
+from app.core.pagination import apaginate
 from app.core.security import get_api_key
 from app.core.rate_limit import rate_limit
+from app.core.llm_registry import UnknownModelError, get_model_config, list_models
 from app.models import (
     Prompt,
     PromptVersion,
     Run,
+    RunBatch,
     CostLog,
     GoldenExample,
-    EvaluationResult,
     Experiment,
     ExperimentResult
 )
@@ -26,14 +37,23 @@ from app.schemas.prompt import (
     PromptVersionHistoryResponse,
     PromptVersionResponse,
 )
-from app.schemas.run import RunRequest, RunResponse
+from app.schemas.run import RunBatchRequest, RunRequest, RunResponse
 from app.schemas.experiments import ExperimentRunCreate
-from app.schemas.evaluation import GoldenExampleCreate, EvaluationResponse
+from app.schemas.evaluation import GoldenExampleCreate, EvaluationJobResponse, EvaluationJobStatus
 from app.services.prompt_renderer import render_prompt
 from app.services.prompt_diff import diff_templates
-from app.services.evaluator import similarity_score
-from app.services.llm_runner import call_llama
-from app.services.run_experiment import run_experiment
+from app.services.llm_runner import astream_llama
+from app.services.token_counter import count_usage
+from app.services.experiment_stats import experiment_stats
+from app.services.golden_io import FORMATS, export_golden_examples, import_golden_examples
+from app.services.run_batches import abatch_progress, create_batch, delete_batch, insert_and_enqueue
+from app.services.run_evaluation import evaluate_prompt_version_task
+from app.services.run_experiment import (
+    claim_for_resume,
+    experiment_progress,
+    resume_experiment,
+    run_experiment,
+)
 from app.services.run_task import run_prompt_task
 
 logger = logging.getLogger(__name__)
@@ -76,21 +96,16 @@ def create_prompt(
         "version": version.version
     }
 
-# Get list of prompts with pagination
+# Get list of prompts, paginated by cursor (or skip)
 @router.get("/prompts")
-def list_prompts(
+async def list_prompts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    prompts = (
-        db.query(Prompt)
-        .order_by(Prompt.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return prompts
+    return await apaginate(db, select(Prompt), Prompt, response, limit, skip, cursor)
 
 
 # Create a new version of an existing prompt
@@ -126,6 +141,23 @@ def create_prompt_version(
     }
 
 
+def _ensure_model(model: str):
+    try:
+        return get_model_config(model)
+    except UnknownModelError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# List the models runs can be routed to
+@router.get("/models")
+def get_models():
+    return {
+        "default": settings.llm_default_model,
+        "models": list_models(),
+        "allow_unregistered": settings.llm_allow_unregistered_models,
+    }
+
+
 # New endpoint to create a run and immediately return pending status, while processing happens asynchronously
 @router.post("/run", response_model=RunResponse)
 def run_prompt(
@@ -135,6 +167,7 @@ def run_prompt(
 ):
     # rate limit
     rate_limit(api_key)
+    _ensure_model(payload.model)
 
     # create run (pending)
     run = Run(
@@ -157,6 +190,7 @@ def run_prompt(
         print(f"ERROR: Failed to queue task: {str(e)}")
         logger.error(f"Failed to queue task: {str(e)}", exc_info=True)
         run.status = "failed"
+        run.finished_at = datetime.utcnow()
         db.commit()
         raise
 
@@ -166,25 +200,280 @@ def run_prompt(
         "status": "pending",
     }
 
-# List all runs with pagination
+def _sse(data: dict, event: Optional[str] = None) -> str:
+    message = f"data: {json.dumps(data)}\n\n"
+    if event:
+        message = f"event: {event}\n" + message
+    return message
+
+
+def _finish_streamed_run(run_id: str, status: str, **fields):
+    db = SessionLocal()
+    try:
+        run = db.query(Run).filter(Run.id == run_id).first()
+        run.status = status
+        run.finished_at = datetime.utcnow()
+        for name, value in fields.items():
+            setattr(run, name, value)
+
+        if status == "completed":
+            cost = (run.tokens_in + run.tokens_out) * 0.00001
+            db.add(CostLog(run_id=run.id, cost_usd=cost))
+
+        db.commit()
+    finally:
+        db.close()
+
+
+def _start_streamed_run(payload: RunRequest):
+    """(rendered prompt, run id) of a new running Run for the payload."""
+    db = SessionLocal()
+    try:
+        prompt_version = (
+            db.query(PromptVersion)
+            .filter(PromptVersion.id == payload.prompt_version_id)
+            .first()
+        )
+        if not prompt_version:
+            raise HTTPException(status_code=404, detail="Prompt version not found")
+
+        try:
+            rendered_prompt = render_prompt(prompt_version.template, payload.variables)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        run = Run(
+            prompt_version_id=payload.prompt_version_id,
+            model=payload.model,
+            status="running",
+        )
+        db.add(run)
+        db.commit()
+        return rendered_prompt, str(run.id)
+    finally:
+        db.close()
+
+
+# Stream a run's output over server-sent events; the Run row is persisted when the stream ends
+@router.post("/run/stream")
+async def run_prompt_stream(
+    payload: RunRequest,
+    api_key: str = Depends(get_api_key),
+):
+    await run_in_threadpool(rate_limit, api_key)
+    model_config = _ensure_model(payload.model)
+
+    rendered_prompt, run_id = await run_in_threadpool(_start_streamed_run, payload)
+
+    logger.info(f"Created streamed run: {run_id} for prompt_version: {payload.prompt_version_id}")
+
+    async def event_stream():
+        chunks = []
+        usage = None
+        ttft_ms = None
+        finished = False
+        start = time.perf_counter()
+
+        try:
+            yield _sse({"run_id": run_id}, event="start")
+            try:
+                async for chunk in astream_llama(rendered_prompt, model_name=payload.model):
+                    if chunk.text:
+                        if ttft_ms is None:
+                            ttft_ms = int((time.perf_counter() - start) * 1000)
+                        chunks.append(chunk.text)
+                        yield _sse({"token": chunk.text})
+                    else:
+                        usage = chunk
+            except Exception as e:
+                logger.error(f"Streamed run {run_id} failed: {str(e)}", exc_info=True)
+                await run_in_threadpool(_finish_streamed_run, run_id, "failed")
+                finished = True
+                yield _sse({"run_id": run_id, "error": str(e)}, event="error")
+                return
+
+            latency_ms = int((time.perf_counter() - start) * 1000)
+            output = "".join(chunks)
+            tokens_in, tokens_out = await run_in_threadpool(
+                count_usage,
+                model_config.model, "", rendered_prompt, output,
+                usage.prompt_tokens if usage else None,
+                usage.completion_tokens if usage else None,
+            )
+
+            # decode rate after the first token, so queueing/prefill doesn't skew it
+            generation_seconds = (latency_ms - (ttft_ms or 0)) / 1000
+            tokens_per_second = round(tokens_out / generation_seconds, 2) if generation_seconds > 0 else None
+
+            await run_in_threadpool(
+                _finish_streamed_run,
+                run_id,
+                "completed",
+                output=output,
+                latency_ms=latency_ms,
+                ttft_ms=ttft_ms,
+                tokens_in=tokens_in,
+                tokens_out=tokens_out,
+                tokens_per_second=tokens_per_second,
+            )
+            finished = True
+
+            yield _sse(
+                {
+                    "run_id": run_id,
+                    "status": "completed",
+                    "latency_ms": latency_ms,
+                    "ttft_ms": ttft_ms,
+                    "tokens_in": tokens_in,
+                    "tokens_out": tokens_out,
+                    "tokens_per_second": tokens_per_second,
+                },
+                event="done",
+            )
+        finally:
+            if not finished:
+                # client went away mid-stream: the response was cancelled or
+                # the generator closed; shielded, as the cancelled scope would
+                # otherwise abort the update too
+                with anyio.CancelScope(shield=True):
+                    await run_in_threadpool(_finish_streamed_run, run_id, "failed")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _jsonl_objects(request: Request):
+    """(line number, parsed value or None) for each non-empty line of a streamed body."""
+    buffer = b""
+    line_number = 0
+
+    def parse(line: bytes):
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, parse(line)
+    if buffer.strip():
+        yield line_number + 1, parse(buffer)
+
+
+async def _listed_objects(variables: list):
+    for index, item in enumerate(variables, start=1):
+        yield index, item
+
+
+# Submit many runs of one prompt version at once. The body is either JSON
+# ({"prompt_version_id", "model", "variables": [...]}) or JSONL with one
+# variables object per line (prompt_version_id and model as query params),
+# which is read as a stream, so batches of any size use bounded memory.
+@router.post("/runs/batch", status_code=202)
+async def submit_run_batch(
+    request: Request,
+    prompt_version_id: Optional[str] = None,
+    model: Optional[str] = None,
+    api_key: str = Depends(get_api_key),
+):
+    await run_in_threadpool(rate_limit, api_key)
+
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            payload = RunBatchRequest(**json.loads(await request.body()))
+        except (ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid batch body: {e}")
+        prompt_version_id, model = payload.prompt_version_id, payload.model
+        objects = _listed_objects(payload.variables)
+    else:
+        objects = _jsonl_objects(request)
+    model = model or settings.llm_default_model
+    if not prompt_version_id:
+        raise HTTPException(status_code=400, detail="prompt_version_id is required")
+    _ensure_model(model)
+
+    created = await run_in_threadpool(create_batch, prompt_version_id, model)
+    if created is None:
+        raise HTTPException(status_code=404, detail="Prompt version not found")
+    batch_id, template = created
+
+    submitted = skipped = 0
+    errors = []
+    chunk = []
+    chunk_size = max(1, settings.run_batch_insert_size)
+    async for index, variables in objects:
+        # the same check render_prompt does on the worker, so bad rows fail here
+        error = None
+        if not isinstance(variables, dict):
+            error = "each entry must be a JSON object of variables"
+        else:
+            try:
+                render_prompt(template, variables)
+            except (ValueError, IndexError) as e:
+                error = str(e)
+        if error:
+            skipped += 1
+            if len(errors) < 100:
+                errors.append({"line": index, "error": error})
+            continue
+        chunk.append(variables)
+        if len(chunk) >= chunk_size:
+            submitted += await run_in_threadpool(insert_and_enqueue, batch_id, prompt_version_id, model, chunk)
+            chunk = []
+    submitted += await run_in_threadpool(insert_and_enqueue, batch_id, prompt_version_id, model, chunk)
+
+    if not submitted:
+        await run_in_threadpool(delete_batch, batch_id)
+        detail = "No runs to submit: the batch is empty"
+        if errors:
+            detail = (
+                f"No valid runs to submit: {skipped} entries skipped "
+                f"(line {errors[0]['line']}: {errors[0]['error']})"
+            )
+        raise HTTPException(status_code=400, detail=detail)
+
+    logger.info(f"Run batch {batch_id}: submitted {submitted} runs, skipped {skipped}")
+    return {
+        "batch_id": batch_id,
+        "submitted": submitted,
+        "skipped": skipped,
+        "errors": errors,
+    }
+
+
+# Aggregate progress of a run batch
+@router.get("/runs/batch/{batch_id}")
+async def get_run_batch(
+    batch_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    api_key: str = Depends(get_api_key),
+):
+    await run_in_threadpool(rate_limit, api_key)
+    batch = await db.get(RunBatch, batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Run batch not found")
+    return await abatch_progress(db, batch)
+
+
+# List all runs, paginated by cursor (or skip)
 @router.get("/runs")
-def list_runs(
+async def list_runs(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     api_key: str = Depends(get_api_key),
 ):
-    rate_limit(api_key)
-    
-    runs = (
-        db.query(Run)
-        .order_by(Run.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    
-    return runs
+    await run_in_threadpool(rate_limit, api_key)
+    return await apaginate(db, select(Run), Run, response, limit, skip, cursor)
 
 # Endpoint to check task status and get results
 @router.get("/task-status/{task_id}")
@@ -205,7 +494,8 @@ def get_task_status(task_id: str, api_key: str = Depends(get_api_key)):
         return {
             "task_id": task_id,
             "status": "processing",
-            "message": f"Task is processing: {task.info}"
+            "message": f"Task is processing: {task.info}",
+            "progress": task.info
         }
     elif task.state == 'SUCCESS':
         return {
@@ -226,16 +516,17 @@ def get_task_status(task_id: str, api_key: str = Depends(get_api_key)):
     "/prompts/{prompt_id}/versions",
     response_model=PromptVersionHistoryResponse
 )
-def list_prompt_versions(
+async def list_prompt_versions(
     prompt_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     versions = (
-        db.query(PromptVersion)
-        .filter(PromptVersion.prompt_id == prompt_id)
-        .order_by(PromptVersion.created_at.desc())
-        .all()
-    )
+        await db.execute(
+            select(PromptVersion)
+            .filter(PromptVersion.prompt_id == prompt_id)
+            .order_by(PromptVersion.created_at.desc())
+        )
+    ).scalars().all()
 
     return {
         "prompt_id": prompt_id,
@@ -294,29 +585,26 @@ def activate_prompt_version(
     "/prompts/diff",
     response_model=PromptDiffResponse
 )
-def diff_prompt_versions(
+async def diff_prompt_versions(
     prompt_id: str,
     from_version_id: str,
     to_version_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    from_version = (
-        db.query(PromptVersion)
-        .filter(
-            PromptVersion.id == from_version_id,
-            PromptVersion.prompt_id == prompt_id
-        )
-        .first()
-    )
-
-    to_version = (
-        db.query(PromptVersion)
-        .filter(
-            PromptVersion.id == to_version_id,
-            PromptVersion.prompt_id == prompt_id
-        )
-        .first()
-    )
+    # both versions in one round trip
+    versions = {
+        version.id: version
+        for version in (
+            await db.execute(
+                select(PromptVersion).filter(
+                    PromptVersion.id.in_([from_version_id, to_version_id]),
+                    PromptVersion.prompt_id == prompt_id
+                )
+            )
+        ).scalars()
+    }
+    from_version = versions.get(from_version_id)
+    to_version = versions.get(to_version_id)
 
     if not from_version or not to_version:
         raise HTTPException(
@@ -374,90 +662,127 @@ def create_golden_example(
 
 # List golden examples for a prompt
 @router.get("/prompts/{prompt_id}/golden-examples")
-def list_golden_examples(
+async def list_golden_examples(
     prompt_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     examples = (
-        db.query(GoldenExample)
-        .filter(GoldenExample.prompt_id == prompt_id)
-        .all()
-    )
+        await db.execute(
+            select(GoldenExample)
+            .filter(GoldenExample.prompt_id == prompt_id)
+            .order_by(GoldenExample.created_at, GoldenExample.id)
+        )
+    ).scalars().all()
     return examples
 
 
-# Evaluate a prompt version against its golden examples
+def _golden_format(fmt: Optional[str], filename: Optional[str] = None) -> str:
+    if not fmt and filename:
+        fmt = filename.rsplit(".", 1)[-1].lower() if "." in filename else None
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+# Bulk import golden examples from a JSONL or CSV upload
+@router.post("/prompts/{prompt_id}/golden-examples/import")
+def import_golden_examples_file(
+    prompt_id: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    strict: bool = False,
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key),
+):
+    """
+    JSONL lines are {"input_data": {...}, "expected_output": "..."}; CSV has
+    an expected_output column plus either an input_data JSON column or one
+    column per template variable. Rows missing a variable used by any
+    version of the prompt are skipped (or, with strict, fail the import).
+    """
+    rate_limit(api_key)
+    fmt = _golden_format(format, file.filename)
+    if not db.query(Prompt.id).filter(Prompt.id == prompt_id).first():
+        raise HTTPException(status_code=404, detail="Prompt not found")
+
+    try:
+        summary = import_golden_examples(db, prompt_id, file.file, fmt, strict=strict)
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Could not read {fmt} upload: {e}")
+
+    if strict and summary["skipped"]:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=summary)
+    db.commit()
+    logger.info(f"Imported {summary['imported']} golden examples for prompt_id: {prompt_id}, skipped {summary['skipped']}")
+    return summary
+
+
+# Stream a prompt's golden examples as JSONL or CSV
+@router.get("/prompts/{prompt_id}/golden-examples/export")
+def export_golden_examples_file(
+    prompt_id: str,
+    format: str = "jsonl",
+    api_key: str = Depends(get_api_key),
+):
+    rate_limit(api_key)
+    fmt = _golden_format(format)
+    return StreamingResponse(
+        export_golden_examples(prompt_id, fmt),
+        media_type="text/csv" if fmt == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="golden-examples-{prompt_id}.{fmt}"'},
+    )
+
+
+# Queue an evaluation of a prompt version against its golden examples
 @router.post(
     "/prompts/{prompt_id}/versions/{version_id}/evaluate",
-    response_model=EvaluationResponse
+    response_model=EvaluationJobResponse,
+    status_code=202,
 )
-async def evaluate_prompt_version(
+def evaluate_prompt_version(
     prompt_id: str,
     version_id: str,
     db: Session = Depends(get_db),
 ):
-    logger.info(f"Starting evaluation for prompt_id: {prompt_id}, version_id: {version_id}")
+    logger.info(f"Queuing evaluation for prompt_id: {prompt_id}, version_id: {version_id}")
     prompt_version = (
         db.query(PromptVersion)
-        .filter(PromptVersion.id == version_id)
+        .filter(PromptVersion.id == version_id, PromptVersion.prompt_id == prompt_id)
         .first()
     )
+    if not prompt_version:
+        raise HTTPException(404, "Prompt version not found")
 
-    logger.info(f"Loaded prompt version: {prompt_version}")
-
-    golden_examples = (
-        db.query(GoldenExample)
+    has_examples = (
+        db.query(GoldenExample.id)
         .filter(GoldenExample.prompt_id == prompt_id)
-        .all()
+        .first()
     )
-
-    logger.info(f"Found {len(golden_examples)} golden examples")
-
-    if not golden_examples:
+    if not has_examples:
         logger.error("No golden examples found")
         raise HTTPException(400, "No golden examples found")
 
-    scores = []
+    task_result = evaluate_prompt_version_task.delay(prompt_id, version_id)
+    logger.info(f"Evaluation task queued with Celery task ID: {task_result.id}")
 
-    logger.info("Beginning evaluation loop over golden examples")
-    for example in golden_examples:
-        variables = json.loads(example.input_data)
-        logger.info(f"Evaluating golden example ID: {example.id} with variables: {variables}")
-        rendered = render_prompt(prompt_version.template, variables)
-        logger.info(f"Rendered prompt: {rendered}")
+    return {"job_id": task_result.id, "status": "pending"}
 
-        output, _, _ = call_llama(rendered)
-        logger.info(f"Model output: {output}")
 
-        score = similarity_score(
-            user_input=rendered,
-            expected_output=example.expected_output,
-            model_output=output
-        )
-        logger.info(f"Evaluation score: {score}")
-
-
-        scores.append(score['score'])
-
-        db.add(
-            EvaluationResult(
-                prompt_version_id=version_id,
-                golden_example_id=example.id,
-                score=score['score'],
-                reason=score.get('reason', ''),
-                output=output,
-            )
-        )
-
-        logger.debug(f"Logged evaluation result for golden example ID: {example.id}")
-
-    db.commit()
+# Progress of a queued evaluation, and its EvaluationResponse once done
+@router.get("/evaluations/{job_id}/status", response_model=EvaluationJobStatus)
+def get_evaluation_status(job_id: str):
+    task = evaluate_prompt_version_task.AsyncResult(job_id)
 
-    return {
-        "prompt_version_id": version_id,
-        "average_score": sum(scores) / len(scores),
-        "total_tests": len(scores),
-    }
+    if task.state in ('PENDING', 'STARTED'):
+        return {"job_id": job_id, "status": "pending"}
+    elif task.state == 'PROGRESS':
+        return {"job_id": job_id, "status": "processing", "progress": task.info}
+    elif task.state == 'SUCCESS':
+        return {"job_id": job_id, "status": "success", "result": task.result}
+    else:  # FAILURE or RETRY
+        return {"job_id": job_id, "status": "failed", "error": str(task.info)}
 
 
 
@@ -494,51 +819,99 @@ def trigger_experiment_run(
     print(f"{'='*60}\n")
 
     return {
+        "task_id": task_result.id,
         "message": f"Experiment '{playload.experiment_name}' is running. Check results later."
     }
 
 # experiments results endpoint
 @router.get("/experiments/{experiment_id}/status")
-def get_experiment_status(
+async def get_experiment_status(
     experiment_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     api_key: str = Depends(get_api_key),
 ):
-    rate_limit(api_key)
+    await run_in_threadpool(rate_limit, api_key)
 
-    experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+    experiment = await db.get(Experiment, experiment_id)
 
     if not experiment:
         raise HTTPException(status_code=404, detail="Experiment not found")
 
+    # partial per-version aggregates while running, kept current by the shards
     results = (
-        db.query(ExperimentResult)
-        .filter(ExperimentResult.experiment_id == experiment_id)
-        .all()
-    )
+        await db.execute(
+            select(ExperimentResult)
+            .filter(ExperimentResult.experiment_id == experiment_id)
+        )
+    ).scalars().all()
 
     return {
         "experiment_id": experiment_id,
         "experiment_name": experiment.name,
         "status": experiment.status,
+        "progress": experiment_progress(experiment),
         "results": results
     }
 
 
-# List all experiments with pagination
+# per-version distribution statistics, computed live from the stored cells
+@router.get("/experiments/{experiment_id}/stats")
+def get_experiment_stats(
+    experiment_id: str,
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key),
+):
+    rate_limit(api_key)
+
+    experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+    if not experiment:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+
+    return {
+        "experiment_id": experiment_id,
+        "status": experiment.status,
+        "versions": experiment_stats(db, experiment_id),
+    }
+
+
+# resume an interrupted experiment from its stored cells
+@router.post("/experiments/{experiment_id}/resume")
+def resume_experiment_run(
+    experiment_id: str,
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key),
+):
+    rate_limit(api_key)
+
+    experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+    if not experiment:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+
+    if not claim_for_resume(db, experiment_id):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Experiment is {experiment.status} and not interrupted; only failed or stalled experiments can be resumed",
+        )
+
+    task_result = resume_experiment.delay(experiment_id)
+    logger.info(f"Resuming experiment {experiment_id} with Celery task ID: {task_result.id}")
+
+    return {
+        "task_id": task_result.id,
+        "experiment_id": experiment_id,
+        "message": f"Experiment '{experiment.name}' is resuming from its completed cells."
+    }
+
+
+# List all experiments, paginated by cursor (or skip)
 @router.get("/experiments")
-def list_experiments(
+async def list_experiments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     api_key: str = Depends(get_api_key),
 ):
-    rate_limit(api_key)
-    experiments = (
-        db.query(Experiment)
-        .order_by(Experiment.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return experiments
\ No newline at end of file
+    await run_in_threadpool(rate_limit, api_key)
+    return await apaginate(db, select(Experiment), Experiment, response, limit, skip, cursor)
\ No newline at end of file
@@ -1,4 +1,7 @@
-from celery import Celery
+from celery import Celery, signals
+
+from app.core.config import settings
+from app.core.database import use_worker_pool
 
 CeleryApp = Celery(
     "llmops",
@@ -18,11 +21,33 @@ CeleryApp.conf.update(
     enable_utc=True,
     task_routes={
         "app.services.run_task.run_prompt_task": {"queue": "llm_tasks_queue"},
+        "app.services.run_task.run_prompt_batch_task": {"queue": "llm_tasks_queue"},
+        "app.services.run_evaluation.evaluate_prompt_version_task": {"queue": "llm_tasks_queue"},
         "app.services.run_experiment.run_experiment": {"queue": "llm_tasks_queue"},
+        "app.services.run_experiment.run_experiment_shard": {"queue": "llm_tasks_queue"},
+        "app.services.run_experiment.advance_experiment": {"queue": "llm_tasks_queue"},
+        "app.services.run_experiment.finalize_experiment": {"queue": "llm_tasks_queue"},
+        "app.services.run_experiment.resume_experiment": {"queue": "llm_tasks_queue"},
+        "app.services.run_experiment.mark_experiment_failed": {"queue": "llm_tasks_queue"},
     },
     task_track_started=True,
+    # periodic tasks, run by `celery -A app.core.celery_app beat`
+    beat_schedule={
+        "refresh-run-rollups": {
+            "task": "app.services.analytics.refresh_run_rollups_task",
+            "schedule": settings.analytics_refresh_interval_seconds,
+            # a refresh that could not start before the next one is due is dropped
+            "options": {"expires": settings.analytics_refresh_interval_seconds},
+        },
+    },
 )
 
+@signals.worker_process_init.connect
+def _init_worker_process(**kwargs):
+    # each prefork child gets a small sync pool of its own
+    use_worker_pool()
+
+
 # Auto-discover tasks from app modules
 CeleryApp.autodiscover_tasks(["app.services"])
 
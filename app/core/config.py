@@ -1,3 +1,4 @@
+from typing import Any, Dict
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,6 +10,124 @@ class Settings(BaseSettings):
     huggingface_api_key: str = ""
     wandb_api_key: str = ""
     api_secret_key: str = ""
+    redis_host: str = "localhost"
+    redis_port: int = 6379
+    # full SQLAlchemy URL, overrides the postgres_* settings (e.g. sqlite for benchmarks)
+    database_url_override: str = ""
+
+    # LLM client (defaults for every model, see app/core/llm_registry.py)
+    hf_inference_base_url: str = "https://router.huggingface.co/v1"
+    llm_default_model: str = "Qwen/Qwen2.5-1.5B-Instruct"
+    llm_timeout_seconds: float = 60.0
+    llm_connect_timeout_seconds: float = 5.0
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry_seconds: float = 30.0
+    llm_max_concurrency: int = 8
+    # per-model overrides keyed by model name, e.g.
+    # LLM_MODELS='{"small": {"model": "Qwen/Qwen2.5-0.5B-Instruct", "max_concurrency": 16}}'
+    llm_models: Dict[str, Dict[str, Any]] = {}
+    llm_allow_unregistered_models: bool = True
+    # "hf" calls hf_inference_base_url, "fake" answers in-process (app/core/fake_llm.py)
+    llm_backend: str = "hf"
+
+    # Fake LLM backend: deterministic outputs, lognormal TTFT, injected errors
+    fake_llm_seed: int = 0
+    fake_llm_ttft_ms: float = 200.0  # median time to first token
+    fake_llm_latency_sigma: float = 0.5  # lognormal spread of the TTFT
+    fake_llm_tail_probability: float = 0.01  # stragglers, to exercise hedging
+    fake_llm_tail_multiplier: float = 20.0
+    fake_llm_tokens_per_second: float = 50.0
+    fake_llm_error_rate_429: float = 0.0
+    fake_llm_error_rate_5xx: float = 0.0
+
+    # Cluster-wide adaptive (AIMD) upstream concurrency, shared through Redis
+    llm_limiter_enabled: bool = True
+    llm_limiter_initial_limit: float = 8.0
+    llm_limiter_min_limit: float = 1.0
+    llm_limiter_max_limit: float = 64.0
+    llm_limiter_additive_increase: float = 1.0  # +1 slot per `limit` successful calls
+    llm_limiter_multiplicative_decrease: float = 0.5  # on 429 / 5xx
+    llm_limiter_decrease_cooldown_seconds: float = 2.0
+    llm_limiter_lease_ttl_seconds: float = 120.0
+    llm_limiter_acquire_timeout_seconds: float = 60.0
+
+    # Request hedging for tail latency (opt-in)
+    llm_hedging_enabled: bool = False
+    llm_hedge_percentile: float = 95.0  # hedge once a call is slower than p95
+    llm_hedge_min_delay_seconds: float = 0.5
+    llm_hedge_min_samples: int = 20
+    llm_hedge_window: int = 500  # recent latencies kept per model
+    llm_hedge_max_rate: float = 0.05  # at most ~5% of calls get a hedge
+    llm_hedge_max_burst: float = 10.0
+    llm_hedge_max_threads: int = 32
+
+    # LLM response cache (opt-in)
+    llm_cache_enabled: bool = False
+    llm_cache_ttl_seconds: int = 24 * 60 * 60
+    llm_cache_max_entries: int = 10_000
+    llm_cache_max_bytes: int = 64 * 1024 * 1024
+    llm_cache_include_sampled: bool = False  # also cache temperature > 0 calls
+
+    # Single-flight coalescing of identical in-flight deterministic LLM calls
+    llm_single_flight_enabled: bool = True
+    llm_single_flight_lock_ttl_seconds: float = 120.0
+    llm_single_flight_wait_timeout_seconds: float = 120.0
+    llm_single_flight_include_sampled: bool = False  # also coalesce temperature > 0 calls
+
+    # LLM-as-judge: items scored per judge call (1 disables batching)
+    judge_batch_size: int = 8
+    judge_batch_tokens_per_item: int = 120  # max_tokens budget per item of a batch
+
+    # Cascade evaluator: cheap lexical score first, the judge only inside the band (opt-in)
+    evaluator_cascade_enabled: bool = False
+    evaluator_cascade_low: float = 0.15  # at or below: scored as a clear miss without the judge
+    evaluator_cascade_high: float = 0.9  # at or above: scored as a clear match without the judge
+
+    # Experiments fan out into shards of (version, examples) run as a Celery chord
+    experiment_shard_size: int = 25  # golden examples per shard task
+    experiment_parallelism: int = 4  # concurrent examples inside one shard task
+    # evaluate in rounds and stop sampling versions clearly worse than the leader (opt-in)
+    experiment_early_stopping: bool = False
+    experiment_early_stopping_round_size: int = 30  # examples per version per round
+    experiment_early_stopping_confidence: float = 0.95
+    # a running experiment with no shard heartbeat for this long can be resumed
+    experiment_heartbeat_timeout: int = 600  # seconds
+    # per-version statistics written when an experiment completes
+    experiment_bootstrap_resamples: int = 1000
+    experiment_stats_confidence: float = 0.95
+
+    # POST /runs/batch: rows per bulk insert, runs per Celery task, concurrent runs per task
+    run_batch_insert_size: int = 1000
+    run_batch_task_size: int = 50
+    run_batch_parallelism: int = 4
+
+    # Golden example bulk import/export: rows per executemany / per fetched batch
+    golden_import_batch_size: int = 1000
+
+    # Database connection pools. Sizes are per process and per engine, so they
+    # multiply: each uvicorn worker holds up to db_pool_size + db_max_overflow
+    # sync plus db_async_pool_size + db_async_max_overflow async connections,
+    # each prefork Celery child up to db_worker_pool_size + db_worker_max_overflow
+    # (workers never create the async engine). Keep the total over all
+    # processes below Postgres' max_connections.
+    db_pool_size: int = 5  # sync engine of the API: write routes
+    db_max_overflow: int = 5
+    db_async_pool_size: int = 10  # async engine of the API: read routes, API key lookups
+    db_async_max_overflow: int = 10
+    db_worker_pool_size: int = 2  # sync engine of a Celery worker child, one task at a time
+    db_worker_max_overflow: int = 2
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds, reconnect before server/proxy idle timeouts
+    # asyncpg prepared statements cached per connection (0 behind pgbouncer in transaction mode)
+    db_statement_cache_size: int = 100
+
+    # Analytics rollups, refreshed incrementally by Celery beat
+    analytics_refresh_interval_seconds: float = 60.0
+    # runs finishing within this window of "now" wait for the next refresh, so a
+    # transaction that commits slightly after its finished_at is not skipped
+    analytics_refresh_lag_seconds: int = 30
+    analytics_max_range_hours: int = 24 * 90  # widest window one analytics query may cover
 
     class Config:
         env_file = ".env"
@@ -16,10 +135,23 @@ class Settings(BaseSettings):
 
     @property
     def DATABASE_URL(self) -> str:
+        if self.database_url_override:
+            return self.database_url_override
         return (
             f"postgresql+psycopg2://{self.postgres_user}:{self.postgres_password}"
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """DATABASE_URL with the async driver: asyncpg for Postgres, aiosqlite for SQLite."""
+        url = self.DATABASE_URL
+        scheme, rest = url.split("://", 1)
+        if scheme.startswith("postgresql"):
+            return f"postgresql+asyncpg://{rest}"
+        if scheme.startswith("sqlite"):
+            return f"sqlite+aiosqlite://{rest}"
+        return url
+
 settings = Settings()
 # settings = Settings()
\ No newline at end of file
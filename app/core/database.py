@@ -1,14 +1,33 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine( # - create_engine: دي الطريقة اللي SQLAlchemy بيستخدمها عشان يتصل بقاعدة البيانات.
-    settings.DATABASE_URL, 
-    pool_pre_ping=True # - pool_pre_ping=True: بيخلي SQLAlchemy يتأكد إن الاتصال شغال قبل ما يستخدمه (مفيد لو 
-)
+
+def _pool_options(url: str, pool_size: int, max_overflow: int) -> dict:
+    # SQLite (benchmarks) keeps SQLAlchemy's default pool for its driver
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def _create_engine(pool_size: int, max_overflow: int):
+    return create_engine( # - create_engine: دي الطريقة اللي SQLAlchemy بيستخدمها عشان يتصل بقاعدة البيانات.
+        settings.DATABASE_URL,
+        pool_pre_ping=True, # - pool_pre_ping=True: بيخلي SQLAlchemy يتأكد إن الاتصال شغال قبل ما يستخدمه (مفيد لو
+        **_pool_options(settings.DATABASE_URL, pool_size, max_overflow),
+    )
+
+
+engine = _create_engine(settings.db_pool_size, settings.db_max_overflow)
 
 SessionLocal = sessionmaker( # -  SQLAlchemy هو factory (مصنع) بيبني لك كائنات Session
-    autocommit=False, # - معناها إن أي عملية (INSERT, UPDATE, DELETE) مش هتتسجل في قاعدة البيانات إلا لما 
+    autocommit=False, # - معناها إن أي عملية (INSERT, UPDATE, DELETE) مش هتتسجل في قاعدة البيانات إلا لما
     autoflush=False, # - الـ flush معناها إن التغييرات اللي في الـ session تتبعت للـ DB قبل الاستعلامات
 
     bind=engine
@@ -21,3 +40,63 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def use_worker_pool():
+    """
+    Replace the sync engine by one with the smaller Celery worker pool.
+
+    Called in each freshly forked prefork child, before it runs a task:
+    connections inherited from the parent are dropped without being closed,
+    as they still belong to the parent.
+    """
+    global engine
+    engine.dispose(close=False)
+    engine = _create_engine(settings.db_worker_pool_size, settings.db_worker_max_overflow)
+    SessionLocal.configure(bind=engine)
+
+
+# Async engine (asyncpg) for the read-heavy API routes: they run on the event
+# loop instead of the threadpool, so concurrent requests are bounded by its
+# pool and not by the threadpool's 40 threads. Celery tasks and the write
+# paths keep the sync engine above. Created on first use, so processes that
+# never serve those routes (Celery workers) do not hold a second pool.
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        connect_args = (
+            {"prepared_statement_cache_size": settings.db_statement_cache_size}
+            if settings.ASYNC_DATABASE_URL.startswith("postgresql+asyncpg")
+            else {}
+        )
+        _async_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL,
+            pool_pre_ping=True,
+            connect_args=connect_args,
+            **_pool_options(
+                settings.ASYNC_DATABASE_URL, settings.db_async_pool_size, settings.db_async_max_overflow
+            ),
+        )
+    return _async_engine
+
+
+def async_session() -> AsyncSession:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(),
+            class_=AsyncSession,
+            autoflush=False,
+            # rows stay readable after commit, lazy loads are not possible on the loop anyway
+            expire_on_commit=False,
+        )
+    return _async_session_factory()
+
+
+async def get_async_db():
+    async with async_session() as db:
+        yield db
@@ -0,0 +1,252 @@
+# app/core/fake_llm.py
+"""
+Deterministic fake LLM backend for offline and load testing.
+
+In-process: set LLM_BACKEND=fake and every LLMService / AsyncLLMService
+client talks to FakeLLMTransport instead of the network, so the limiter,
+hedging, streaming parser and error handling all run unchanged.
+
+Out-of-process: run the OpenAI-compatible fake server and point the real
+client at it:
+
+    uvicorn app.core.fake_llm:fake_app --port 8081
+    HF_INFERENCE_BASE_URL=http://localhost:8081/v1
+
+Completion text depends only on the request (same request -> same text).
+Latency, time-to-first-token and injected 429 / 5xx errors are drawn from a
+process RNG seeded with fake_llm_seed, so a run is reproducible as a whole.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.config import settings
+
+WORDS = (
+    "the model output summary answer text result data example prompt value "
+    "context detail request response system user task quality score review "
+    "concise accurate relevant clear short long first second final main"
+).split()
+
+
+class FakeCompletionPlan(NamedTuple):
+    status_code: int
+    text: str
+    ttft_seconds: float
+    seconds_per_token: float
+    prompt_tokens: int
+
+    @property
+    def chunks(self) -> List[str]:
+        words = self.text.split(" ")
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    @property
+    def total_seconds(self) -> float:
+        return self.ttft_seconds + self.seconds_per_token * max(0, len(self.chunks) - 1)
+
+
+class FakeLLM:
+    def __init__(self, seed: int):
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def plan(self, payload: dict) -> FakeCompletionPlan:
+        messages = payload.get("messages") or []
+        system_prompt = next((m["content"] for m in messages if m["role"] == "system"), "")
+        prompt = next((m["content"] for m in messages if m["role"] == "user"), "")
+
+        with self._lock:
+            roll = self._rng.random()
+            ttft = settings.fake_llm_ttft_ms / 1000 * math.exp(
+                self._rng.gauss(0, settings.fake_llm_latency_sigma)
+            )
+            if self._rng.random() < settings.fake_llm_tail_probability:
+                ttft *= settings.fake_llm_tail_multiplier
+
+        status_code = 200
+        if roll < settings.fake_llm_error_rate_429:
+            status_code = 429
+        elif roll < settings.fake_llm_error_rate_429 + settings.fake_llm_error_rate_5xx:
+            status_code = 503
+
+        return FakeCompletionPlan(
+            status_code=status_code,
+            text=self.text(payload.get("model", ""), system_prompt, prompt, payload.get("max_tokens") or 150),
+            ttft_seconds=ttft,
+            seconds_per_token=1 / settings.fake_llm_tokens_per_second,
+            prompt_tokens=math.ceil(len(system_prompt + prompt) / 4),
+        )
+
+    @staticmethod
+    def text(model: str, system_prompt: str, prompt: str, max_tokens: int) -> str:
+        digest = hashlib.sha256(
+            json.dumps([settings.fake_llm_seed, model, system_prompt, prompt]).encode("utf-8")
+        ).hexdigest()
+        rng = random.Random(digest)
+
+        if "impartial evaluator" in system_prompt:
+            if "JSON array" in system_prompt:
+                items = prompt.split("### Item ")[1:]
+                return json.dumps([
+                    dict(index=index, **FakeLLM.judgement(item))
+                    for index, item in enumerate(items, start=1)
+                ])
+            return json.dumps(FakeLLM.judgement(prompt))
+
+        # mix in prompt words so lexical similarity metrics see realistic overlap
+        vocabulary = WORDS + [word for word in prompt.split() if word.isalpha()][:50]
+        length = min(max_tokens, rng.randint(10, 80))
+        return " ".join(rng.choice(vocabulary) for _ in range(length))
+
+    @staticmethod
+    def judgement(evaluated: str) -> dict:
+        rng = random.Random(
+            hashlib.sha256(json.dumps([settings.fake_llm_seed, evaluated]).encode("utf-8")).hexdigest()
+        )
+        score = round(rng.random(), 2)
+        return {
+            "score": score,
+            "reason": "fake judge verdict",
+            "hallucination_rate": round((1 - score) * rng.random(), 2),
+        }
+
+
+fake_llm = FakeLLM(settings.fake_llm_seed)
+
+
+def _error_body(status_code: int) -> dict:
+    message = "Rate limit reached" if status_code == 429 else "Service unavailable"
+    return {"error": {"message": message, "code": status_code}}
+
+
+def _completion_body(payload: dict, plan: FakeCompletionPlan) -> dict:
+    return {
+        "id": "fake-" + hashlib.md5(plan.text.encode("utf-8")).hexdigest(),
+        "object": "chat.completion",
+        "model": payload.get("model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": plan.text},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": plan.prompt_tokens,
+            "completion_tokens": len(plan.chunks),
+            "total_tokens": plan.prompt_tokens + len(plan.chunks),
+        },
+    }
+
+
+def _stream_events(payload: dict, plan: FakeCompletionPlan):
+    """Yields (delay_seconds, sse_bytes) pairs."""
+    for i, chunk in enumerate(plan.chunks):
+        event = {"choices": [{"index": 0, "delta": {"content": chunk}}]}
+        delay = plan.ttft_seconds if i == 0 else plan.seconds_per_token
+        yield delay, f"data: {json.dumps(event)}\n\n".encode("utf-8")
+
+    usage = _completion_body(payload, plan)["usage"]
+    yield 0, f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode("utf-8")
+    yield 0, b"data: [DONE]\n\n"
+
+
+class _SyncFakeStream(httpx.SyncByteStream):
+    def __init__(self, payload: dict, plan: FakeCompletionPlan):
+        self.payload = payload
+        self.plan = plan
+
+    def __iter__(self):
+        for delay, data in _stream_events(self.payload, self.plan):
+            time.sleep(delay)
+            yield data
+
+
+class _AsyncFakeStream(httpx.AsyncByteStream):
+    def __init__(self, payload: dict, plan: FakeCompletionPlan):
+        self.payload = payload
+        self.plan = plan
+
+    async def __aiter__(self):
+        for delay, data in _stream_events(self.payload, self.plan):
+            await asyncio.sleep(delay)
+            yield data
+
+
+class FakeLLMTransport(httpx.BaseTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.read())
+        plan = fake_llm.plan(payload)
+
+        if plan.status_code != 200:
+            time.sleep(plan.ttft_seconds)
+            return httpx.Response(plan.status_code, json=_error_body(plan.status_code))
+
+        if payload.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                stream=_SyncFakeStream(payload, plan),
+            )
+
+        time.sleep(plan.total_seconds)
+        return httpx.Response(200, json=_completion_body(payload, plan))
+
+
+class AsyncFakeLLMTransport(httpx.AsyncBaseTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(await request.aread())
+        plan = fake_llm.plan(payload)
+
+        if plan.status_code != 200:
+            await asyncio.sleep(plan.ttft_seconds)
+            return httpx.Response(plan.status_code, json=_error_body(plan.status_code))
+
+        if payload.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                stream=_AsyncFakeStream(payload, plan),
+            )
+
+        await asyncio.sleep(plan.total_seconds)
+        return httpx.Response(200, json=_completion_body(payload, plan))
+
+
+def fake_transport(asynchronous: bool) -> Optional[httpx.BaseTransport]:
+    """The transport LLM clients should use, None for the real network."""
+    if settings.llm_backend != "fake":
+        return None
+    return AsyncFakeLLMTransport() if asynchronous else FakeLLMTransport()
+
+
+# OpenAI-compatible fake server
+fake_app = FastAPI(title="Fake LLM")
+
+
+@fake_app.post("/v1/chat/completions")
+async def fake_chat_completions(payload: dict):
+    plan = fake_llm.plan(payload)
+
+    if plan.status_code != 200:
+        await asyncio.sleep(plan.ttft_seconds)
+        return JSONResponse(_error_body(plan.status_code), status_code=plan.status_code)
+
+    if payload.get("stream"):
+        async def events():
+            for delay, data in _stream_events(payload, plan):
+                await asyncio.sleep(delay)
+                yield data
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    await asyncio.sleep(plan.total_seconds)
+    return _completion_body(payload, plan)
@@ -0,0 +1,169 @@
+# app/core/hedging.py
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Hedger:
+    """
+    Request hedging for one model.
+
+    If a call hasn't returned after the configured percentile of recent
+    latencies, a duplicate is sent and whichever finishes first wins; the
+    other is cancelled (async) or abandoned (sync threads can't be
+    interrupted, their result is discarded). Hedges draw from a budget
+    refilled by `max_rate` per request, so at most ~max_rate of calls are
+    duplicated even when the upstream is slow across the board.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._latencies = deque(maxlen=settings.llm_hedge_window)
+        self._lock = threading.Lock()
+        self._budget = 0.0
+        self._executor = None
+        self._stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "primary_wins": 0, "budget_exhausted": 0}
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, None while there are too few samples."""
+        with self._lock:
+            if len(self._latencies) < settings.llm_hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+
+        index = min(len(ordered) - 1, int(len(ordered) * settings.llm_hedge_percentile / 100))
+        return max(settings.llm_hedge_min_delay_seconds, ordered[index])
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["model"] = self.model_name
+        stats["hedge_delay_seconds"] = self.hedge_delay()
+        return stats
+
+    def run(self, fn: Callable[[], T]) -> T:
+        delay = self._start_request()
+        if delay is None:
+            return self._timed(fn)
+
+        executor = self._get_executor()
+        primary = executor.submit(self._timed, fn)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_budget():
+            return primary.result()
+
+        hedge = executor.submit(self._timed, fn)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    self._record_win(future is hedge)
+                    return future.result()
+
+        return primary.result()
+
+    async def arun(self, fn: Callable[[], Awaitable[T]]) -> T:
+        delay = self._start_request()
+        if delay is None:
+            return await self._atimed(fn)
+
+        primary = asyncio.ensure_future(self._atimed(fn))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._take_budget():
+                return await primary
+
+            hedge = asyncio.ensure_future(self._atimed(fn))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._record_win(task is hedge)
+                        return task.result()
+
+            return primary.result()
+        finally:
+            # loser (or both, if the caller was cancelled)
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    # -- internals ---------------------------------------------------------
+
+    def _start_request(self) -> Optional[float]:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._budget = min(settings.llm_hedge_max_burst, self._budget + settings.llm_hedge_max_rate)
+        return self.hedge_delay()
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self._budget < 1:
+                self._stats["budget_exhausted"] += 1
+                return False
+            self._budget -= 1
+            self._stats["hedged"] += 1
+        logger.info(f"Hedging slow call to {self.model_name}")
+        return True
+
+    def _record_win(self, hedge_won: bool) -> None:
+        with self._lock:
+            self._stats["hedge_wins" if hedge_won else "primary_wins"] += 1
+
+    def _record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _timed(self, fn: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        result = fn()
+        self._record_latency(time.perf_counter() - start)
+        return result
+
+    async def _atimed(self, fn: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        result = await fn()
+        self._record_latency(time.perf_counter() - start)
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.llm_hedge_max_threads,
+                    thread_name_prefix=f"hedge-{self.model_name}",
+                )
+            return self._executor
+
+
+_hedgers = {}
+_hedgers_lock = threading.Lock()
+
+
+def get_hedger(model_name: str) -> Hedger:
+    """One Hedger per model, shared by the sync and async clients of the process."""
+    with _hedgers_lock:
+        if model_name not in _hedgers:
+            _hedgers[model_name] = Hedger(model_name)
+        return _hedgers[model_name]
+
+
+def hedging_stats() -> list:
+    with _hedgers_lock:
+        hedgers = list(_hedgers.values())
+    return [hedger.stats() for hedger in hedgers]
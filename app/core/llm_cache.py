@@ -0,0 +1,171 @@
+# app/core/llm_cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "llm_cache"
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for LLM completions.
+
+    Tier 1 is an in-process LRU bounded by entry count and total bytes.
+    Tier 2 is Redis, shared by every API and Celery worker process.
+    Both tiers expire entries after `ttl_seconds`.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (expires_at, size_in_bytes, value)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        raw = json.dumps(
+            [model, system_prompt, prompt, round(float(temperature), 4), max_tokens],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, int, int]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, size, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["local_hits"] += 1
+                    return value
+                self._remove(key)
+
+        value = self._redis_get(key)
+        if value is not None:
+            with self._lock:
+                self._stats["redis_hits"] += 1
+            self._local_set(key, value)
+            return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+        self._redis_incr("misses")
+        return None
+
+    def set(self, key: str, value: Tuple[str, int, int]) -> None:
+        redis_client = get_redis_client()
+        self._local_set(key, value)
+        if redis_client is None:
+            return
+        try:
+            redis_client.set(f"{REDIS_PREFIX}:{key}", json.dumps(value), ex=self.ttl_seconds)
+        except (redis.ConnectionError, redis.TimeoutError):
+            pass
+
+    def stats(self) -> dict:
+        redis_client = get_redis_client()
+        with self._lock:
+            local = dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+
+        shared = None
+        if redis_client is not None:
+            try:
+                hits, misses = redis_client.mget(
+                    f"{REDIS_PREFIX}:stats:hits", f"{REDIS_PREFIX}:stats:misses"
+                )
+                shared = {"hits": int(hits or 0), "misses": int(misses or 0)}
+            except (redis.ConnectionError, redis.TimeoutError):
+                pass
+
+        return {"process": local, "shared": shared}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # -- internals ---------------------------------------------------------
+
+    def _local_set(self, key: str, value: Tuple[str, int, int]) -> None:
+        size = len(value[0].encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + self.ttl_seconds, size, tuple(value))
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _redis_get(self, key: str) -> Optional[Tuple[str, int, int]]:
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return None
+        try:
+            raw = redis_client.get(f"{REDIS_PREFIX}:{key}")
+        except (redis.ConnectionError, redis.TimeoutError):
+            return None
+        if raw is None:
+            return None
+        self._redis_incr("hits")
+        return tuple(json.loads(raw))
+
+    def _redis_incr(self, counter: str) -> None:
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            redis_client.incr(f"{REDIS_PREFIX}:stats:{counter}")
+        except (redis.ConnectionError, redis.TimeoutError):
+            pass
+
+
+llm_cache = LLMResponseCache(
+    max_entries=settings.llm_cache_max_entries,
+    max_bytes=settings.llm_cache_max_bytes,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+)
+
+
+def should_use_cache(temperature: float, use_cache: Optional[bool] = None) -> bool:
+    """
+    Caching is opt-in (settings.llm_cache_enabled or use_cache=True).
+    Sampled calls (temperature > 0) bypass it unless explicitly requested.
+    """
+    if use_cache is not None:
+        return use_cache
+    if not settings.llm_cache_enabled:
+        return False
+    return temperature <= 0 or settings.llm_cache_include_sampled
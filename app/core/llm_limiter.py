@@ -0,0 +1,194 @@
+# app/core/llm_limiter.py
+import asyncio
+import logging
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+import httpx
+import redis
+
+from app.core.config import settings
+from app.core.llm_registry import ModelConfig
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "llm_limiter"
+
+# Leases live in a sorted set scored by expiry, so slots held by a killed
+# worker free themselves after lease_ttl instead of leaking.
+ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+redis.call("zremrangebyscore", KEYS[1], "-inf", now)
+local limit = tonumber(redis.call("hget", KEYS[2], "limit") or ARGV[4])
+if redis.call("zcard", KEYS[1]) < math.max(1, math.floor(limit)) then
+    redis.call("zadd", KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+    redis.call("pexpire", KEYS[1], tonumber(ARGV[2]))
+    return 1
+end
+return 0
+"""
+
+# Additive increase: +additive per `limit` successes (about +additive per window).
+# Multiplicative decrease on throttling, at most once per cooldown so one
+# burst of 429s doesn't collapse the window to the floor.
+FEEDBACK_SCRIPT = """
+local now = tonumber(ARGV[2])
+local limit = tonumber(redis.call("hget", KEYS[1], "limit") or ARGV[6])
+if ARGV[1] == "success" then
+    limit = math.min(tonumber(ARGV[5]), limit + tonumber(ARGV[3]) / limit)
+else
+    local last = tonumber(redis.call("hget", KEYS[1], "last_decrease") or 0)
+    if now - last < tonumber(ARGV[8]) then
+        return tostring(limit)
+    end
+    limit = math.max(tonumber(ARGV[7]), limit * tonumber(ARGV[4]))
+    redis.call("hset", KEYS[1], "last_decrease", now)
+end
+redis.call("hset", KEYS[1], "limit", tostring(limit))
+return tostring(limit)
+"""
+
+
+class UpstreamBusyError(Exception):
+    """No upstream slot became free within llm_limiter_acquire_timeout_seconds."""
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    return isinstance(error, httpx.HTTPStatusError) and (
+        error.response.status_code == 429 or error.response.status_code >= 500
+    )
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Cluster-wide concurrency window for one upstream model.
+
+    Every API and Celery worker process takes a lease from the same Redis
+    window before calling the provider. The window size adapts with AIMD:
+    it grows slowly while calls succeed and halves on 429 / 5xx, so the
+    fleet settles near the provider's real ceiling. Without Redis, calls
+    are not limited.
+    """
+
+    def __init__(self, config: ModelConfig):
+        self.config = config
+        self.leases_key = f"{REDIS_PREFIX}:{config.model}:leases"
+        self.state_key = f"{REDIS_PREFIX}:{config.model}:state"
+
+    @contextmanager
+    def slot(self):
+        lease_id = self._acquire()
+        try:
+            yield
+        except BaseException as e:
+            self._release(lease_id, "throttled" if is_throttling_error(e) else "error")
+            raise
+        self._release(lease_id, "success")
+
+    @asynccontextmanager
+    async def aslot(self):
+        lease_id = await self._aacquire()
+        try:
+            yield
+        except BaseException as e:
+            outcome = "throttled" if is_throttling_error(e) else "error"
+            await asyncio.to_thread(self._release, lease_id, outcome)
+            raise
+        await asyncio.to_thread(self._release, lease_id, "success")
+
+    def state(self) -> Optional[dict]:
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return None
+        try:
+            now = int(time.time() * 1000)
+            in_flight = redis_client.zcount(self.leases_key, now, "+inf")
+            limit = redis_client.hget(self.state_key, "limit")
+        except (redis.ConnectionError, redis.TimeoutError):
+            return None
+        return {
+            "model": self.config.model,
+            "limit": float(limit) if limit is not None else self.config.limiter_initial_limit,
+            "in_flight": in_flight,
+        }
+
+    # -- internals ---------------------------------------------------------
+
+    def _try_acquire(self) -> Optional[str]:
+        """Returns a lease id, "" when there is no limiter (Redis down), None when full."""
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return ""
+
+        lease_id = str(uuid.uuid4())
+        try:
+            acquired = redis_client.eval(
+                ACQUIRE_SCRIPT, 2, self.leases_key, self.state_key,
+                int(time.time() * 1000),
+                int(settings.llm_limiter_lease_ttl_seconds * 1000),
+                lease_id,
+                self.config.limiter_initial_limit,
+            )
+        except redis.RedisError:
+            return ""
+        return lease_id if acquired else None
+
+    def _acquire(self) -> str:
+        deadline = time.monotonic() + settings.llm_limiter_acquire_timeout_seconds
+        attempt = 0
+        while True:
+            lease_id = self._try_acquire()
+            if lease_id is not None:
+                return lease_id
+            if time.monotonic() >= deadline:
+                raise UpstreamBusyError(f"No upstream slot for {self.config.model}")
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def _aacquire(self) -> str:
+        deadline = time.monotonic() + settings.llm_limiter_acquire_timeout_seconds
+        attempt = 0
+        while True:
+            lease_id = await asyncio.to_thread(self._try_acquire)
+            if lease_id is not None:
+                return lease_id
+            if time.monotonic() >= deadline:
+                raise UpstreamBusyError(f"No upstream slot for {self.config.model}")
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # jittered so waiting workers don't retry in lockstep
+        return min(0.5, 0.02 * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+    def _release(self, lease_id: str, outcome: str) -> None:
+        redis_client = get_redis_client()
+        if not lease_id:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.zrem(self.leases_key, lease_id)
+            if outcome != "error":
+                pipe.eval(
+                    FEEDBACK_SCRIPT, 1, self.state_key,
+                    outcome,
+                    int(time.time() * 1000),
+                    settings.llm_limiter_additive_increase,
+                    settings.llm_limiter_multiplicative_decrease,
+                    self.config.limiter_max_limit,
+                    self.config.limiter_initial_limit,
+                    self.config.limiter_min_limit,
+                    int(settings.llm_limiter_decrease_cooldown_seconds * 1000),
+                )
+            results = pipe.execute()
+        except redis.RedisError:
+            logger.warning("LLM limiter: failed to release lease", exc_info=True)
+            return
+
+        if outcome == "throttled":
+            logger.warning(f"Upstream throttled {self.config.model}, concurrency limit now {results[-1]}")
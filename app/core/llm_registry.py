@@ -0,0 +1,66 @@
+# app/core/llm_registry.py
+from typing import List
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+class UnknownModelError(ValueError):
+    pass
+
+
+class ModelConfig(BaseModel):
+    """Connection settings of one model (or endpoint) served through the LLM client pool."""
+    name: str
+    model: str  # upstream model id sent to the provider
+    base_url: str
+    api_key_env: str = "HUGGINGFACE_API_KEY"
+    timeout_seconds: float
+    connect_timeout_seconds: float
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry_seconds: float
+    max_concurrency: int  # per process (async client)
+    # cluster-wide AIMD concurrency window, see app/core/llm_limiter.py
+    limiter_initial_limit: float
+    limiter_min_limit: float
+    limiter_max_limit: float
+
+
+def _defaults(name: str) -> dict:
+    return {
+        "name": name,
+        "model": name,
+        "base_url": settings.hf_inference_base_url,
+        "timeout_seconds": settings.llm_timeout_seconds,
+        "connect_timeout_seconds": settings.llm_connect_timeout_seconds,
+        "max_connections": settings.llm_max_connections,
+        "max_keepalive_connections": settings.llm_max_keepalive_connections,
+        "keepalive_expiry_seconds": settings.llm_keepalive_expiry_seconds,
+        "max_concurrency": settings.llm_max_concurrency,
+        "limiter_initial_limit": settings.llm_limiter_initial_limit,
+        "limiter_min_limit": settings.llm_limiter_min_limit,
+        "limiter_max_limit": settings.llm_limiter_max_limit,
+    }
+
+
+def list_models() -> List[str]:
+    return [settings.llm_default_model] + [
+        name for name in settings.llm_models if name != settings.llm_default_model
+    ]
+
+
+def get_model_config(name: str) -> ModelConfig:
+    """
+    Registered models take their overrides from settings.llm_models; other
+    names are passed through to the provider with default limits, unless
+    llm_allow_unregistered_models is off.
+    """
+    if name in settings.llm_models:
+        return ModelConfig(**{**_defaults(name), **settings.llm_models[name]})
+
+    if name != settings.llm_default_model and not settings.llm_allow_unregistered_models:
+        raise UnknownModelError(f"Unknown model: {name}")
+
+    return ModelConfig(**_defaults(name))
@@ -70,27 +70,106 @@
 
 # app/core/llm_singleton.py
 
+import asyncio
+import json
+import logging
 import os
-from huggingface_hub import InferenceClient
+import threading
+from contextlib import nullcontext
+from typing import AsyncIterator, NamedTuple, Optional
+import httpx
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.core.fake_llm import fake_transport
+from app.core.hedging import get_hedger
+from app.core.llm_limiter import AdaptiveConcurrencyLimiter
+from app.core.llm_registry import ModelConfig, get_model_config
+
 load_dotenv("E:\pyDS\llmops\.env")
 
+logger = logging.getLogger(__name__)
+
+
+class LLMCompletion(NamedTuple):
+    text: str
+    # token usage as reported by the provider, None when it is not returned
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+def _client_options(config: ModelConfig, asynchronous: bool = False) -> dict:
+    return {
+        "transport": fake_transport(asynchronous),
+        "base_url": config.base_url,
+        "headers": {"Authorization": f"Bearer {os.getenv(config.api_key_env)}"},
+        "timeout": httpx.Timeout(config.timeout_seconds, connect=config.connect_timeout_seconds),
+        "limits": httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry_seconds,
+        ),
+    }
+
+
+def _chat_payload(
+    model: str,
+    prompt: str,
+    system_prompt: str,
+    max_new_tokens: int,
+    temperature: float,
+) -> dict:
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_new_tokens,
+        "temperature": temperature,
+    }
+
+
+def _parse_completion(body: dict) -> LLMCompletion:
+    usage = body.get("usage") or {}
+    return LLMCompletion(
+        text=body["choices"][0]["message"]["content"],
+        prompt_tokens=usage.get("prompt_tokens"),
+        completion_tokens=usage.get("completion_tokens"),
+    )
+
+
 class LLMService:
-    _instance = None
+    """
+    Sync chat-completion client, one instance per model.
 
-    def __new__(cls):
-        if cls._instance is None:
-            print("Initializing HF Inference Client...")
-            cls._instance = super(LLMService, cls).__new__(cls)
+    LLMService(model_name) returns the pooled instance for that model,
+    created on first use with the model's own connection limits, timeouts
+    and keep-alive (see app/core/llm_registry.py). Instances are safe to
+    share across threads.
+    """
+    _instances = {}
+    _lock = threading.Lock()
 
-            cls._instance.client = InferenceClient(
-                api_key=os.getenv("HUGGINGFACE_API_KEY"),
-            )
+    def __new__(cls, model_name: Optional[str] = None):
+        model_name = model_name or settings.llm_default_model
+        instance = cls._instances.get(model_name)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(model_name)
+                if instance is None:
+                    logger.info(f"Initializing LLM client for {model_name}...")
+                    config = get_model_config(model_name)
 
-            cls._instance.model = "Qwen/Qwen2.5-1.5B-Instruct"
+                    instance = super(LLMService, cls).__new__(cls)
+                    instance.config = config
+                    instance.model = config.model
+                    instance.client = httpx.Client(**_client_options(config))
+                    instance.limiter = AdaptiveConcurrencyLimiter(config) if settings.llm_limiter_enabled else None
+                    instance.hedger = get_hedger(model_name)
 
-        return cls._instance
+                    cls._instances[model_name] = instance
+        return instance
 
     def generate(
         self,
@@ -99,15 +178,158 @@ class LLMService:
         max_new_tokens: int = 150,
         temperature: float = 0.0,
     ) -> str:
+        return self.complete(prompt, system_prompt, max_new_tokens, temperature).text
+
+    def complete(
+        self,
+        prompt: str,
+        system_prompt: str,
+        max_new_tokens: int = 150,
+        temperature: float = 0.0,
+    ) -> LLMCompletion:
+
+        def attempt():
+            return self._complete_once(prompt, system_prompt, max_new_tokens, temperature)
+
+        if settings.llm_hedging_enabled:
+            return self.hedger.run(attempt)
+        return attempt()
+
+    def _complete_once(
+        self,
+        prompt: str,
+        system_prompt: str,
+        max_new_tokens: int,
+        temperature: float,
+    ) -> LLMCompletion:
+
+        # cluster-wide upstream slot; 429 / 5xx shrink the shared window
+        with self.limiter.slot() if self.limiter else nullcontext():
+            response = self.client.post(
+                "/chat/completions",
+                json=_chat_payload(self.model, prompt, system_prompt, max_new_tokens, temperature),
+            )
+            response.raise_for_status()
+
+        return _parse_completion(response.json())
+
+
+class AsyncLLMService:
+    """
+    Async counterpart of LLMService for use inside the event loop.
+
+    One instance per model: each has its own httpx.AsyncClient keep-alive
+    pool shared by every coroutine of the process, and a semaphore capping
+    in-flight upstream calls to the model's max_concurrency.
+    """
+    _instances = {}
+
+    def __new__(cls, model_name: Optional[str] = None):
+        model_name = model_name or settings.llm_default_model
+        # no await between lookup and insert, so this is atomic on the event loop
+        instance = cls._instances.get(model_name)
+        if instance is None:
+            logger.info(f"Initializing async LLM client for {model_name}...")
+            config = get_model_config(model_name)
+
+            instance = super(AsyncLLMService, cls).__new__(cls)
+            instance.config = config
+            instance.model = config.model
+            instance.client = httpx.AsyncClient(**_client_options(config, asynchronous=True))
+            instance.semaphore = asyncio.Semaphore(config.max_concurrency)
+            instance.limiter = AdaptiveConcurrencyLimiter(config) if settings.llm_limiter_enabled else None
+            instance.hedger = get_hedger(model_name)
+
+            cls._instances[model_name] = instance
+        return instance
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str,
+        max_new_tokens: int = 150,
+        temperature: float = 0.0,
+    ) -> str:
+        return (await self.complete(prompt, system_prompt, max_new_tokens, temperature)).text
+
+    async def complete(
+        self,
+        prompt: str,
+        system_prompt: str,
+        max_new_tokens: int = 150,
+        temperature: float = 0.0,
+    ) -> LLMCompletion:
+
+        def attempt():
+            return self._complete_once(prompt, system_prompt, max_new_tokens, temperature)
+
+        if settings.llm_hedging_enabled:
+            return await self.hedger.arun(attempt)
+        return await attempt()
+
+    async def _complete_once(
+        self,
+        prompt: str,
+        system_prompt: str,
+        max_new_tokens: int,
+        temperature: float,
+    ) -> LLMCompletion:
+
+        async with self.semaphore:
+            async with self.limiter.aslot() if self.limiter else nullcontext():
+                response = await self.client.post(
+                    "/chat/completions",
+                    json=_chat_payload(self.model, prompt, system_prompt, max_new_tokens, temperature),
+                )
+                response.raise_for_status()
+
+        return _parse_completion(response.json())
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str,
+        max_new_tokens: int = 150,
+        temperature: float = 0.0,
+    ) -> AsyncIterator[LLMCompletion]:
+        """
+        Yield completion chunks as the provider emits them (server-sent events).
+        Each chunk carries a text delta; the provider's usage, when reported,
+        arrives on a final chunk with empty text.
+        """
+        payload = _chat_payload(self.model, prompt, system_prompt, max_new_tokens, temperature)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+
+        async with self.semaphore, self.limiter.aslot() if self.limiter else nullcontext():
+            async with self.client.stream("POST", "/chat/completions", json=payload) as response:
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+
+                    chunk = json.loads(data)
+                    choices = chunk.get("choices") or []
+                    if choices:
+                        delta = (choices[0].get("delta") or {}).get("content")
+                        if delta:
+                            yield LLMCompletion(text=delta)
+
+                    usage = chunk.get("usage")
+                    if usage:
+                        yield LLMCompletion(
+                            text="",
+                            prompt_tokens=usage.get("prompt_tokens"),
+                            completion_tokens=usage.get("completion_tokens"),
+                        )
 
-        completion = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=max_new_tokens,
-            temperature=temperature,
-        )
-
-        return completion.choices[0].message.content
+    @classmethod
+    async def aclose(cls):
+        instances = list(cls._instances.values())
+        cls._instances.clear()
+        for instance in instances:
+            await instance.client.aclose()
@@ -0,0 +1,66 @@
+# app/core/pagination.py
+"""
+Keyset pagination over (created_at, id), newest first.
+
+A page is fetched with `WHERE (created_at, id) < (:created_at, :id)` on a
+matching composite index, so every page costs the same however deep it is,
+unlike OFFSET, which scans and discards all earlier rows. Cursors are
+opaque base64 strings and come back in the X-Next-Cursor response header,
+which keeps the list response bodies unchanged. `skip` (OFFSET) is still
+accepted when no cursor is given.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _page(query, model, limit: int, skip: int, cursor: Optional[str]):
+    # works on an ORM Query and on a select() alike
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    elif skip:
+        query = query.offset(skip)
+    # one extra row tells whether there is a next page
+    return query.limit(limit + 1)
+
+
+def _trim(rows, response: Response, limit: int):
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
+
+
+def paginate(query, model, response: Response, limit: int, skip: int = 0, cursor: Optional[str] = None):
+    """One page of `query` newest first; sets X-Next-Cursor when more rows follow."""
+    limit = max(1, limit)
+    return _trim(_page(query, model, limit, skip, cursor).all(), response, limit)
+
+
+async def apaginate(db, statement, model, response: Response, limit: int, skip: int = 0, cursor: Optional[str] = None):
+    """paginate() for a select() on an AsyncSession."""
+    limit = max(1, limit)
+    rows = (await db.execute(_page(statement, model, limit, skip, cursor))).scalars().all()
+    return _trim(list(rows), response, limit)
@@ -0,0 +1,51 @@
+import threading
+import time
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+# Shared Redis connection for the LLM layer (cache, coordination, limits).
+# Connected lazily on first use rather than at import, so a worker that starts
+# before Redis is up picks it up once it is reachable. Until then
+# get_redis_client() returns None and callers degrade to in-process behaviour;
+# failed connection attempts are retried with exponential backoff.
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 60.0
+
+_client: Optional[redis.Redis] = None
+_retry_at = 0.0
+_retry_delay = RECONNECT_MIN_SECONDS
+_lock = threading.Lock()
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    global _client, _retry_at, _retry_delay
+
+    if _client is not None:
+        return _client
+    if time.monotonic() < _retry_at:
+        return None
+
+    with _lock:
+        if _client is not None or time.monotonic() < _retry_at:
+            return _client
+        client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=2,
+            decode_responses=True,
+            socket_connect_timeout=2,
+        )
+        try:
+            client.ping()
+        except (redis.ConnectionError, redis.TimeoutError):
+            _retry_at = time.monotonic() + _retry_delay
+            _retry_delay = min(_retry_delay * 2, RECONNECT_MAX_SECONDS)
+            return None
+        # once connected, redis-py reconnects by itself; callers already
+        # handle the errors of commands sent while Redis is away
+        _client = client
+        _retry_delay = RECONNECT_MIN_SECONDS
+        return _client
@@ -1,15 +1,14 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.database import async_session
 from app.models import APIKey
 
 security = HTTPBearer(auto_error=False)
 
-def get_api_key(
+async def get_api_key(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
 ):
     if credentials is None:
         raise HTTPException(
@@ -23,12 +22,18 @@ def get_api_key(
             detail="Invalid auth scheme"
         )
 
-    api_key = (
-        db.query(APIKey)
-        .filter(APIKey.key == credentials.credentials)
-        .filter(APIKey.is_active == True)
-        .first()
-    )
+    # runs on the event loop for every authenticated request, sync routes
+    # included; the session is closed right away so no connection is held
+    # for the rest of the request
+    async with async_session() as db:
+        api_key = (
+            await db.execute(
+                select(APIKey)
+                .filter(APIKey.key == credentials.credentials)
+                .filter(APIKey.is_active == True)
+                .limit(1)
+            )
+        ).scalar_one_or_none()
 
     if not api_key:
         raise HTTPException(
@@ -0,0 +1,199 @@
+# app/core/single_flight.py
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "singleflight"
+
+# compare-and-delete so a leader never releases a lock it no longer owns
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls so only one reaches the upstream.
+
+    Within a process, callers with the same key wait on the first caller.
+    Across processes, the first caller takes a Redis lock and publishes the
+    result on a channel; other processes wait for it. If the leader fails or
+    disappears, waiters fall back to making the call themselves.
+    """
+
+    def __init__(self, lock_ttl_seconds: float, wait_timeout_seconds: float):
+        self.lock_ttl_ms = int(lock_ttl_seconds * 1000)
+        self.wait_timeout_seconds = wait_timeout_seconds
+
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced_local": 0, "coalesced_remote": 0}
+
+    def do(self, key: str, fn: Callable[[], tuple]) -> tuple:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self._stats["coalesced_local"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._do_shared(key, fn)
+            return call.result
+        except BaseException as e:
+            # BaseException too: waiters must not wake up to a missing result
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    # -- cross-process protocol --------------------------------------------
+
+    def _do_shared(self, key: str, fn: Callable[[], tuple]) -> tuple:
+        role = self._try_lead(key)
+        if role is None:
+            return fn()
+
+        leading, token = role
+        if not leading:
+            result = self._wait_for_leader(key, token)
+            if result is not None:
+                return result
+            return fn()
+
+        try:
+            result = fn()
+        except BaseException:
+            # tell remote waiters now rather than leave them to time out
+            self._publish(key, token, None)
+            raise
+        self._publish(key, token, result)
+        return result
+
+    def _try_lead(self, key: str):
+        """
+        Returns (True, token) if this process leads, (False, leader_token) if
+        another process already does, and None when there is nobody to wait
+        for (Redis unavailable, or the lock expired in between).
+        """
+        redis_client = get_redis_client()
+        leader_token = None
+        if redis_client is not None:
+            token = str(uuid.uuid4())
+            try:
+                if redis_client.set(f"{REDIS_PREFIX}:lock:{key}", token, nx=True, px=self.lock_ttl_ms):
+                    leader_token = token
+                else:
+                    leader_token = redis_client.get(f"{REDIS_PREFIX}:lock:{key}")
+                    if leader_token is not None:
+                        return False, leader_token
+            except (redis.ConnectionError, redis.TimeoutError):
+                leader_token = None
+
+        with self._lock:
+            self._stats["leaders"] += 1
+        if leader_token is None:
+            return None
+        return True, leader_token
+
+    def _publish(self, key: str, token: str, result: Optional[tuple]) -> None:
+        redis_client = get_redis_client()
+        try:
+            if result is not None:
+                redis_client.set(
+                    f"{REDIS_PREFIX}:result:{key}:{token}", json.dumps(result), px=self.lock_ttl_ms
+                )
+            redis_client.publish(f"{REDIS_PREFIX}:channel:{key}", "done" if result is not None else "error")
+            redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"{REDIS_PREFIX}:lock:{key}", token)
+        except redis.RedisError:
+            logger.warning("Single-flight: failed to publish result", exc_info=True)
+
+    def _wait_for_leader(self, key: str, token: str) -> Optional[tuple]:
+        """Block until the leading process publishes; None means do it yourself."""
+        redis_client = get_redis_client()
+        result_key = f"{REDIS_PREFIX}:result:{key}:{token}"
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(f"{REDIS_PREFIX}:channel:{key}")
+        except (redis.ConnectionError, redis.TimeoutError):
+            return None
+
+        try:
+            deadline = time.monotonic() + self.wait_timeout_seconds
+            while time.monotonic() < deadline:
+                # subscribed first, so a result published meanwhile is not missed
+                raw = redis_client.get(result_key)
+                if raw is None and redis_client.get(f"{REDIS_PREFIX}:lock:{key}") != token:
+                    # leader released its lock: either it just published, or
+                    # it failed / its lock expired
+                    raw = redis_client.get(result_key)
+                    if raw is None:
+                        return None
+
+                if raw is not None:
+                    with self._lock:
+                        self._stats["coalesced_remote"] += 1
+                    return tuple(json.loads(raw))
+
+                message = pubsub.get_message(timeout=1.0)
+                if message is not None and message["data"] == "error":
+                    return None
+            return None
+        except (redis.ConnectionError, redis.TimeoutError):
+            return None
+        finally:
+            pubsub.close()
+
+
+def should_coalesce(temperature: float, coalesce: Optional[bool] = None) -> bool:
+    """
+    Single-flight is on by default for deterministic calls (temperature 0)
+    only: coalesced callers share one output, which is wrong for sampled
+    calls unless explicitly requested (coalesce=True or
+    settings.llm_single_flight_include_sampled).
+    """
+    if coalesce is not None:
+        return coalesce
+    if not settings.llm_single_flight_enabled:
+        return False
+    return temperature <= 0 or settings.llm_single_flight_include_sampled
+
+
+single_flight = SingleFlight(
+    lock_ttl_seconds=settings.llm_single_flight_lock_ttl_seconds,
+    wait_timeout_seconds=settings.llm_single_flight_wait_timeout_seconds,
+)
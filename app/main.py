@@ -1,12 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from app.api.v1.analytics import router as analytics_router
 from app.api.v1.health import router as health_router
 from app.api.v1.run import router as run_router
 from app.core.middleware import request_id_middleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.llm_singleton import AsyncLLMService
 from app.api.v1.protected import router as protected_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # close the shared keep-alive pool of the async LLM client
+    await AsyncLLMService.aclose()
+
+
 app = FastAPI(
     title="LLMOps Platform",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 app.middleware("http")(request_id_middleware)
@@ -19,6 +32,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER],  # pagination cursor, readable by the frontend
 )
 
 # Include Routers
@@ -41,4 +55,10 @@ app.include_router(
     protected_router,
     prefix="/api/v1",
     tags=["protected"]
-)
\ No newline at end of file
+)
+
+app.include_router(
+    analytics_router,
+    prefix="/api/v1",
+    tags=["analytics"]
+)
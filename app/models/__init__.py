@@ -1,6 +1,7 @@
 from .base import Base
 from .user import User, APIKey
 from .prompt import Prompt, PromptVersion
-from .run import Run, CostLog
+from .run import Run, RunBatch, CostLog
 from .evaluation import GoldenExample, EvaluationResult
-from .experiment import Experiment, ExperimentResult
\ No newline at end of file
+from .experiment import Experiment, ExperimentResult, ExperimentExampleResult
+from .analytics import RunRollupHourly, RollupWatermark
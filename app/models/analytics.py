@@ -0,0 +1,41 @@
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Float, Integer, String, UniqueConstraint
+from datetime import datetime
+from .base import Base , uuid_pk
+
+
+# Hourly rollup of finished runs per (hour, model, prompt version), kept
+# current incrementally by app/services/analytics.py. Latency is stored as a
+# fixed-bucket histogram so buckets can be summed across hours, models and
+# versions and percentiles still read off the merged counts.
+class RunRollupHourly(Base):
+    __tablename__ = "run_rollups_hourly"
+
+    id = uuid_pk()
+    bucket = Column(DateTime, nullable=False)  # start of the hour the runs finished in
+    model = Column(String, nullable=False)
+    prompt_version_id = Column(String, nullable=False)
+
+    run_count = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)  # runs that finished as failed
+    tokens_in = Column(BigInteger, default=0)
+    tokens_out = Column(BigInteger, default=0)
+    cost_usd = Column(Float, default=0.0)
+    latency_count = Column(Integer, default=0)  # runs with a measured latency
+    latency_sum_ms = Column(BigInteger, default=0)
+    latency_max_ms = Column(Integer, nullable=True)
+    latency_histogram = Column(JSON, nullable=True)  # counts per LATENCY_BUCKETS_MS bucket
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("bucket", "model", "prompt_version_id", name="uq_run_rollups_hourly_key"),
+    )
+
+
+# How far a rollup has read its source table: rows up to `watermark` are
+# already counted, so a refresh only reads rows after it.
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    watermark = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Float, ForeignKey, DateTime
+from sqlalchemy import Column, String, Text, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -17,6 +17,11 @@ class GoldenExample(Base):
 
     prompt = relationship("Prompt", back_populates="golden_examples")
 
+    __table_args__ = (
+        # examples of a prompt, in export order
+        Index("idx_golden_examples_prompt_created", "prompt_id", "created_at", "id"),
+    )
+
 
 class EvaluationResult(Base):
     __tablename__ = "evaluation_results"
@@ -29,11 +34,17 @@ class EvaluationResult(Base):
     reason = Column(Text, nullable=True, default="")
     hallucination_rate = Column(Float, nullable=True)
     output = Column(Text)
+    scored_by = Column(String, nullable=True)  # exact, cheap or judge (cascade evaluator tier)
+    cheap_score = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     run = relationship("Run", back_populates="evaluations")
     golden_example = relationship("GoldenExample")
 
+    __table_args__ = (
+        Index("idx_evaluation_results_version_created", "prompt_version_id", "created_at"),
+    )
+
 
 '''
     Why are Golden Examples tied to the Prompt, not the Version?
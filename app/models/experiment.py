@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Float, String, DateTime, ForeignKey
+from sqlalchemy import JSON, Boolean, Column, Float, Integer, String, Text, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .base import Base , uuid_pk
@@ -11,8 +11,19 @@ class Experiment(Base):
     name = Column(String, nullable=False)
     status = Column(String, default="running")  # running, completed, failed
     created_at = Column(DateTime, default=datetime.utcnow)
-    
+
+    # progress of a running experiment, advanced by each shard as it lands
+    task_id = Column(String, nullable=True)  # celery task reporting PROGRESS
+    started_at = Column(DateTime, nullable=True)
+    total_cells = Column(Integer, default=0)  # (version, example) cells to compute
+    completed_cells = Column(Integer, default=0)
+    heartbeat_at = Column(DateTime, nullable=True)  # last sign of life from a worker
+
     prompt = relationship("Prompt", back_populates="experiments")
+
+    __table_args__ = (
+        Index("idx_experiments_created_at_id", "created_at", "id"),  # keyset pagination
+    )
     results = relationship(
         "ExperimentResult",
         back_populates="experiment",
@@ -24,15 +35,62 @@ class ExperimentResult(Base):
     __tablename__ = "experiment_results"
 
     id = uuid_pk()
-    experiment_id = Column(String, ForeignKey("experiments.id", ondelete="CASCADE"))
+    experiment_id = Column(String, ForeignKey("experiments.id", ondelete="CASCADE"), index=True)
     prompt_version_id = Column(String, ForeignKey("prompt_versions.id", ondelete="CASCADE"))
 
     avg_score = Column(Float)
     min_score = Column(Float)
     max_score = Column(Float)
     avg_hallucination_rate = Column(Float, nullable=True)
-    failure_count = Column(Float)
-    total_examples = Column(Float)
+    failure_count = Column(Integer)
+    total_examples = Column(Integer)
+    # distribution statistics, filled in when the experiment completes
+    std_score = Column(Float, nullable=True)
+    median_score = Column(Float, nullable=True)
+    score_percentiles = Column(JSON, nullable=True)  # {"p5": ..., "p25": ..., ..., "p95": ...}
+    ci_low = Column(Float, nullable=True)  # bootstrap confidence interval of avg_score
+    ci_high = Column(Float, nullable=True)
+    hallucination_histogram = Column(JSON, nullable=True)  # {"bins": [...], "counts": [...]}
+    early_stopped = Column(Boolean, default=False)  # dropped early as clearly worse than the leader
+    samples_used = Column(Integer, nullable=True)  # golden examples this result is based on
 
     created_at = Column(DateTime, default=datetime.utcnow)
-    experiment = relationship("Experiment", back_populates="results")
\ No newline at end of file
+    experiment = relationship("Experiment", back_populates="results")
+
+
+# One evaluated (version, golden example) cell of an experiment. Cells are
+# keyed by content hashes so a later experiment can reuse any cell whose
+# template, example, model and judge are all unchanged.
+class ExperimentExampleResult(Base):
+    __tablename__ = "experiment_example_results"
+
+    id = uuid_pk()
+    experiment_id = Column(String, ForeignKey("experiments.id", ondelete="CASCADE"), nullable=False)
+    prompt_version_id = Column(String, ForeignKey("prompt_versions.id", ondelete="CASCADE"), nullable=False)
+    golden_example_id = Column(String, ForeignKey("golden_examples.id", ondelete="CASCADE"), nullable=False)
+
+    template_hash = Column(String(64), nullable=False)
+    example_hash = Column(String(64), nullable=False)
+    model = Column(String, nullable=False)
+    judge_version = Column(String, nullable=False)
+
+    score = Column(Float, nullable=False)
+    hallucination_rate = Column(Float, nullable=True)
+    reason = Column(Text, nullable=True, default="")
+    output = Column(Text)
+    scored_by = Column(String, nullable=True)  # exact, cheap or judge (cascade evaluator tier)
+    cheap_score = Column(Float, nullable=True)  # lexical score, kept to tune the cascade band
+    reused_from_id = Column(String, nullable=True)  # cell this one was copied from
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "experiment_id", "prompt_version_id", "golden_example_id",
+            name="uq_experiment_example_cell",
+        ),
+        Index(
+            "idx_example_results_cache_key",
+            "template_hash", "example_hash", "model", "judge_version",
+        ),
+    )
\ No newline at end of file
@@ -2,7 +2,7 @@ from .base import Base , uuid_pk
 from sqlalchemy import Column, String, ForeignKey , DateTime , Boolean
 from datetime import datetime
 from sqlalchemy.orm import relationship
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 
 
 # Prompt 
@@ -23,6 +23,10 @@ class Prompt(Base):
     golden_examples = relationship("GoldenExample", back_populates="prompt")
     experiments = relationship("Experiment", back_populates="prompt")
 
+    __table_args__ = (
+        Index("idx_prompts_created_at_id", "created_at", "id"),  # keyset pagination
+    )
+
 # PromptVersion
 class PromptVersion(Base):
     __tablename__ = "prompt_versions"
@@ -43,4 +47,5 @@ class PromptVersion(Base):
 
     __table_args__ = (
         UniqueConstraint("prompt_id", "version", name="uq_prompt_version"),
+        Index("idx_prompt_versions_prompt_created", "prompt_id", "created_at"),  # version history
     )
\ No newline at end of file
@@ -7,6 +7,22 @@ from sqlalchemy.orm import relationship
 
 from .prompt import PromptVersion
 
+# RunBatch: many runs of one prompt version submitted together
+class RunBatch(Base):
+    __tablename__ = "run_batches"
+
+    id = uuid_pk()
+    prompt_version_id = Column(
+        String,
+        ForeignKey("prompt_versions.id", ondelete="CASCADE")
+    )
+    model = Column(String)
+    total_runs = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    runs = relationship("Run", back_populates="batch")
+
+
 # Run
 class Run(Base):
     __tablename__ = "runs"
@@ -21,10 +37,21 @@ class Run(Base):
     output = Column(String)
     model = Column(String)
     latency_ms = Column(Integer)
+    ttft_ms = Column(Integer, nullable=True)  # time to first token (streamed runs)
+    tokens_per_second = Column(Float, nullable=True)
     tokens_in = Column(Integer)
     tokens_out = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
     status = Column(String, default="pending")
+    # set once, when the run reaches its final status; analytics rollups read runs by it
+    finished_at = Column(DateTime, nullable=True)
+    batch_id = Column(
+        String,
+        ForeignKey("run_batches.id", ondelete="CASCADE"),
+        nullable=True
+    )
+
+    batch = relationship("RunBatch", back_populates="runs")
 
     prompt_version = relationship(
         "PromptVersion",
@@ -61,5 +88,15 @@ class CostLog(Base):
 
 
 
-Index("idx_runs_created_at", Run.created_at)
+Index("idx_runs_created_at_id", Run.created_at, Run.id)  # keyset pagination
+Index("idx_runs_batch_status", Run.batch_id, Run.status)
+# partial: only in-flight runs, a small and hot slice of a large table
+Index(
+    "idx_runs_active_status",
+    Run.status,
+    Run.created_at,
+    postgresql_where=Run.status.in_(["pending", "running"]),
+    sqlite_where=Run.status.in_(["pending", "running"]),
+)
+Index("idx_runs_finished_at", Run.finished_at)  # incremental analytics refresh
 Index("idx_cost_run_id", CostLog.run_id)
\ No newline at end of file
@@ -29,3 +29,13 @@ class APIKey(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="api_keys")
+
+    __table_args__ = (
+        # get_api_key runs on every request: key lookup among active keys only
+        Index(
+            "idx_api_keys_active_key",
+            "key",
+            postgresql_where=is_active == True,  # same predicate as the query, so the planner matches it
+            sqlite_where=is_active == True,
+        ),
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, Optional
 
 # Golden Example = test case
 # Input  → Expected -> Output
@@ -16,3 +16,15 @@ class EvaluationResponse(BaseModel):
     total_tests: int
 
 
+# Evaluations run as a queued job; the job id is the Celery task id
+class EvaluationJobResponse(BaseModel):
+    job_id: str
+    status: str
+
+
+class EvaluationJobStatus(BaseModel):
+    job_id: str
+    status: str  # pending, processing, success, failed
+    progress: Optional[Dict] = None
+    result: Optional[EvaluationResponse] = None
+    error: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Run Schemas
 
@@ -9,6 +9,12 @@ class RunRequest(BaseModel):
     variables: Dict[str, Any]
     model: str
     
+# Batch of runs for one prompt version (JSON form; JSONL bodies stream instead)
+class RunBatchRequest(BaseModel):
+    prompt_version_id: str
+    model: str
+    variables: List[Dict[str, Any]]
+
 # Optional fields for future use (e.g., for tracking tokens, latency, etc.)
 class RunResponse(BaseModel):
     run_id: str
@@ -16,6 +22,8 @@ class RunResponse(BaseModel):
     status: str
     output: Optional[str] = None
     latency_ms: Optional[int] = None
+    ttft_ms: Optional[int] = None
+    tokens_per_second: Optional[float] = None
     tokens_in: Optional[int] = None
     tokens_out: Optional[int] = None
     cost_usd: Optional[float] = None
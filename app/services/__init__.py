@@ -1,5 +1,7 @@
 # Services module
+from app.services import analytics
+from app.services import run_evaluation
 from app.services import run_experiment
 from app.services import run_task
 
-__all__ = ["run_experiment", "run_task"]
+__all__ = ["analytics", "run_evaluation", "run_experiment", "run_task"]
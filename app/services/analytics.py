@@ -0,0 +1,270 @@
+# app/services/analytics.py
+"""
+Hourly run rollups per (model, prompt version), and the analytics queries
+that read them.
+
+refresh_run_rollups reads only the runs that finished after the stored
+watermark, folds them into their hour's RunRollupHourly row and advances
+the watermark, in one transaction. Celery beat calls it every
+analytics_refresh_interval_seconds. Analytics queries read the rollups
+only, so they cost O(hours x models x versions) whatever the run count.
+"""
+import bisect
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import CostLog, Experiment, Prompt, RollupWatermark, Run, RunRollupHourly
+
+RUN_ROLLUPS = "run_rollups_hourly"
+# upper edges of the latency buckets in ms; one more, open-ended bucket follows the last
+LATENCY_BUCKETS_MS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000, 15000, 30000, 60000)
+PERCENTILES = (50, 90, 95, 99)
+SUMMED = ("run_count", "error_count", "tokens_in", "tokens_out", "cost_usd", "latency_count", "latency_sum_ms")
+REFRESH_BATCH = 5000  # runs fetched per round trip during a refresh
+
+
+def _empty() -> dict:
+    totals = dict.fromkeys(SUMMED, 0)
+    totals["cost_usd"] = 0.0
+    totals["latency_max_ms"] = None
+    totals["latency_histogram"] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    return totals
+
+
+def _add_run(totals: dict, status, latency_ms, tokens_in, tokens_out, cost_usd) -> None:
+    totals["run_count"] += 1
+    totals["error_count"] += status == "failed"
+    totals["tokens_in"] += tokens_in or 0
+    totals["tokens_out"] += tokens_out or 0
+    totals["cost_usd"] += cost_usd or 0.0
+    if latency_ms is not None:
+        totals["latency_count"] += 1
+        totals["latency_sum_ms"] += latency_ms
+        totals["latency_max_ms"] = max(totals["latency_max_ms"] or 0, latency_ms)
+        totals["latency_histogram"][bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+
+def _combine(totals: dict, part) -> dict:
+    """Add a rollup row (or another totals dict) into `totals`."""
+    get = part.get if isinstance(part, dict) else lambda name: getattr(part, name)
+    for name in SUMMED:
+        totals[name] += get(name) or 0
+    if get("latency_max_ms") is not None:
+        totals["latency_max_ms"] = max(totals["latency_max_ms"] or 0, get("latency_max_ms"))
+    for i, count in enumerate(get("latency_histogram") or []):
+        totals["latency_histogram"][i] += count
+    return totals
+
+
+def histogram_percentile(histogram: list, q: float, max_ms: Optional[int] = None) -> Optional[float]:
+    """q-th percentile of a latency histogram, interpolated inside its bucket."""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q / 100 * total
+    seen = 0
+    for i, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            low = LATENCY_BUCKETS_MS[i - 1] if i else 0
+            high = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else (max_ms or low)
+            if max_ms is not None:
+                high = min(high, max_ms)
+            return round(low + (high - low) * (rank - seen) / count, 1)
+        seen += count
+    return None
+
+
+def summarize(totals: dict) -> dict:
+    runs = totals["run_count"]
+    return {
+        "runs": runs,
+        "errors": totals["error_count"],
+        "error_rate": round(totals["error_count"] / runs, 4) if runs else 0.0,
+        "tokens_in": totals["tokens_in"],
+        "tokens_out": totals["tokens_out"],
+        "cost_usd": round(totals["cost_usd"], 6),
+        "avg_latency_ms": (
+            round(totals["latency_sum_ms"] / totals["latency_count"], 1) if totals["latency_count"] else None
+        ),
+        "max_latency_ms": totals["latency_max_ms"],
+        "latency_percentiles_ms": {
+            f"p{q}": histogram_percentile(totals["latency_histogram"], q, totals["latency_max_ms"])
+            for q in PERCENTILES
+        },
+    }
+
+
+def refresh_run_rollups(db, now: Optional[datetime] = None) -> dict:
+    """Fold the runs finished since the watermark into the hourly rollups; commits."""
+    now = now or datetime.utcnow()
+    # runs finishing right now may not be committed yet, they wait for the next refresh
+    upper = now - timedelta(seconds=settings.analytics_refresh_lag_seconds)
+
+    # the watermark row doubles as the refresh lock: a concurrent refresh waits here
+    mark = (
+        db.query(RollupWatermark)
+        .filter(RollupWatermark.name == RUN_ROLLUPS)
+        .with_for_update()
+        .first()
+    )
+    if mark is None:
+        mark = RollupWatermark(name=RUN_ROLLUPS)
+        db.add(mark)
+        db.flush()
+    lower = mark.watermark
+    if lower is not None and upper <= lower:
+        db.rollback()
+        return {"processed": 0, "buckets": 0, "watermark": lower}
+
+    statement = (
+        select(
+            Run.finished_at, Run.model, Run.prompt_version_id, Run.status,
+            Run.latency_ms, Run.tokens_in, Run.tokens_out, CostLog.cost_usd,
+        )
+        .outerjoin(CostLog, CostLog.run_id == Run.id)
+        .where(Run.finished_at <= upper)
+    )
+    if lower is not None:
+        statement = statement.where(Run.finished_at > lower)
+
+    deltas = {}
+    processed = 0
+    result = db.execute(statement.execution_options(yield_per=REFRESH_BATCH))
+    for partition in result.partitions():
+        for finished_at, model, version_id, status, latency_ms, tokens_in, tokens_out, cost_usd in partition:
+            key = (finished_at.replace(minute=0, second=0, microsecond=0), model or "unknown", version_id or "")
+            totals = deltas.get(key)
+            if totals is None:
+                totals = deltas[key] = _empty()
+            _add_run(totals, status, latency_ms, tokens_in, tokens_out, cost_usd)
+            processed += 1
+
+    if deltas:
+        hours = [key[0] for key in deltas]
+        existing = {
+            (row.bucket, row.model, row.prompt_version_id): row
+            for row in db.query(RunRollupHourly).filter(RunRollupHourly.bucket.between(min(hours), max(hours)))
+        }
+        for key, delta in deltas.items():
+            row = existing.get(key)
+            if row is None:
+                row = RunRollupHourly(bucket=key[0], model=key[1], prompt_version_id=key[2])
+                db.add(row)
+                merged = delta
+            else:
+                merged = _combine(_combine(_empty(), row), delta)
+            for name, value in merged.items():
+                setattr(row, name, value)
+            row.updated_at = now
+
+    mark.watermark = upper
+    mark.updated_at = now
+    db.commit()
+    return {"processed": processed, "buckets": len(deltas), "watermark": upper}
+
+
+@celery_app.task(name="app.services.analytics.refresh_run_rollups_task")
+def refresh_run_rollups_task():
+    db = SessionLocal()
+    try:
+        result = refresh_run_rollups(db)
+        logging.info(
+            f"Run rollups refreshed: {result['processed']} runs into {result['buckets']} buckets, "
+            f"watermark {result['watermark']}"
+        )
+        return result
+    except Exception:
+        logging.error("Run rollup refresh failed", exc_info=True)
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# -- queries (AsyncSession, served by app/api/v1/analytics.py) ---------------
+
+def _rollups(start: datetime, model: Optional[str], prompt_version_id: Optional[str]):
+    statement = select(RunRollupHourly).where(RunRollupHourly.bucket >= start)
+    if model:
+        statement = statement.where(RunRollupHourly.model == model)
+    if prompt_version_id:
+        statement = statement.where(RunRollupHourly.prompt_version_id == prompt_version_id)
+    return statement
+
+
+def _grouped(rows: Iterable[RunRollupHourly], key) -> dict:
+    groups = {}
+    for row in rows:
+        _combine(groups.setdefault(key(row), _empty()), row)
+    return groups
+
+
+async def _watermark(db) -> Optional[datetime]:
+    return (
+        await db.execute(select(RollupWatermark.watermark).where(RollupWatermark.name == RUN_ROLLUPS))
+    ).scalar()
+
+
+async def run_analytics_summary(
+    db, start: datetime, model: Optional[str] = None, prompt_version_id: Optional[str] = None
+) -> dict:
+    """Totals since `start`, per model and per prompt version, plus live in-flight counts."""
+    rows = (await db.execute(_rollups(start, model, prompt_version_id))).scalars().all()
+    totals = _grouped(rows, lambda row: None).get(None, _empty())
+    by_model = _grouped(rows, lambda row: row.model)
+    by_version = _grouped(rows, lambda row: (row.prompt_version_id, row.model))
+
+    # not in the rollups yet; read off the partial index on in-flight runs
+    in_flight = dict.fromkeys(("pending", "running"), 0)
+    in_flight.update(
+        (await db.execute(
+            select(Run.status, func.count(Run.id))
+            .where(Run.status.in_(list(in_flight)))
+            .group_by(Run.status)
+        )).all()
+    )
+    prompts = (await db.execute(select(func.count(Prompt.id)))).scalar()
+    experiments = (await db.execute(select(func.count(Experiment.id)))).scalar()
+
+    return {
+        "start": start,
+        "as_of": await _watermark(db),
+        "totals": summarize(totals),
+        "latency_histogram": {"edges_ms": list(LATENCY_BUCKETS_MS), "counts": totals["latency_histogram"]},
+        "by_model": sorted(
+            ({"model": name, **summarize(group)} for name, group in by_model.items()),
+            key=lambda item: -item["runs"],
+        ),
+        "by_prompt_version": sorted(
+            (
+                {"prompt_version_id": version_id, "model": name, **summarize(group)}
+                for (version_id, name), group in by_version.items()
+            ),
+            key=lambda item: -item["runs"],
+        ),
+        "in_flight": in_flight,
+        "prompts": prompts,
+        "experiments": experiments,
+    }
+
+
+async def run_analytics_timeseries(
+    db, start: datetime, model: Optional[str] = None, prompt_version_id: Optional[str] = None,
+    by_model: bool = False,
+) -> dict:
+    """One point per hour since `start`, optionally split by model."""
+    rows = (await db.execute(_rollups(start, model, prompt_version_id))).scalars().all()
+    groups = _grouped(rows, lambda row: (row.bucket, row.model if by_model else None))
+    points = []
+    for (bucket, name), group in sorted(groups.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+        point = {"bucket": bucket, **summarize(group)}
+        if by_model:
+            point["model"] = name
+        points.append(point)
+    return {"start": start, "as_of": await _watermark(db), "points": points}
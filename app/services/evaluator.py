@@ -1,7 +1,14 @@
 import difflib
+import hashlib
+import json
 import logging
+import threading
+from typing import List, Optional, Tuple
+from app.core.config import settings
 from .llm_runner import call_llama
+from .similarity_metrics import cheap_similarity
 from langchain_core.output_parsers import SimpleJsonOutputParser
+from langchain_core.exceptions import OutputParserException
 
 logger = logging.getLogger(__name__)
 # def similarity_score(excepted : str , actual: str) -> float:
@@ -26,19 +33,263 @@ Return a JSON object ONLY with: \
   "hallucination_rate": float between 0 and 1 indicating the degree of hallucination in the model output \
 }
 """
-def similarity_score(user_input: str, expected_output: str, model_output: str) -> dict:
-    evaluation_prompt = f'''
+def _build_evaluation_prompt(user_input: str, expected_output: str, model_output: str) -> str:
+    return f'''
 User Input: {user_input}
 Expected Output: {expected_output}
 Model Output: {model_output}
 Evaluate the model output against the expected output based on the criteria mentioned in the system prompt.
     '''
+
+
+batch_system_prompt = """
+You are an impartial evaluator. \
+You are given several numbered items, each with a user input, an expected output \
+and a model output. For every item, compare the model output against the expected output. \
+Evaluate based on: \
+- Task correctness \
+- Completeness \
+- Faithfulness to the expected output \
+Return a JSON array ONLY, with one object per item, in item order: \
+[ \
+  { \
+    "index": the item number, \
+    "score": float between 0 and 1, \
+    "reason": short explanation, \
+    "hallucination_rate": float between 0 and 1 indicating the degree of hallucination in the model output \
+  } \
+]
+"""
+
+# (user_input, expected_output, model_output)
+JudgeItem = Tuple[str, str, str]
+
+
+def _build_batch_evaluation_prompt(items: List[JudgeItem]) -> str:
+    blocks = [
+        f'''
+### Item {index}
+User Input: {user_input}
+Expected Output: {expected_output}
+Model Output: {model_output}'''
+        for index, (user_input, expected_output, model_output) in enumerate(items, start=1)
+    ]
+    return "\n".join(blocks) + f'''
+
+Evaluate all {len(items)} items based on the criteria mentioned in the system prompt.
+    '''
+
+
+# bump when scoring changes in a way the prompts below don't capture (e.g. parsing)
+JUDGE_REVISION = 2  # 2: cheap metrics hash features stably across processes
+
+
+def judge_version() -> str:
+    """
+    Fingerprint of the judge: prompts, judge model and revision.
+    Stored scores are only reused by experiments with the same judge version.
+    """
+    fingerprint = json.dumps([
+        JUDGE_REVISION,
+        settings.llm_default_model,
+        system_prompt,
+        _build_evaluation_prompt("{user_input}", "{expected_output}", "{model_output}"),
+        # batched and single judging see different prompts, so their scores aren't interchangeable
+        batch_system_prompt if settings.judge_batch_size > 1 else None,
+        # the cascade decides which examples the judge sees at all
+        [settings.evaluator_cascade_low, settings.evaluator_cascade_high]
+        if settings.evaluator_cascade_enabled else None,
+    ])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def similarity_score(user_input: str, expected_output: str, model_output: str) -> dict:
+    evaluation_prompt = _build_evaluation_prompt(user_input, expected_output, model_output)
     logging.info(f"Evaluation prompt: {evaluation_prompt}")
 
-    evaluation_result, _, _ = call_llama(evaluation_prompt, system_prompt=system_prompt)
+    evaluation_result, _, _ = call_llama(evaluation_prompt, system_prompt=system_prompt, temperature=0.0)
     logging.info(f"Evaluation result (raw): {evaluation_result}")
 
     parser = SimpleJsonOutputParser()
     evaluation_result = parser.invoke(evaluation_result)
 
-    return evaluation_result
\ No newline at end of file
+    return evaluation_result
+
+
+def _valid_judgement(item) -> Optional[dict]:
+    """The judgement as a score dict, or None if it is missing or malformed."""
+    if not isinstance(item, dict):
+        return None
+    score = item.get("score")
+    hallucination_rate = item.get("hallucination_rate", 0)
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 1:
+        return None
+    if hallucination_rate is not None and (
+        isinstance(hallucination_rate, bool)
+        or not isinstance(hallucination_rate, (int, float))
+        or not 0 <= hallucination_rate <= 1
+    ):
+        return None
+    return {
+        "score": float(score),
+        "reason": str(item.get("reason", "")),
+        "hallucination_rate": hallucination_rate,
+    }
+
+
+def _parse_batch_judgement(raw: str, size: int) -> List[Optional[dict]]:
+    """Per-item judgements from a batch response; None where an item is unusable."""
+    start = raw.find("[")
+    try:
+        parsed = SimpleJsonOutputParser().invoke(raw if "```" in raw or start < 0 else raw[start:])
+    except OutputParserException:
+        return [None] * size
+    if not isinstance(parsed, list):
+        return [None] * size
+
+    judgements = [None] * size
+    for position, item in enumerate(parsed):
+        # trust the item's own index when present, so a skipped item can't shift the rest
+        index = item.get("index") if isinstance(item, dict) else None
+        slot = index - 1 if isinstance(index, int) and not isinstance(index, bool) else position
+        if 0 <= slot < size and judgements[slot] is None:
+            judgements[slot] = _valid_judgement(item)
+    return judgements
+
+
+def _chunks(items: list, size: int) -> List[list]:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _judge_batch(items: List[JudgeItem]) -> List[Optional[dict]]:
+    if len(items) == 1:
+        return [_single_or_none(*items[0])]
+
+    evaluation_prompt = _build_batch_evaluation_prompt(items)
+    try:
+        raw, _, _ = call_llama(
+            evaluation_prompt,
+            system_prompt=batch_system_prompt,
+            temperature=0.0,
+            max_tokens=settings.judge_batch_tokens_per_item * len(items),
+        )
+        judgements = _parse_batch_judgement(raw, len(items))
+    except Exception as e:
+        logging.warning(f"Batched judge call failed, scoring items one by one: {e}")
+        judgements = [None] * len(items)
+
+    return [
+        judgement if judgement is not None else _single_or_none(*item)
+        for item, judgement in zip(items, judgements)
+    ]
+
+
+def _single_or_none(user_input: str, expected_output: str, model_output: str) -> Optional[dict]:
+    try:
+        return _valid_judgement(similarity_score(user_input, expected_output, model_output))
+    except Exception as e:
+        logging.warning(f"Judge call failed: {e}")
+        return None
+
+
+def similarity_score_batch(items: List[JudgeItem], executor=None) -> List[Optional[dict]]:
+    """
+    Score many (user_input, expected_output, model_output) triples with
+    judge_batch_size items per judge call. Items the batch response doesn't
+    answer validly are re-scored one by one; None means even that failed.
+    Pass an executor to judge the batches concurrently.
+    """
+    batches = _chunks(list(items), settings.judge_batch_size)
+    if executor is None:
+        judged = [_judge_batch(batch) for batch in batches]
+    else:
+        judged = list(executor.map(_judge_batch, batches))
+    return [judgement for batch in judged for judgement in batch]
+
+
+# -- cascade: cheap lexical metrics first, the LLM judge only when unsure ----
+
+class CascadeStats:
+    """Per-tier counters, to tune evaluator_cascade_low / _high."""
+
+    TIERS = ("exact", "cheap", "judge", "failed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.TIERS, 0)
+
+    def record(self, tier: str) -> None:
+        with self._lock:
+            self._counts[tier] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.values())
+        return {
+            "enabled": settings.evaluator_cascade_enabled,
+            "band": [settings.evaluator_cascade_low, settings.evaluator_cascade_high],
+            "total": total,
+            "counts": counts,
+            "hit_rates": {tier: (count / total if total else 0.0) for tier, count in counts.items()},
+        }
+
+
+cascade_stats = CascadeStats()
+
+
+def _cascade_plan(items: List[JudgeItem]):
+    """
+    Score every item with the cheap metrics. Returns the per-item results
+    (None where the judge is needed), the cheap scores, and the indexes of
+    the items to send to the judge.
+    """
+    metrics = cheap_similarity(
+        [expected_output for _, expected_output, _ in items],
+        [model_output for _, _, model_output in items],
+    )
+    cheap_scores = [round(float(score), 4) for score in metrics["score"]]
+
+    results, to_judge = [None] * len(items), []
+    for i, (exact, cheap) in enumerate(zip(metrics["exact_match"], cheap_scores)):
+        if not settings.evaluator_cascade_enabled:
+            to_judge.append(i)
+        elif exact:
+            results[i] = {"score": 1.0, "reason": "exact match", "hallucination_rate": 0.0, "scored_by": "exact"}
+        elif cheap <= settings.evaluator_cascade_low or cheap >= settings.evaluator_cascade_high:
+            results[i] = {
+                "score": cheap,
+                "reason": f"lexical similarity {cheap:.2f}, outside the judge band",
+                "hallucination_rate": None,
+                "scored_by": "cheap",
+            }
+        else:
+            to_judge.append(i)
+    return results, cheap_scores, to_judge
+
+
+def _cascade_merge(results, cheap_scores, to_judge, judgements) -> List[Optional[dict]]:
+    for i, judgement in zip(to_judge, judgements):
+        results[i] = dict(judgement, scored_by="judge") if judgement is not None else None
+
+    for result, cheap in zip(results, cheap_scores):
+        cascade_stats.record(result["scored_by"] if result is not None else "failed")
+        if result is not None:
+            # kept for every item, judged or not, so the band can be tuned offline
+            result["cheap_score"] = cheap
+    return results
+
+
+def cascade_score_batch(items: List[JudgeItem], executor=None) -> List[Optional[dict]]:
+    """
+    Like similarity_score_batch, but exact matches and items whose cheap
+    lexical score falls outside [evaluator_cascade_low, evaluator_cascade_high]
+    are scored without the judge. Every result carries `scored_by`
+    ("exact", "cheap" or "judge") and `cheap_score`.
+    """
+    items = list(items)
+    results, cheap_scores, to_judge = _cascade_plan(items)
+    judgements = similarity_score_batch([items[i] for i in to_judge], executor=executor) if to_judge else []
+    return _cascade_merge(results, cheap_scores, to_judge, judgements)
+
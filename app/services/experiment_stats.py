@@ -0,0 +1,114 @@
+# app/services/experiment_stats.py
+"""
+Per-version statistics of an experiment, from its stored per-example cells.
+
+The (version, score, hallucination_rate) columns of every cell are read in
+one query and grouped in numpy, so the cost is one round trip per
+experiment however many versions it has, and the math stays vectorized at
+100k+ cells.
+"""
+import hashlib
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.models import ExperimentExampleResult
+
+PERCENTILES = (5, 25, 50, 75, 95)
+HALLUCINATION_BINS = np.linspace(0.0, 1.0, 11)  # ten buckets of 0.1
+FAILURE_THRESHOLD = 0.5
+BOOTSTRAP_CHUNK_VALUES = 4_000_000  # resampled values held in memory at once
+
+
+def bootstrap_mean_ci(
+    scores: np.ndarray, rng: np.random.Generator, resamples: int, confidence: float
+) -> tuple:
+    """Percentile bootstrap interval of the mean, resampled in chunks to bound memory."""
+    n = len(scores)
+    if n < 2:
+        mean = float(scores.mean()) if n else None
+        return mean, mean
+    means = np.empty(resamples)
+    values, counts = np.unique(scores, return_counts=True)
+    # judge scores take few distinct values: drawing how often each value is
+    # resampled is the same bootstrap, at k instead of n draws per resample
+    grouped = len(values) * 4 <= n
+    step = max(1, BOOTSTRAP_CHUNK_VALUES // (len(values) if grouped else n))
+    for start in range(0, resamples, step):
+        stop = min(resamples, start + step)
+        if grouped:
+            means[start:stop] = rng.multinomial(n, counts / n, size=stop - start) @ values / n
+        else:
+            means[start:stop] = scores[rng.integers(0, n, size=(stop - start, n))].mean(axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def summarize(
+    scores: np.ndarray, hallucination: np.ndarray, rng: np.random.Generator,
+    resamples: Optional[int] = None, confidence: Optional[float] = None,
+) -> dict:
+    """Statistics of one version's scores and hallucination rates (NaN = not reported)."""
+    resamples = resamples or settings.experiment_bootstrap_resamples
+    confidence = confidence or settings.experiment_stats_confidence
+    total = len(scores)
+    if not total:
+        return {"total_examples": 0, "failure_count": 0}
+
+    ci_low, ci_high = bootstrap_mean_ci(scores, rng, resamples, confidence)
+    reported = hallucination[~np.isnan(hallucination)]
+    histogram, _ = np.histogram(reported, bins=HALLUCINATION_BINS)
+    return {
+        "total_examples": total,
+        "failure_count": int((scores < FAILURE_THRESHOLD).sum()),
+        "avg_score": float(scores.mean()),
+        "min_score": float(scores.min()),
+        "max_score": float(scores.max()),
+        "std_score": float(scores.std(ddof=1)) if total > 1 else 0.0,
+        "median_score": float(np.median(scores)),
+        "score_percentiles": {
+            f"p{p}": float(value) for p, value in zip(PERCENTILES, np.percentile(scores, PERCENTILES))
+        },
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "confidence": confidence,
+        "avg_hallucination_rate": float(reported.mean()) if len(reported) else 0.0,
+        "hallucination_histogram": {
+            "bins": [round(float(edge), 2) for edge in HALLUCINATION_BINS],
+            "counts": histogram.tolist(),
+        },
+    }
+
+
+def experiment_stats(db, experiment_id: str) -> Dict[str, dict]:
+    """{version_id: statistics} for every version with stored cells, from one query."""
+    cell = ExperimentExampleResult
+    rows = (
+        db.query(cell.prompt_version_id, cell.score, cell.hallucination_rate)
+        .filter(cell.experiment_id == experiment_id)
+        .all()
+    )
+    if not rows:
+        return {}
+
+    version_ids, scores, hallucination = zip(*rows)
+    scores = np.asarray(scores, dtype=np.float64)
+    hallucination = np.asarray(hallucination, dtype=np.float64)  # None becomes NaN
+    versions, inverse = np.unique(np.asarray(version_ids, dtype=object), return_inverse=True)
+    # group by version: sort once, then split at the group boundaries
+    order = np.argsort(inverse, kind="stable")
+    boundaries = np.cumsum(np.bincount(inverse, minlength=len(versions)))[:-1]
+
+    # seeded per experiment, so the same cells always give the same intervals
+    seed = int.from_bytes(hashlib.sha256(experiment_id.encode("utf-8")).digest()[:8], "big")
+    rng = np.random.default_rng(seed)
+    return {
+        str(version_id): summarize(version_scores, version_hallucination, rng)
+        for version_id, version_scores, version_hallucination in zip(
+            versions,
+            np.split(scores[order], boundaries),
+            np.split(hallucination[order], boundaries),
+        )
+    }
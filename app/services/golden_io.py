@@ -0,0 +1,162 @@
+# app/services/golden_io.py
+"""
+Streaming bulk import and export of golden examples as JSONL or CSV.
+
+Imports read the upload line by line and insert in batches of
+golden_import_batch_size with one executemany each; exports page through
+the table with a server-side cursor. Neither holds more than one batch in
+memory, whatever the file size.
+"""
+import csv
+import io
+import json
+from string import Formatter
+from typing import IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import insert, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import GoldenExample, PromptVersion
+
+FORMATS = ("jsonl", "csv")
+MAX_REPORTED_ERRORS = 100
+
+
+def template_variables(template: str) -> Set[str]:
+    """Names render_prompt needs: the base name of every {field} in the template."""
+    names = set()
+    for _, field, _, _ in Formatter().parse(template):
+        if field:
+            names.add(field.split(".", 1)[0].split("[", 1)[0])
+    return names
+
+
+def required_variables(db, prompt_id: str) -> Set[str]:
+    """Variables of every version, so each imported example renders under all of them."""
+    required = set()
+    for template, in db.query(PromptVersion.template).filter(PromptVersion.prompt_id == prompt_id):
+        required |= template_variables(template)
+    return required
+
+
+def _jsonl_rows(stream: IO[str]) -> Iterator[Tuple[int, dict]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, {"__error__": f"invalid JSON: {e.msg}"}
+            continue
+        yield line_number, row if isinstance(row, dict) else {"__error__": "each line must be a JSON object"}
+
+
+def _csv_rows(stream: IO[str]) -> Iterator[Tuple[int, dict]]:
+    # either an input_data column holding a JSON object, or one column per variable
+    reader = csv.DictReader(stream)
+    for row in reader:
+        line_number = reader.line_num
+        if "input_data" in row:
+            try:
+                input_data = json.loads(row["input_data"] or "{}")
+            except json.JSONDecodeError as e:
+                yield line_number, {"__error__": f"input_data is not valid JSON: {e.msg}"}
+                continue
+        else:
+            input_data = {key: value for key, value in row.items() if key not in ("expected_output", None)}
+        yield line_number, {"input_data": input_data, "expected_output": row.get("expected_output")}
+
+
+def _validate(row: dict, required: Set[str]) -> Optional[str]:
+    if "__error__" in row:
+        return row["__error__"]
+    input_data = row.get("input_data")
+    if not isinstance(input_data, dict):
+        return "input_data must be an object"
+    if not isinstance(row.get("expected_output"), str):
+        return "expected_output must be a string"
+    missing = required - input_data.keys()
+    if missing:
+        return f"missing variables: {', '.join(sorted(missing))}"
+    return None
+
+
+def import_golden_examples(
+    db, prompt_id: str, upload: IO[bytes], fmt: str, strict: bool = False
+) -> dict:
+    """
+    Validate and insert every row of `upload`. Invalid rows are skipped and
+    reported (the first MAX_REPORTED_ERRORS of them); with strict=True any
+    invalid row rolls the whole import back. The caller commits.
+    """
+    required = required_variables(db, prompt_id)
+    stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    rows = _jsonl_rows(stream) if fmt == "jsonl" else _csv_rows(stream)
+    batch_size = max(1, settings.golden_import_batch_size)
+
+    imported = skipped = 0
+    errors: List[dict] = []
+    batch: List[dict] = []
+    for line_number, row in rows:
+        error = _validate(row, required)
+        if error:
+            skipped += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "error": error})
+            if strict:
+                break
+            continue
+        batch.append({
+            "prompt_id": prompt_id,
+            "input_data": json.dumps(row["input_data"]),
+            "expected_output": row["expected_output"],
+        })
+        if len(batch) >= batch_size:
+            db.execute(insert(GoldenExample), batch)
+            imported += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(GoldenExample), batch)
+        imported += len(batch)
+    stream.detach()
+
+    return {
+        "imported": imported,
+        "skipped": skipped,
+        "errors": errors,
+        "required_variables": sorted(required),
+    }
+
+
+def export_golden_examples(prompt_id: str, fmt: str) -> Iterable[str]:
+    """Yield the prompt's golden examples as JSONL lines or CSV rows, one batch at a time."""
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(GoldenExample.id, GoldenExample.input_data, GoldenExample.expected_output)
+            .where(GoldenExample.prompt_id == prompt_id)
+            .order_by(GoldenExample.created_at, GoldenExample.id)
+            .execution_options(yield_per=max(1, settings.golden_import_batch_size))
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(["id", "input_data", "expected_output"])
+        for partition in result.partitions():
+            for example_id, input_data, expected_output in partition:
+                if fmt == "csv":
+                    writer.writerow([example_id, input_data, expected_output])
+                else:
+                    buffer.write(json.dumps({
+                        "id": example_id,
+                        "input_data": json.loads(input_data),
+                        "expected_output": expected_output,
+                    }) + "\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
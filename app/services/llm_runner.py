@@ -1,42 +1,123 @@
 # app/services/llm_runner.py
+import json
 import logging
-from app.core.llm_singleton import LLMService
+from typing import Optional
+from app.core.config import settings
+from app.core.llm_singleton import LLMService, AsyncLLMService
+from app.core.llm_cache import llm_cache, should_use_cache
+from app.core.single_flight import should_coalesce, single_flight
+from app.models import GoldenExample
+from app.services.prompt_renderer import render_prompt
+from app.services.token_counter import count_usage
 
 logger = logging.getLogger(__name__)
 
 def call_llama(
     prompt: str,
-    model_name: str = "Qwen/Qwen2.5-1.5B-Instruct",
+    model_name: str = settings.llm_default_model,
     system_prompt: str = "",
-    temperature: float = 0.2
+    temperature: float = 0.2,
+    max_tokens: int = 150,
+    use_cache: Optional[bool] = None,
+    coalesce: Optional[bool] = None
 ):
     """
-    Call the LLM (via HuggingFace Inference Client) to generate a response.
+    Call the LLM (via the per-model client pool) to generate a response.
+
+    Identical concurrent deterministic calls (same process or across workers)
+    are coalesced into a single upstream request.
     
     Args:
         prompt: The user prompt to send to the model
-        model_name: The model to use (note: currently singleton uses a fixed model)
+        model_name: The model to use (registered in app/core/llm_registry.py or passed through)
         system_prompt: Optional system prompt for context
         temperature: Temperature for generation (0-1)
+        max_tokens: Maximum number of tokens to generate
+        use_cache: Force the response cache on/off; None follows settings
+            (opt-in, deterministic calls only)
+        coalesce: Force single-flight on/off; None follows settings
+            (deterministic calls only, sampled calls each get their own output)
     
     Returns:
         tuple: (output_text, input_tokens, output_tokens)
     """
+    request_key = llm_cache.make_key(model_name, system_prompt, prompt, temperature, max_tokens)
+    cacheable = should_use_cache(temperature, use_cache)
+    if cacheable:
+        cached = llm_cache.get(request_key)
+        if cached is not None:
+            logger.info("LLM cache hit")
+            return cached
+
+    def generate():
+        try:
+            llm = LLMService(model_name)
+            completion = llm.complete(
+                prompt,
+                system_prompt=system_prompt,
+                max_new_tokens=max_tokens,
+                temperature=temperature
+            )
+            output = completion.text
+
+            # provider usage when reported, otherwise the model's tokenizer
+            input_tokens, output_tokens = count_usage(
+                llm.model, system_prompt, prompt, output,
+                completion.prompt_tokens, completion.completion_tokens
+            )
+
+            logger.info(f"LLM call successful. Input tokens: {input_tokens}, Output tokens: {output_tokens}")
+            return output, input_tokens, output_tokens
+        except Exception as e:
+            print(f"Error calling LLM: {str(e)}")
+            logger.error(f"Error calling LLM: {str(e)}", exc_info=True)
+            raise
+
+    if should_coalesce(temperature, coalesce):
+        result = single_flight.do(request_key, generate)
+    else:
+        result = generate()
+
+    if cacheable:
+        llm_cache.set(request_key, result)
+    return result
+
+
+def generate_output(template: str, example: GoldenExample) -> Optional[tuple]:
+    """
+    Render the template with a golden example's input and call the model.
+
+    Returns:
+        tuple: (rendered_prompt, output_text), or None if the example failed
+    """
     try:
-        llm = LLMService()
-        output = llm.generate(
-            prompt,
-            system_prompt=system_prompt,
-            temperature=temperature
-        )
-        
-        # Estimate token counts (rough approximation)
-        input_tokens = len(prompt.split())
-        output_tokens = len(output.split())
-        
-        logger.info(f"LLM call successful. Input tokens: {input_tokens}, Output tokens: {output_tokens}")
-        return output, input_tokens, output_tokens
+        variables = json.loads(example.input_data)
+        rendered = render_prompt(template, variables)
+        output, _, _ = call_llama(rendered)
+        return rendered, output
     except Exception as e:
-        print(f"Error calling LLM: {str(e)}")
-        logger.error(f"Error calling LLM: {str(e)}", exc_info=True)
-        raise
\ No newline at end of file
+        logging.warning(f"Failed example: {example.id}, reason: {e}")
+        return None
+
+
+async def astream_llama(
+    prompt: str,
+    model_name: str = settings.llm_default_model,
+    system_prompt: str = "",
+    temperature: float = 0.2,
+    max_tokens: int = 150
+):
+    """
+    Stream a completion chunk by chunk (see AsyncLLMService.stream).
+
+    Streams bypass the cache and single-flight: each caller wants its own
+    live token stream.
+    """
+    llm = AsyncLLMService(model_name)
+    async for chunk in llm.stream(
+        prompt,
+        system_prompt=system_prompt,
+        max_new_tokens=max_tokens,
+        temperature=temperature
+    ):
+        yield chunk
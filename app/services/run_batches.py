@@ -0,0 +1,135 @@
+# app/services/run_batches.py
+"""
+Bulk submission of runs: the Run rows of a batch are inserted
+run_batch_insert_size at a time with one executemany, and enqueued as one
+run_prompt_batch_task per run_batch_task_size runs instead of one task,
+one commit and one broker round trip per run.
+"""
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from celery import group
+from sqlalchemy import func, insert, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import PromptVersion, Run, RunBatch
+from app.services.run_task import run_prompt_batch_task
+
+STATUSES = ("pending", "running", "completed", "failed")
+
+
+# Blocking: the API calls these through run_in_threadpool, each in a session of its own.
+
+def create_batch(prompt_version_id: str, model: str) -> Optional[tuple]:
+    """(batch id, template) of a new empty batch; None if the prompt version does not exist."""
+    db = SessionLocal()
+    try:
+        template = db.query(PromptVersion.template).filter(PromptVersion.id == prompt_version_id).scalar()
+        if template is None:
+            return None
+        batch = RunBatch(prompt_version_id=prompt_version_id, model=model, total_runs=0)
+        db.add(batch)
+        db.flush()
+        batch_id = batch.id
+        db.commit()
+        return batch_id, template
+    finally:
+        db.close()
+
+
+def delete_batch(batch_id: str) -> None:
+    """Drop a batch that ended up with no runs, so it is not reported pending forever."""
+    db = SessionLocal()
+    try:
+        db.query(RunBatch).filter(RunBatch.id == batch_id, RunBatch.total_runs == 0).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def insert_and_enqueue(batch_id: str, prompt_version_id: str, model: str, variable_sets: List[dict]) -> int:
+    """Insert one chunk of runs for the batch, commit, then enqueue their tasks."""
+    if not variable_sets:
+        return 0
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "prompt_version_id": prompt_version_id,
+            "batch_id": batch_id,
+            "model": model,
+            "input": json.dumps(variables),
+            "status": "pending",
+        }
+        for variables in variable_sets
+    ]
+    db = SessionLocal()
+    try:
+        db.execute(insert(Run), rows)
+        db.query(RunBatch).filter(RunBatch.id == batch_id).update(
+            {"total_runs": RunBatch.total_runs + len(rows)}, synchronize_session=False
+        )
+        # runs must be committed before a worker can pick them up
+        db.commit()
+    finally:
+        db.close()
+
+    size = max(1, settings.run_batch_task_size)
+    run_ids = [row["id"] for row in rows]
+    try:
+        group(
+            run_prompt_batch_task.s(batch_id, run_ids[i:i + size])
+            for i in range(0, len(run_ids), size)
+        ).apply_async()
+    except Exception:
+        # committed runs without a task would stay pending and the batch never
+        # finish; any task that did get through skips runs already finished
+        _fail_runs(run_ids)
+        raise
+    return len(rows)
+
+
+def _fail_runs(run_ids: List[str]) -> None:
+    db = SessionLocal()
+    try:
+        db.query(Run).filter(Run.id.in_(run_ids), Run.finished_at.is_(None)).update(
+            {"status": "failed", "finished_at": datetime.utcnow()}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _status_counts(batch_id: str):
+    return select(Run.status, func.count(Run.id)).where(Run.batch_id == batch_id).group_by(Run.status)
+
+
+def _summary(batch: RunBatch, status_counts) -> dict:
+    counts = dict.fromkeys(STATUSES, 0)
+    counts.update(status_counts)
+    total = batch.total_runs or 0
+    finished = counts["completed"] + counts["failed"]
+    return {
+        "batch_id": batch.id,
+        "prompt_version_id": batch.prompt_version_id,
+        "model": batch.model,
+        "status": "completed" if total and finished >= total else ("running" if total else "pending"),
+        "total_runs": total,
+        "counts": counts,
+        "percent": round(100 * finished / total, 1) if total else 0.0,
+        "created_at": batch.created_at,
+    }
+
+
+def batch_progress(db, batch: RunBatch) -> dict:
+    """Run counts per status, from one GROUP BY over the (batch_id, status) index."""
+    return _summary(batch, db.execute(_status_counts(batch.id)).all())
+
+
+async def abatch_progress(db, batch: RunBatch) -> dict:
+    """batch_progress() on an AsyncSession."""
+    return _summary(batch, (await db.execute(_status_counts(batch.id))).all())
@@ -0,0 +1,96 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sqlalchemy import insert
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import EvaluationResult, GoldenExample, PromptVersion
+from app.services.evaluator import cascade_score_batch
+from app.services.llm_runner import generate_output
+
+
+# Evaluating a version against its golden examples runs as a queued job:
+# the API returns the task id at once and the status endpoint reads the
+# PROGRESS meta (phase, completed/total examples) and finally the
+# EvaluationResponse from the result backend.
+@celery_app.task(bind=True, name="app.services.run_evaluation.evaluate_prompt_version_task")
+def evaluate_prompt_version_task(self, prompt_id: str, version_id: str):
+    db = SessionLocal()
+    try:
+        template = db.query(PromptVersion).filter(PromptVersion.id == version_id).one().template
+        examples = db.query(GoldenExample).filter(GoldenExample.prompt_id == prompt_id).all()
+        # detach, so no pooled connection is held through the LLM calls
+        db.expunge_all()
+        db.close()
+        if not examples:
+            raise ValueError("No golden examples found")
+
+        total = len(examples)
+        logging.info(f"Evaluating version {version_id} against {total} golden examples")
+        self.update_state(state="PROGRESS", meta=_progress(version_id, "generating", 0, total))
+
+        with ThreadPoolExecutor(max_workers=max(1, settings.experiment_parallelism)) as executor:
+            futures = {executor.submit(generate_output, template, example): example for example in examples}
+            generated = {}
+            # progress is reported from this thread, the task context is not visible in the pool
+            for done, future in enumerate(as_completed(futures), start=1):
+                generated[futures[future].id] = future.result()
+                self.update_state(state="PROGRESS", meta=_progress(version_id, "generating", done, total))
+
+            judged_examples = [
+                (example, *generated[example.id]) for example in examples if generated[example.id] is not None
+            ]
+            self.update_state(state="PROGRESS", meta=_progress(version_id, "judging", total, total))
+            # cheap metrics first, then several examples per judge call, batches judged concurrently
+            scores = cascade_score_batch(
+                [(rendered, example.expected_output, output) for example, rendered, output in judged_examples],
+                executor=executor,
+            )
+
+        rows = []
+        for (example, _, output), score in zip(judged_examples, scores):
+            if score is None:
+                logging.warning(f"No valid judge score for golden example ID: {example.id}")
+                continue
+            rows.append({
+                "prompt_version_id": version_id,
+                "golden_example_id": example.id,
+                "score": score['score'],
+                "reason": score.get('reason', ''),
+                "hallucination_rate": score.get('hallucination_rate'),
+                "output": output,
+                "scored_by": score['scored_by'],
+                "cheap_score": score['cheap_score'],
+            })
+        if not rows:
+            raise RuntimeError("The judge returned no valid scores")
+
+        # one executemany instead of a round trip per result
+        db.execute(insert(EvaluationResult), rows)
+        db.commit()
+
+        return {
+            "prompt_version_id": version_id,
+            "average_score": sum(row["score"] for row in rows) / len(rows),
+            "total_tests": len(rows),
+        }
+
+    except Exception:
+        logging.error(f"Evaluation of version {version_id} failed", exc_info=True)
+        db.rollback()
+        raise
+
+    finally:
+        db.close()
+
+
+def _progress(version_id: str, phase: str, completed: int, total: int) -> dict:
+    return {
+        "prompt_version_id": version_id,
+        "phase": phase,
+        "completed": completed,
+        "total": total,
+        "percent": round(100 * completed / total, 1) if total else 0.0,
+    }
@@ -1,22 +1,57 @@
-# app/services/run_task.py
+import hashlib
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from statistics import NormalDist
+from typing import Optional
+
+from celery import chord
+from celery.exceptions import Ignore
+from sqlalchemy import and_, case, func, or_
+
 from app.core.celery_app import celery_app
-from app.models import Experiment, ExperimentResult, PromptVersion, GoldenExample
+from app.core.config import settings
+from app.models import Experiment, ExperimentResult, ExperimentExampleResult, PromptVersion, GoldenExample
 from app.core.database import SessionLocal
 import json, logging
-from app.services.prompt_renderer import render_prompt
-from app.services.evaluator import similarity_score
-from app.services.llm_runner import call_llama
+from app.services.evaluator import cascade_score_batch, judge_version
+from app.services.experiment_stats import experiment_stats
+from app.services.llm_runner import generate_output
 
+
+# The experiment is fanned out as a chord: one shard task per
+# (version, chunk of golden examples), each evaluating its examples on a
+# small thread pool and storing per-example cells, and a finalize task that
+# aggregates the cells per version. Cells already computed by an earlier
+# experiment (same template, example, model and judge) are copied, not re-run.
+# Shards spread over every worker slot, so wall-clock time shrinks with
+# the number of workers; the AIMD limiter still bounds upstream load.
+#
+# Each shard also bumps the experiment's completed_cells, refreshes its
+# version's ExperimentResult with the cells stored so far and reports
+# PROGRESS on the run_experiment task id, which stays in PROGRESS until
+# finalize marks it SUCCESS with the experiment id.
+#
+# Cells are the checkpoint: every shard commits its cells before it is
+# acked (acks_late), so a shard lost with its worker is redelivered and
+# only computes cells that are not stored yet. Shards also heartbeat on the
+# experiment; resume_experiment restarts a failed or silent experiment from
+# its stored cells on any worker.
 @celery_app.task(bind=True)
 def run_experiment(self, prompt_id: str, experiment_name: str):
     db = SessionLocal()
+    experiment = None
 
     try:
         logging.info(f"Starting experiment: {experiment_name} for prompt_id: {prompt_id}")
         experiment = Experiment(
             name=experiment_name,
             prompt_id=prompt_id,
-            status="running"
+            status="running",
+            task_id=self.request.id,
+            started_at=datetime.utcnow(),
+            heartbeat_at=datetime.utcnow(),
         )
         db.add(experiment)
         db.commit()
@@ -35,50 +70,570 @@ def run_experiment(self, prompt_id: str, experiment_name: str):
             raise ValueError("No golden examples found")
         logging.info(f"Found {len(golden_examples)} golden examples")
 
+        # reuse every cell whose template, example, model and judge are unchanged
+        model = settings.llm_default_model
+        judge = judge_version()
+        template_hashes = {version.id: _template_hash(version.template) for version in prompt_versions}
+        example_hashes = {example.id: _example_hash(example) for example in golden_examples}
+        reusable = _find_reusable_cells(
+            db, set(template_hashes.values()), set(example_hashes.values()), model, judge
+        )
 
-        results_to_add = []
-
+        reused_cells = []
+        missing = {}
         for version in prompt_versions:
-            _score = []
-            hallucination_rate = []
-
             for example in golden_examples:
-                try:
-                    variables = json.loads(example.input_data)
-                    rendered = render_prompt(version.template, variables)
-                    output, _, _ = call_llama(rendered)
-                    score = similarity_score(rendered, example.expected_output, output)
-                except Exception as e:
-                    logging.warning(f"Failed example: {example.id}, reason: {e}")
+                cached = reusable.get((template_hashes[version.id], example_hashes[example.id]))
+                if cached is None:
+                    missing.setdefault(version.id, []).append(example.id)
                     continue
-                
-                print(type(score.get('hallucination_rate', 0)))
-                print(type(score['score']))
-                hallucination_rate.append(score.get('hallucination_rate', 0))
-                _score.append(score['score'])
-
-            results_to_add.append(
-                ExperimentResult(
+                reused_cells.append(ExperimentExampleResult(
                     experiment_id=experiment.id,
                     prompt_version_id=version.id,
-                    avg_score=sum(_score)/len(_score) if _score else 0,
-                    min_score=min(_score) if _score else 0,
-                    max_score=max(_score) if _score else 0,
-                    avg_hallucination_rate=sum(hallucination_rate)/len(hallucination_rate) if hallucination_rate else 0,
-                    failure_count=len([s for s in _score if s < 0.5]),
-                    total_examples=len(_score)
-                )
+                    golden_example_id=example.id,
+                    template_hash=cached.template_hash,
+                    example_hash=cached.example_hash,
+                    model=model,
+                    judge_version=judge,
+                    score=cached.score,
+                    hallucination_rate=cached.hallucination_rate,
+                    reason=cached.reason,
+                    output=cached.output,
+                    scored_by=cached.scored_by,
+                    cheap_score=cached.cheap_score,
+                    reused_from_id=cached.id,
+                ))
+        db.add_all(reused_cells)
+        experiment.total_cells = sum(len(example_ids) for example_ids in missing.values())
+        db.flush()
+        # partial results from the reused cells; shards keep these rows up to date
+        _refresh_version_results(db, experiment.id, [version.id for version in prompt_versions])
+        db.commit()
+        _report_progress(experiment)
+        logging.info(
+            f"Experiment {experiment.id}: reused {len(reused_cells)} cells, "
+            f"{sum(len(ids) for ids in missing.values())} to compute"
+        )
+
+        if settings.experiment_early_stopping:
+            example_order = _example_order(experiment.id, [example.id for example in golden_examples])
+            _start_round(db, experiment.id, [version.id for version in prompt_versions], example_order, 0, {})
+        else:
+            _dispatch(experiment.id, missing, finalize_experiment.s(experiment.id))
+        # keep the PROGRESS state, finalize_experiment stores the result
+        raise Ignore()
+
+    except Ignore:
+        raise
+
+    except Exception as e:
+        logging.error("Experiment run failed", exc_info=True)
+        db.rollback()
+        if experiment is not None:
+            experiment.status = "failed"
+            db.commit()
+
+    finally:
+        db.close()
+
+
+def _shard_signatures(experiment_id: str, missing: dict) -> list:
+    size = max(1, settings.experiment_shard_size)
+    return [
+        run_experiment_shard.s(experiment_id, version_id, example_ids[i:i + size])
+        for version_id, example_ids in missing.items()
+        for i in range(0, len(example_ids), size)
+    ]
+
+
+def _template_hash(template: str) -> str:
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()
+
+
+def _example_hash(example) -> str:
+    return hashlib.sha256(
+        json.dumps([example.input_data, example.expected_output]).encode("utf-8")
+    ).hexdigest()
+
+
+def _find_reusable_cells(db, template_hashes: set, example_hashes: set, model: str, judge: str) -> dict:
+    """
+    Latest computed cell per (template_hash, example_hash) for this model and
+    judge, with only the columns that get copied. Copies made by earlier
+    experiments are skipped, so the rows read per key do not grow with the
+    number of experiments.
+    """
+    cell = ExperimentExampleResult
+    ranked = (
+        db.query(
+            cell.id,
+            cell.template_hash,
+            cell.example_hash,
+            cell.score,
+            cell.hallucination_rate,
+            cell.reason,
+            cell.output,
+            cell.scored_by,
+            cell.cheap_score,
+            func.row_number().over(
+                partition_by=(cell.template_hash, cell.example_hash),
+                order_by=(cell.created_at.desc(), cell.id.desc()),
+            ).label("rank"),
+        )
+        .filter(
+            cell.template_hash.in_(template_hashes),
+            cell.example_hash.in_(example_hashes),
+            cell.model == model,
+            cell.judge_version == judge,
+            cell.reused_from_id.is_(None),
+        )
+        .subquery()
+    )
+    rows = db.query(ranked).filter(ranked.c.rank == 1).all()
+    return {(row.template_hash, row.example_hash): row for row in rows}
+
+
+def _refresh_version_results(db, experiment_id: str, version_ids: list) -> dict:
+    """
+    Recompute the ExperimentResult of each version from the cells stored so
+    far (one GROUP BY, the unique cell index covers it), creating missing rows.
+    """
+    cell = ExperimentExampleResult
+    aggregates = {
+        row.prompt_version_id: row
+        for row in (
+            db.query(
+                cell.prompt_version_id,
+                func.avg(cell.score).label("avg_score"),
+                func.min(cell.score).label("min_score"),
+                func.max(cell.score).label("max_score"),
+                func.avg(cell.hallucination_rate).label("avg_hallucination_rate"),
+                func.sum(case((cell.score < 0.5, 1), else_=0)).label("failure_count"),
+                func.count(cell.id).label("total_examples"),
             )
+            .filter(cell.experiment_id == experiment_id, cell.prompt_version_id.in_(version_ids))
+            .group_by(cell.prompt_version_id)
+        )
+    }
+    results = {
+        result.prompt_version_id: result
+        for result in db.query(ExperimentResult).filter(
+            ExperimentResult.experiment_id == experiment_id,
+            ExperimentResult.prompt_version_id.in_(version_ids),
+        )
+    }
+
+    for version_id in version_ids:
+        result = results.get(version_id)
+        if result is None:
+            result = results[version_id] = ExperimentResult(
+                experiment_id=experiment_id, prompt_version_id=version_id
+            )
+            db.add(result)
+        row = aggregates.get(version_id)
+        result.avg_score = row.avg_score if row else 0
+        result.min_score = row.min_score if row else 0
+        result.max_score = row.max_score if row else 0
+        result.avg_hallucination_rate = (row.avg_hallucination_rate or 0) if row else 0
+        result.failure_count = row.failure_count if row else 0
+        result.total_examples = row.total_examples if row else 0
+        result.samples_used = row.total_examples if row else 0
+    return results
+
+
+def experiment_progress(experiment: Experiment) -> dict:
+    """Done/total cells and an ETA extrapolated from the throughput so far."""
+    done = experiment.completed_cells or 0
+    total = max(experiment.total_cells or 0, done)
+    elapsed = (datetime.utcnow() - experiment.started_at).total_seconds() if experiment.started_at else 0
+    rate = done / elapsed if done and elapsed > 0 else None
+    if experiment.status == "completed":
+        eta = 0.0
+    else:
+        eta = round((total - done) / rate, 1) if rate else None
+    return {
+        "experiment_id": experiment.id,
+        "completed_cells": done,
+        "total_cells": total,
+        "percent": round(100 * done / total, 1) if total else (100.0 if experiment.status == "completed" else 0.0),
+        "cells_per_second": round(rate, 3) if rate else None,
+        "eta_seconds": eta,
+    }
+
+
+def _report_progress(experiment: Experiment) -> None:
+    if not experiment.task_id:
+        return
+    try:
+        celery_app.backend.store_result(experiment.task_id, experiment_progress(experiment), "PROGRESS")
+    except Exception as e:
+        # progress is informational, never fail the experiment over it
+        logging.warning(f"Experiment {experiment.id}: could not report progress: {e}")
+
+
+def _fail_experiment(db, experiment_id: str, error: Exception) -> None:
+    db.query(Experiment).filter(Experiment.id == experiment_id).update({"status": "failed"})
+    db.commit()
+    task_id = db.query(Experiment.task_id).filter(Experiment.id == experiment_id).scalar()
+    if task_id:
+        celery_app.backend.mark_as_failure(task_id, error)
+
+
+@celery_app.task(
+    bind=True, acks_late=True, reject_on_worker_lost=True,
+    name="app.services.run_experiment.run_experiment_shard",
+)
+def run_experiment_shard(self, experiment_id: str, version_id: str, example_ids: list):
+    db = SessionLocal()
+    try:
+        db.query(Experiment).filter(Experiment.id == experiment_id).update(
+            {"heartbeat_at": datetime.utcnow()}, synchronize_session=False
+        )
+        # a redelivered shard skips the cells its first delivery already stored
+        example_ids = _missing_cells(db, experiment_id, [version_id], example_ids).get(version_id, [])
+        db.commit()
+        if not example_ids:
+            return {"version_id": version_id, "completed": 0, "failed": 0}
+
+        template = db.query(PromptVersion).filter(PromptVersion.id == version_id).one().template
+        examples = db.query(GoldenExample).filter(GoldenExample.id.in_(example_ids)).all()
+        # detach, so no pooled connection is held through the LLM calls
+        db.expunge_all()
+        db.close()
+
+        logging.info(f"Experiment {experiment_id}: evaluating {len(examples)} examples for version {version_id}")
+        with ThreadPoolExecutor(max_workers=max(1, settings.experiment_parallelism)) as executor:
+            generated = list(executor.map(lambda example: generate_output(template, example), examples))
+            judged_examples = [
+                (example, *result) for example, result in zip(examples, generated) if result is not None
+            ]
+            # cheap metrics first, then several examples per judge call, batches judged concurrently
+            scores = cascade_score_batch(
+                [(rendered, example.expected_output, output) for example, rendered, output in judged_examples],
+                executor=executor,
+            )
+
+        model = settings.llm_default_model
+        judge = judge_version()
+        template_hash = _template_hash(template)
+        cells = []
+        for (example, _, output), score in zip(judged_examples, scores):
+            if score is None:
+                logging.warning(f"Failed example: {example.id}, reason: no valid judge score")
+                continue
+            cells.append(ExperimentExampleResult(
+                experiment_id=experiment_id,
+                prompt_version_id=version_id,
+                golden_example_id=example.id,
+                template_hash=template_hash,
+                example_hash=_example_hash(example),
+                model=model,
+                judge_version=judge,
+                score=score['score'],
+                hallucination_rate=score.get('hallucination_rate', 0),
+                reason=score.get('reason', ''),
+                output=output,
+                scored_by=score['scored_by'],
+                cheap_score=score['cheap_score'],
+            ))
+        db.add_all(cells)
+        db.query(Experiment).filter(Experiment.id == experiment_id).update(
+            {"completed_cells": Experiment.completed_cells + len(examples), "heartbeat_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+        _refresh_version_results(db, experiment_id, [version_id])
+        db.commit()
+        _report_progress(db.query(Experiment).filter(Experiment.id == experiment_id).one())
+        # failed examples are not stored, so the next experiment retries them
+        return {"version_id": version_id, "completed": len(cells), "failed": len(examples) - len(cells)}
+
+    finally:
+        db.close()
+
+
+def _missing_cells(db, experiment_id: str, version_ids: list, example_ids: list) -> dict:
+    done = set(
+        db.query(ExperimentExampleResult.prompt_version_id, ExperimentExampleResult.golden_example_id)
+        .filter(
+            ExperimentExampleResult.experiment_id == experiment_id,
+            ExperimentExampleResult.prompt_version_id.in_(version_ids),
+            ExperimentExampleResult.golden_example_id.in_(example_ids),
+        )
+    )
+    missing = {}
+    for version_id in version_ids:
+        for example_id in example_ids:
+            if (version_id, example_id) not in done:
+                missing.setdefault(version_id, []).append(example_id)
+    return missing
+
+
+def _dispatch(experiment_id: str, missing: dict, next_step) -> None:
+    """Run the shards for `missing` as a chord into next_step (directly, if nothing is missing)."""
+    shards = _shard_signatures(experiment_id, missing)
+    if not shards:
+        next_step.delay([])
+        return
+    logging.info(f"Dispatching {len(shards)} shards for experiment {experiment_id}")
+    chord(shards)(next_step.on_error(mark_experiment_failed.si(experiment_id)))
+
+
+# -- early stopping -----------------------------------------------------------
+#
+# Versions are evaluated in rounds of experiment_early_stopping_round_size
+# examples. After each round every active version gets a confidence interval
+# on its mean score (normal approximation, Bonferroni-corrected across the
+# comparisons with the leader); a version whose upper bound is below the
+# leader's lower bound is dominated and gets no more examples.
+
+def _example_order(experiment_id: str, example_ids: list) -> list:
+    """
+    Examples in a fixed random order, so every round is representative; seeded
+    by the experiment, so a resume walks the same order.
+    """
+    example_order = sorted(example_ids)
+    random.Random(experiment_id).shuffle(example_order)
+    return example_order
+
+
+def _evaluated_examples(db, experiment_id: str, version_ids: list, example_order: list) -> int:
+    """How far into example_order the rounds got: up to the first round with a missing cell."""
+    missing = _missing_cells(db, experiment_id, version_ids, example_order)
+    position = {example_id: i for i, example_id in enumerate(example_order)}
+    first_missing = min(
+        (position[example_id] for example_ids in missing.values() for example_id in example_ids),
+        default=len(example_order),
+    )
+    if first_missing == len(example_order):
+        return first_missing
+    round_size = max(1, settings.experiment_early_stopping_round_size)
+    return first_missing // round_size * round_size
+
+
+def _start_round(db, experiment_id: str, version_ids: list, example_order: list, evaluated: int, stopped: dict):
+    if len(version_ids) < 2:
+        # nothing left to compare against: the survivor gets every remaining example
+        window = example_order[evaluated:]
+        next_step = finalize_experiment.s(experiment_id, stopped)
+    else:
+        window = example_order[evaluated:evaluated + max(1, settings.experiment_early_stopping_round_size)]
+        next_step = advance_experiment.s(
+            experiment_id, version_ids, example_order, evaluated + len(window), stopped
+        )
+    logging.info(
+        f"Experiment {experiment_id}: round over examples {evaluated}-{evaluated + len(window)} "
+        f"for {len(version_ids)} versions"
+    )
+    _dispatch(experiment_id, _missing_cells(db, experiment_id, version_ids, window), next_step)
+
+
+def _dominated_versions(db, experiment_id: str, version_ids: list) -> dict:
+    """{version_id: samples} for active versions statistically worse than the leader."""
+    cell = ExperimentExampleResult
+    rows = (
+        db.query(
+            cell.prompt_version_id,
+            func.count(cell.id).label("n"),
+            func.avg(cell.score).label("mean"),
+            func.avg(cell.score * cell.score).label("mean_square"),
+        )
+        .filter(cell.experiment_id == experiment_id, cell.prompt_version_id.in_(version_ids))
+        .group_by(cell.prompt_version_id)
+        .all()
+    )
+
+    bounds = {}
+    for row in rows:
+        if row.n < 2:
+            continue
+        variance = max(0.0, row.mean_square - row.mean ** 2) * row.n / (row.n - 1)
+        bounds[row.prompt_version_id] = (row.mean, math.sqrt(variance / row.n), row.n)
+    if len(bounds) < 2:
+        return {}
+
+    comparisons = len(bounds) - 1
+    z = NormalDist().inv_cdf(1 - (1 - settings.experiment_early_stopping_confidence) / 2 / comparisons)
+    leader = max(bounds, key=lambda version_id: bounds[version_id][0])
+    leader_mean, leader_error, _ = bounds[leader]
+    return {
+        version_id: n
+        for version_id, (mean, error, n) in bounds.items()
+        if version_id != leader and mean + z * error < leader_mean - z * leader_error
+    }
+
+
+@celery_app.task(bind=True, acks_late=True, reject_on_worker_lost=True, name="app.services.run_experiment.advance_experiment")
+def advance_experiment(
+    self, shard_results: list, experiment_id: str, version_ids: list, example_order: list, evaluated: int, stopped: dict
+):
+    db = SessionLocal()
+    try:
+        dominated = _dominated_versions(db, experiment_id, version_ids)
+        if dominated:
+            logging.info(f"Experiment {experiment_id}: early-stopping {len(dominated)} dominated versions")
+        stopped = dict(stopped, **dominated)
+        active = [version_id for version_id in version_ids if version_id not in dominated]
+        if dominated:
+            # stored with the round, so a resume keeps these versions dropped
+            for version_id, samples in dominated.items():
+                db.query(ExperimentResult).filter(
+                    ExperimentResult.experiment_id == experiment_id,
+                    ExperimentResult.prompt_version_id == version_id,
+                ).update({"early_stopped": True, "samples_used": samples}, synchronize_session=False)
+            if evaluated < len(example_order):
+                skipped = _missing_cells(db, experiment_id, list(dominated), example_order[evaluated:])
+                db.query(Experiment).filter(Experiment.id == experiment_id).update(
+                    {"total_cells": Experiment.total_cells - sum(len(ids) for ids in skipped.values())},
+                    synchronize_session=False,
+                )
+            db.commit()
+            _report_progress(db.query(Experiment).filter(Experiment.id == experiment_id).one())
+
+        if evaluated >= len(example_order):
+            finalize_experiment.delay([], experiment_id, stopped)
+        else:
+            _start_round(db, experiment_id, active, example_order, evaluated, stopped)
+
+    except Exception as e:
+        logging.error("Experiment round failed", exc_info=True)
+        db.rollback()
+        _fail_experiment(db, experiment_id, e)
+        raise
+
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, acks_late=True, reject_on_worker_lost=True, name="app.services.run_experiment.finalize_experiment")
+def finalize_experiment(self, shard_results: list, experiment_id: str, stopped: Optional[dict] = None):
+    stopped = stopped or {}
+    db = SessionLocal()
+    try:
+        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).one()
+        version_ids = [
+            version_id
+            for version_id, in db.query(PromptVersion.id).filter(PromptVersion.prompt_id == experiment.prompt_id)
+        ]
+
+        results = _refresh_version_results(db, experiment_id, version_ids)
+        stats = experiment_stats(db, experiment_id)
+        for version_id, result in results.items():
+            result.early_stopped = version_id in stopped
+            version_stats = stats.get(version_id)
+            if version_stats and version_stats["total_examples"]:
+                result.std_score = version_stats["std_score"]
+                result.median_score = version_stats["median_score"]
+                result.score_percentiles = version_stats["score_percentiles"]
+                result.ci_low = version_stats["ci_low"]
+                result.ci_high = version_stats["ci_high"]
+                result.hallucination_histogram = version_stats["hallucination_histogram"]
 
-        db.add_all(results_to_add)
         experiment.status = "completed"
+        experiment.total_cells = experiment.completed_cells
         db.commit()
+        if experiment.task_id:
+            celery_app.backend.mark_as_done(experiment.task_id, experiment_id)
+        logging.info(f"Experiment {experiment_id} completed")
 
     except Exception as e:
-        logging.error("Experiment run failed", exc_info=True)
+        logging.error("Experiment finalize failed", exc_info=True)
         db.rollback()
-        experiment.status = "failed"
+        _fail_experiment(db, experiment_id, e)
+        raise
+
+    finally:
+        db.close()
+
+
+def claim_for_resume(db, experiment_id: str) -> bool:
+    """
+    Atomically flip a failed experiment, or a running one whose heartbeat is
+    older than experiment_heartbeat_timeout, back to running. False if the
+    experiment is completed or still alive, so two resumes never race.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.experiment_heartbeat_timeout)
+    claimed = (
+        db.query(Experiment)
+        .filter(
+            Experiment.id == experiment_id,
+            or_(
+                Experiment.status == "failed",
+                and_(
+                    Experiment.status == "running",
+                    func.coalesce(Experiment.heartbeat_at, Experiment.created_at) < stale_before,
+                ),
+            ),
+        )
+        .update({"status": "running", "heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+    )
+    db.commit()
+    return bool(claimed)
+
+
+@celery_app.task(bind=True, acks_late=True, reject_on_worker_lost=True, name="app.services.run_experiment.resume_experiment")
+def resume_experiment(self, experiment_id: str):
+    """
+    Compute only the cells an interrupted experiment has not stored, then
+    finalize; with early stopping, in rounds from where the experiment stopped.
+    """
+    db = SessionLocal()
+    try:
+        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).one()
+        version_ids = [
+            version_id
+            for version_id, in db.query(PromptVersion.id).filter(PromptVersion.prompt_id == experiment.prompt_id)
+        ]
+        example_ids = [
+            example_id
+            for example_id, in db.query(GoldenExample.id).filter(GoldenExample.prompt_id == experiment.prompt_id)
+        ]
+        # versions already dropped by early stopping stay dropped
+        stopped = {
+            result.prompt_version_id: result.samples_used
+            for result in db.query(ExperimentResult).filter(
+                ExperimentResult.experiment_id == experiment_id, ExperimentResult.early_stopped.is_(True)
+            )
+        }
+        active = [version_id for version_id in version_ids if version_id not in stopped]
+        missing = _missing_cells(db, experiment_id, active, example_ids)
+
+        experiment.task_id = self.request.id
+        experiment.started_at = datetime.utcnow()
+        experiment.heartbeat_at = datetime.utcnow()
+        experiment.completed_cells = 0
+        experiment.total_cells = sum(len(ids) for ids in missing.values())
+        _refresh_version_results(db, experiment_id, version_ids)
         db.commit()
+        _report_progress(experiment)
+        logging.info(f"Resuming experiment {experiment_id}: {experiment.total_cells} cells left")
+
+        if settings.experiment_early_stopping:
+            # the remaining rounds, from the first one with a missing cell
+            example_order = _example_order(experiment_id, example_ids)
+            evaluated = _evaluated_examples(db, experiment_id, active, example_order)
+            _start_round(db, experiment_id, active, example_order, evaluated, stopped)
+        else:
+            _dispatch(experiment_id, missing, finalize_experiment.s(experiment_id, stopped))
+        raise Ignore()
+
+    except Ignore:
+        raise
+
+    except Exception as e:
+        logging.error("Experiment resume failed", exc_info=True)
+        db.rollback()
+        _fail_experiment(db, experiment_id, e)
+        raise
+
+    finally:
+        db.close()
 
+
+@celery_app.task(name="app.services.run_experiment.mark_experiment_failed")
+def mark_experiment_failed(experiment_id: str):
+    logging.error(f"Experiment {experiment_id} failed: a shard did not complete")
+    db = SessionLocal()
+    try:
+        _fail_experiment(db, experiment_id, RuntimeError("a shard did not complete"))
     finally:
         db.close()
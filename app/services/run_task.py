@@ -1,14 +1,23 @@
+import json
 import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import update
 from app.core.celery_app import CeleryApp
+from app.core.config import settings
 from app.core.database import SessionLocal
 from app.models import PromptVersion, Run, CostLog
 from app.services.prompt_renderer import render_prompt
 import logging
 
+# exponential backoff with jitter: a fixed countdown re-sends the whole
+# fleet at the provider in lockstep right after it throttled us
 @CeleryApp.task(bind=True,
                 autoretry_for=(Exception,),
-                retry_kwargs={"max_retries": 3,
-                "countdown": 5}, 
+                retry_kwargs={"max_retries": 3},
+                retry_backoff=5,
+                retry_backoff_max=120,
+                retry_jitter=True,
                 name='app.services.run_task.run_prompt_task'
 )
 def run_prompt_task(self, run_id: str, payload: dict):
@@ -42,7 +51,7 @@ def run_prompt_task(self, run_id: str, payload: dict):
         start = time.perf_counter()
         output, tokens_in, tokens_out = call_llama(
             rendered_prompt,
-            model_name=payload.get("model", "Qwen/Qwen2.5-1.5B-Instruct")
+            model_name=payload.get("model", settings.llm_default_model)
         )
         latency_ms = int((time.perf_counter() - start) * 1000)
 
@@ -51,6 +60,7 @@ def run_prompt_task(self, run_id: str, payload: dict):
         run.tokens_in = tokens_in
         run.tokens_out = tokens_out
         run.status = "completed"
+        run.finished_at = datetime.utcnow()
 
         cost = (tokens_in + tokens_out) * 0.00001
 
@@ -66,8 +76,88 @@ def run_prompt_task(self, run_id: str, payload: dict):
         logging.error(f"Error in run_prompt_task: {str(e)}", exc_info=True)
         if run:
             run.status = "failed"
+            # only the last attempt finishes the run, a retry may still complete it
+            if self.request.retries >= self.max_retries:
+                run.finished_at = datetime.utcnow()
             db.commit()
         raise e
 
     finally:
         db.close()
+
+
+def _execute_run(template: str, variables: dict, model: str) -> dict:
+    from app.services.llm_runner import call_llama
+
+    try:
+        rendered_prompt = render_prompt(template, variables)
+        start = time.perf_counter()
+        output, tokens_in, tokens_out = call_llama(rendered_prompt, model_name=model)
+        return {
+            "output": output,
+            "latency_ms": int((time.perf_counter() - start) * 1000),
+            "tokens_in": tokens_in,
+            "tokens_out": tokens_out,
+            "status": "completed",
+        }
+    except Exception as e:
+        logging.warning(f"Batch run failed: {e}")
+        return {"status": "failed"}
+
+
+# One task per chunk of a RunBatch: the runs of the chunk are executed
+# concurrently and written back in a single commit. Redelivery after a lost
+# worker (acks_late) skips runs that already finished.
+@CeleryApp.task(bind=True,
+                acks_late=True,
+                reject_on_worker_lost=True,
+                name='app.services.run_task.run_prompt_batch_task'
+)
+def run_prompt_batch_task(self, batch_id: str, run_ids: list):
+    db = SessionLocal()
+    try:
+        runs = (
+            db.query(Run)
+            .filter(Run.id.in_(run_ids), Run.finished_at.is_(None))
+            .all()
+        )
+        if not runs:
+            return {"batch_id": batch_id, "completed": 0, "failed": 0}
+        template = (
+            db.query(PromptVersion.template)
+            .filter(PromptVersion.id == runs[0].prompt_version_id)
+            .scalar()
+        )
+        # read before the commit expires the rows: afterwards every attribute
+        # access would reload its run with a SELECT of its own
+        pending_ids = [run.id for run in runs]
+        jobs = [(json.loads(run.input), run.model) for run in runs]
+        db.query(Run).filter(Run.id.in_(pending_ids)).update(
+            {"status": "running"}, synchronize_session=False
+        )
+        db.commit()
+        # no pooled connection is held through the LLM calls
+        db.close()
+
+        logging.info(f"Batch {batch_id}: executing {len(jobs)} runs")
+        with ThreadPoolExecutor(max_workers=max(1, settings.run_batch_parallelism)) as executor:
+            outcomes = list(executor.map(lambda job: _execute_run(template, *job), jobs))
+
+        finished_at = datetime.utcnow()
+        # bulk UPDATE by primary key, without loading the runs again
+        db.execute(update(Run), [
+            dict(outcome, id=run_id, finished_at=finished_at)
+            for run_id, outcome in zip(pending_ids, outcomes)
+        ])
+        db.add_all([
+            CostLog(run_id=run_id, cost_usd=(outcome["tokens_in"] + outcome["tokens_out"]) * 0.00001)
+            for run_id, outcome in zip(pending_ids, outcomes)
+            if outcome["status"] == "completed"
+        ])
+        db.commit()
+
+        completed = sum(outcome["status"] == "completed" for outcome in outcomes)
+        return {"batch_id": batch_id, "completed": completed, "failed": len(jobs) - completed}
+
+    finally:
+        db.close()
@@ -0,0 +1,143 @@
+# app/services/similarity_metrics.py
+"""
+Cheap lexical similarity between expected and model outputs.
+
+All metrics are computed for a whole list of pairs at once with numpy, so
+scoring a few thousand golden examples takes about a second instead of
+thousands of judge calls. Features are hashed into fixed-size count vectors, no vocabulary
+has to be built.
+"""
+import re
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+HASH_DIM = 2048
+NGRAM_SIZE = 3
+MAX_EDIT_TOKENS = 256  # edit distance is quadratic, longer outputs are truncated
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+def _hash_ids(features: List[str]) -> np.ndarray:
+    # a stable hash: str hash() is salted per process (PYTHONHASHSEED), which
+    # would give every worker and restart different buckets and scores
+    return np.fromiter(
+        (zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.int64, count=len(features)
+    )
+
+
+def _hashed_counts(documents: List[np.ndarray]) -> np.ndarray:
+    """Row i counts the hashed feature ids of document i, in one bincount."""
+    lengths = [len(ids) for ids in documents]
+    if not sum(lengths):
+        return np.zeros((len(documents), HASH_DIM), dtype=np.float32)
+    rows = np.repeat(np.arange(len(documents)), lengths)
+    buckets = np.concatenate(documents) % HASH_DIM
+    counts = np.bincount(rows * HASH_DIM + buckets, minlength=len(documents) * HASH_DIM)
+    return counts.reshape(len(documents), HASH_DIM).astype(np.float32)
+
+
+def _char_ngrams(text: str) -> List[str]:
+    padded = f" {text} "
+    return [padded[i:i + NGRAM_SIZE] for i in range(max(0, len(padded) - NGRAM_SIZE + 1))]
+
+
+def edit_distance(a: List[np.ndarray], b: List[np.ndarray]) -> np.ndarray:
+    """
+    Levenshtein distance of every pair (a[i], b[i]) of token-id arrays.
+
+    One dynamic-programming row is kept per pair and all pairs advance
+    together, so the Python loop runs max(len(a[i])) times in total.
+    """
+    n = len(a)
+    len_a = np.array([len(x) for x in a], dtype=np.int64)
+    len_b = np.array([len(x) for x in b], dtype=np.int64)
+    width = int(len_b.max(initial=0))
+
+    tokens_a = np.full((n, int(len_a.max(initial=0))), -1, dtype=np.int64)
+    tokens_b = np.full((n, width), -2, dtype=np.int64)  # different pads never match
+    for i in range(n):
+        tokens_a[i, :len_a[i]] = a[i]
+        tokens_b[i, :len_b[i]] = b[i]
+
+    offsets = np.arange(width + 1)
+    previous = np.tile(offsets, (n, 1))
+    distance = len_b.copy()  # pairs with an empty `a`
+    for i in range(tokens_a.shape[1]):
+        # deletion / substitution from the previous row ...
+        best = np.empty_like(previous)
+        best[:, 0] = i + 1
+        best[:, 1:] = np.minimum(
+            previous[:, 1:] + 1,
+            previous[:, :-1] + (tokens_b != tokens_a[:, i:i + 1]),
+        )
+        # ... then insertions along the row, as a running minimum
+        previous = np.minimum.accumulate(best - offsets, axis=1) + offsets
+        finished = len_a == i + 1
+        distance[finished] = previous[finished, len_b[finished]]
+    return distance
+
+
+def token_f1(expected_counts: np.ndarray, output_counts: np.ndarray) -> np.ndarray:
+    overlap = np.minimum(expected_counts, output_counts).sum(axis=1)
+    total = expected_counts.sum(axis=1) + output_counts.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        f1 = np.where(total > 0, 2 * overlap / total, 1.0)
+    return f1
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        similarity = np.where(norms > 0, (a * b).sum(axis=1) / norms, 0.0)
+    # two empty texts are identical
+    both_empty = (a.sum(axis=1) == 0) & (b.sum(axis=1) == 0)
+    return np.where(both_empty, 1.0, similarity)
+
+
+def cheap_similarity(expected: List[str], outputs: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Per-pair exact match, normalized edit similarity, token F1, hashed
+    character n-gram cosine, and `score`: 1.0 on exact match, otherwise the
+    mean of the three graded metrics. All values are in [0, 1].
+    """
+    expected_norm = [normalize(text) for text in expected]
+    output_norm = [normalize(text) for text in outputs]
+    expected_tokens = [text.split() for text in expected_norm]
+    output_tokens = [text.split() for text in output_norm]
+
+    exact_match = np.array([e == o for e, o in zip(expected_norm, output_norm)], dtype=bool)
+
+    expected_ids = [_hash_ids(tokens) for tokens in expected_tokens]
+    output_ids = [_hash_ids(tokens) for tokens in output_tokens]
+
+    distance = edit_distance(
+        [ids[:MAX_EDIT_TOKENS] for ids in expected_ids],
+        [ids[:MAX_EDIT_TOKENS] for ids in output_ids],
+    )
+    longest = np.array(
+        [max(len(e), len(o)) for e, o in zip(expected_ids, output_ids)], dtype=np.float64
+    ).clip(max=MAX_EDIT_TOKENS)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        edit_similarity = np.where(longest > 0, 1.0 - distance / longest, 1.0)
+
+    f1 = token_f1(_hashed_counts(expected_ids), _hashed_counts(output_ids))
+    ngram_cosine = cosine(
+        _hashed_counts([_hash_ids(_char_ngrams(text)) for text in expected_norm]),
+        _hashed_counts([_hash_ids(_char_ngrams(text)) for text in output_norm]),
+    )
+
+    score = np.where(exact_match, 1.0, (edit_similarity + f1 + ngram_cosine) / 3)
+    return {
+        "exact_match": exact_match,
+        "edit_similarity": edit_similarity,
+        "token_f1": f1,
+        "ngram_cosine": ngram_cosine,
+        "score": np.clip(score, 0.0, 1.0),
+    }
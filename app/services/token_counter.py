@@ -0,0 +1,105 @@
+# app/services/token_counter.py
+import logging
+import math
+import os
+import threading
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Approximate chat-template overhead (role markers, separators) per message,
+# plus the tokens that prime the assistant turn.
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+
+class TokenCounter:
+    """
+    Counts tokens with each model's own tokenizer.
+
+    Tokenizers are loaded lazily on first use and cached for the lifetime of
+    the process. If a tokenizer can't be loaded (offline, gated model), it
+    falls back to a ~4 characters per token estimate and does not retry the
+    load.
+    """
+
+    def __init__(self):
+        self._tokenizers = {}
+        self._lock = threading.Lock()
+        # one lock per model so a slow download doesn't block other models
+        self._load_locks = {}
+
+    def get_tokenizer(self, model_name: str):
+        if model_name in self._tokenizers:
+            return self._tokenizers[model_name]
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_name, threading.Lock())
+
+        with load_lock:
+            if model_name not in self._tokenizers:
+                self._tokenizers[model_name] = self._load(model_name)
+        return self._tokenizers[model_name]
+
+    def count(self, text: str, model_name: str) -> int:
+        return self.count_batch([text], model_name)[0]
+
+    def count_batch(self, texts: List[str], model_name: str) -> List[int]:
+        """Count tokens for many texts in a single (parallel, native) encode call."""
+        if not texts:
+            return []
+
+        tokenizer = self.get_tokenizer(model_name)
+        if tokenizer is None:
+            return [self._estimate(text) for text in texts]
+
+        encodings = tokenizer.encode_batch(list(texts), add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
+
+    def count_messages(self, system_prompt: str, prompt: str, model_name: str) -> int:
+        """Prompt tokens of a system + user chat request, template overhead included."""
+        messages = [text for text in (system_prompt, prompt) if text]
+        counts = self.count_batch(messages, model_name)
+        return sum(counts) + MESSAGE_OVERHEAD_TOKENS * len(messages) + REPLY_PRIMING_TOKENS
+
+    @staticmethod
+    def _estimate(text: str) -> int:
+        return math.ceil(len(text) / 4) if text else 0
+
+    @staticmethod
+    def _load(model_name: str):
+        try:
+            from tokenizers import Tokenizer
+
+            tokenizer = Tokenizer.from_pretrained(
+                model_name, token=os.getenv("HUGGINGFACE_API_KEY") or None
+            )
+            logger.info(f"Loaded tokenizer for {model_name}")
+            return tokenizer
+        except Exception as e:
+            logger.warning(f"Could not load tokenizer for {model_name}, estimating tokens instead: {e}")
+            return None
+
+
+token_counter = TokenCounter()
+
+
+def count_usage(
+    model_name: str,
+    system_prompt: str,
+    prompt: str,
+    output: str,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+):
+    """
+    Resolve (tokens_in, tokens_out), preferring the provider's usage numbers.
+
+    Returns:
+        tuple: (input_tokens, output_tokens)
+    """
+    if prompt_tokens is None:
+        prompt_tokens = token_counter.count_messages(system_prompt, prompt, model_name)
+    if completion_tokens is None:
+        completion_tokens = token_counter.count(output, model_name)
+    return prompt_tokens, completion_tokens
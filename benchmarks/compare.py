@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Diff two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 10]
+
+Exits with status 1 when any metric regressed by more than --threshold
+percent, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+# metrics where a bigger number is better; everything else compared is a cost
+HIGHER_IS_BETTER = ("requests_per_second", "cells_per_second")
+COMPARED_SUFFIXES = ("_ms", "wall_seconds", "db_queries", "db_queries_per_request") + HIGHER_IS_BETTER
+
+
+def flatten(data, prefix=""):
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield path, value
+
+
+def compare(old: dict, new: dict, threshold: float):
+    old_metrics = dict(flatten(old["scenarios"]))
+    new_metrics = dict(flatten(new["scenarios"]))
+
+    rows, regressions = [], []
+    for path in sorted(old_metrics.keys() & new_metrics.keys()):
+        if not path.endswith(COMPARED_SUFFIXES):
+            continue
+        before, after = old_metrics[path], new_metrics[path]
+        if before == 0:
+            continue
+        change = (after - before) / before * 100
+        worse = -change if path.endswith(HIGHER_IS_BETTER) else change
+        rows.append((path, before, after, change))
+        if worse > threshold:
+            regressions.append(path)
+    return rows, regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    if old.get("config") != new.get("config"):
+        print("warning: benchmark configs differ, numbers may not be comparable", file=sys.stderr)
+
+    rows, regressions = compare(old, new, args.threshold)
+    print(f"{'metric':<60} {old.get('git_sha', 'old'):>12} {new.get('git_sha', 'new'):>12} {'change':>9}")
+    for path, before, after, change in rows:
+        flag = "  <-- regression" if path in regressions else ""
+        print(f"{path:<60} {before:>12} {after:>12} {change:>+8.1f}%{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold}%", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
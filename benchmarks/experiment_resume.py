@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Regression check: resuming an early-stopping experiment.
+
+Runs an experiment with early stopping over three prompt versions, one of
+them clearly worse, and interrupts it right after its first round (the
+worker is "lost" once the round has been judged). Then resumes it and
+checks that the dropped version stays dropped, that the resume carries on
+in rounds, and that the other versions are evaluated on every example.
+
+Runs offline: a throwaway SQLite file, Celery in eager mode and
+deterministic stand-ins for generation and judging. Exits 1 on failure.
+
+Usage (from the repo root):
+    python -m benchmarks.experiment_resume
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+
+RESUME_DB = os.path.join(tempfile.gettempdir(), "llmops-experiment-resume.db")
+ROUND_SIZE = 10
+EXAMPLES = 40
+
+# must be in place before app settings are imported
+os.environ.setdefault("DATABASE_URL_OVERRIDE", f"sqlite:///{RESUME_DB}")
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ["EXPERIMENT_EARLY_STOPPING"] = "true"
+os.environ["EXPERIMENT_EARLY_STOPPING_ROUND_SIZE"] = str(ROUND_SIZE)
+os.environ["EXPERIMENT_SHARD_SIZE"] = "5"
+
+from sqlalchemy import func  # noqa: E402
+
+from app.core.celery_app import celery_app  # noqa: E402
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Base,
+    Experiment,
+    ExperimentExampleResult,
+    ExperimentResult,
+    GoldenExample,
+    Prompt,
+    PromptVersion,
+)
+from app.services import run_experiment as experiments  # noqa: E402
+
+TEMPLATES = {"good-a": "good a: {text}", "good-b": "good b: {text}", "bad": "bad: {text}"}
+
+
+class WorkerLost(Exception):
+    pass
+
+
+def _generate_output(template, example):
+    rendered = template.format(**json.loads(example.input_data))
+    return rendered, f"output of {rendered}"
+
+
+def _score_batch(items, executor=None):
+    scores = []
+    for rendered, _, _ in items:
+        jitter = random.Random(rendered).uniform(-0.05, 0.05)
+        score = (0.15 if rendered.startswith("bad") else 0.85) + jitter
+        scores.append({
+            "score": score, "hallucination_rate": 0.0, "reason": "", "scored_by": "judge", "cheap_score": score,
+        })
+    return scores
+
+
+def seed() -> dict:
+    if os.path.exists(RESUME_DB):
+        os.remove(RESUME_DB)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        prompt = Prompt(name="experiment-resume-check")
+        db.add(prompt)
+        db.flush()
+        versions = {}
+        for name, template in TEMPLATES.items():
+            version = PromptVersion(prompt_id=prompt.id, version=name, template=template)
+            db.add(version)
+            db.flush()
+            versions[name] = version.id
+        for i in range(EXAMPLES):
+            db.add(GoldenExample(
+                prompt_id=prompt.id, input_data=json.dumps({"text": f"document {i}"}), expected_output=f"summary {i}",
+            ))
+        db.commit()
+        return {"prompt_id": prompt.id, "versions": versions}
+    finally:
+        db.close()
+
+
+def main() -> int:
+    celery_app.conf.update(
+        broker_url="memory://", result_backend="cache+memory://", task_always_eager=True,
+    )
+    experiments.generate_output = _generate_output
+    experiments.cascade_score_batch = _score_batch
+    ids = seed()
+
+    start_round = experiments._start_round
+    rounds = []
+
+    def interrupted_round(db, experiment_id, version_ids, example_order, evaluated, stopped):
+        rounds.append(evaluated)
+        if evaluated > 0 and not resumed:
+            raise WorkerLost("worker lost after the first round")
+        start_round(db, experiment_id, version_ids, example_order, evaluated, stopped)
+
+    experiments._start_round = interrupted_round
+    resumed = False
+    experiments.run_experiment.apply(args=(ids["prompt_id"], "resume-check"))
+
+    db = SessionLocal()
+    try:
+        experiment = db.query(Experiment).one()
+        checks = [("interrupted after the first round", experiment.status == "failed" and rounds == [0, ROUND_SIZE])]
+
+        resumed = True
+        rounds.clear()
+        checks.append(("claimed for resume", experiments.claim_for_resume(db, experiment.id)))
+        experiments.resume_experiment.apply(args=(experiment.id,))
+        db.expire_all()
+
+        experiment = db.query(Experiment).one()
+        cells = dict(
+            db.query(ExperimentExampleResult.prompt_version_id, func.count(ExperimentExampleResult.id))
+            .filter(ExperimentExampleResult.experiment_id == experiment.id)
+            .group_by(ExperimentExampleResult.prompt_version_id)
+        )
+        results = {
+            result.prompt_version_id: result
+            for result in db.query(ExperimentResult).filter(ExperimentResult.experiment_id == experiment.id)
+        }
+        bad = ids["versions"]["bad"]
+        checks += [
+            ("resumed experiment completed", experiment.status == "completed"),
+            ("resume continued in rounds", rounds[:1] == [ROUND_SIZE] and len(rounds) > 1),
+            ("dropped version stays dropped", results[bad].early_stopped and cells.get(bad) == ROUND_SIZE),
+            ("dropped version keeps its sample count", results[bad].samples_used == ROUND_SIZE),
+            ("other versions see every example", all(
+                cells.get(ids["versions"][name]) == EXAMPLES and not results[ids["versions"][name]].early_stopped
+                for name in ("good-a", "good-b")
+            )),
+        ]
+    finally:
+        db.close()
+        experiments._start_round = start_round
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
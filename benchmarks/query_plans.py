@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the hot queries of the API and workers.
+
+Seeds a database at realistic volumes, runs EXPLAIN on each hot query
+(built exactly as the app builds it) and exits 1 if any of them reads a
+table with a full sequential scan, so a dropped or unused index fails CI.
+
+Runs against a throwaway SQLite file by default (EXPLAIN QUERY PLAN); point
+DATABASE_URL_OVERRIDE at an empty Postgres database to check real plans
+(EXPLAIN (FORMAT JSON), after ANALYZE). Tables are created from the models,
+so their indexes must match the Alembic migrations.
+
+Usage (from the repo root):
+    python -m benchmarks.query_plans
+    python -m benchmarks.query_plans --scale 0.2 --verbose
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+PLANS_DB = os.path.join(tempfile.gettempdir(), "llmops-query-plans.db")
+
+# must be in place before app settings are imported
+os.environ.setdefault("DATABASE_URL_OVERRIDE", f"sqlite:///{PLANS_DB}")
+
+from sqlalchemy import func, insert, text, tuple_  # noqa: E402
+
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    APIKey,
+    Base,
+    EvaluationResult,
+    Experiment,
+    ExperimentExampleResult,
+    ExperimentResult,
+    GoldenExample,
+    Prompt,
+    PromptVersion,
+    RollupWatermark,
+    Run,
+    RunRollupHourly,
+    User,
+)
+
+# rows at --scale 1
+VOLUMES = {
+    "users": 2_000,
+    "prompts": 2_000,
+    "versions_per_prompt": 5,
+    "examples_per_prompt": 25,
+    "runs": 200_000,
+    "evaluations": 100_000,
+    "experiments": 2_000,
+    "cells_per_experiment": 50,
+}
+BATCH = 5_000
+START = datetime(2026, 1, 1)
+
+
+def _uid() -> str:
+    return str(uuid.uuid4())
+
+
+def _insert(db, model, rows) -> None:
+    for i in range(0, len(rows), BATCH):
+        db.execute(insert(model), rows[i:i + BATCH])
+
+
+def seed(db, scale: float) -> dict:
+    rng = random.Random(0)
+    n = {name: max(1, int(value * scale)) for name, value in VOLUMES.items()}
+    n["versions_per_prompt"] = VOLUMES["versions_per_prompt"]
+    n["examples_per_prompt"] = VOLUMES["examples_per_prompt"]
+    n["cells_per_experiment"] = VOLUMES["cells_per_experiment"]
+
+    users = [{"id": _uid(), "email": f"user{i}@example.com"} for i in range(n["users"])]
+    _insert(db, User, users)
+    # a few revoked keys per user, as key rotation leaves behind
+    _insert(db, APIKey, [
+        {"id": _uid(), "user_id": user["id"], "key": f"key-{i}-{k}", "is_active": k == 0}
+        for i, user in enumerate(users) for k in range(3)
+    ])
+
+    prompts = [
+        {"id": _uid(), "name": f"prompt-{i}", "created_at": START + timedelta(minutes=i)}
+        for i in range(n["prompts"])
+    ]
+    _insert(db, Prompt, prompts)
+    versions = [
+        {
+            "id": _uid(), "prompt_id": prompt["id"], "version": f"v{v + 1}", "template": "Answer: {question}",
+            "created_at": prompt["created_at"] + timedelta(hours=v), "is_active": v == 0,
+        }
+        for prompt in prompts for v in range(n["versions_per_prompt"])
+    ]
+    _insert(db, PromptVersion, versions)
+    examples = [
+        {
+            "id": _uid(), "prompt_id": prompt["id"], "input_data": json.dumps({"question": f"q{e}"}),
+            "expected_output": f"a{e}", "created_at": prompt["created_at"] + timedelta(seconds=e),
+        }
+        for prompt in prompts for e in range(n["examples_per_prompt"])
+    ]
+    _insert(db, GoldenExample, examples)
+
+    statuses = ["completed"] * 97 + ["failed"] * 2 + ["pending"]
+    runs = [
+        {
+            "id": _uid(), "prompt_version_id": rng.choice(versions)["id"], "model": "bench",
+            "status": rng.choice(statuses), "created_at": START + timedelta(seconds=i * 7),
+            "latency_ms": rng.randint(100, 3000), "tokens_in": 50, "tokens_out": 100,
+        }
+        for i in range(n["runs"])
+    ]
+    for run in runs:
+        if run["status"] != "pending":
+            run["finished_at"] = run["created_at"] + timedelta(milliseconds=run["latency_ms"])
+    _insert(db, Run, runs)
+    _insert(db, EvaluationResult, [
+        {
+            "id": _uid(), "prompt_version_id": rng.choice(versions)["id"],
+            "golden_example_id": rng.choice(examples)["id"], "score": rng.random(),
+            "created_at": START + timedelta(seconds=i * 11),
+        }
+        for i in range(n["evaluations"])
+    ])
+
+    experiments = [
+        {
+            "id": _uid(), "prompt_id": rng.choice(prompts)["id"], "name": f"experiment-{i}",
+            "status": "completed", "created_at": START + timedelta(minutes=i * 3),
+        }
+        for i in range(n["experiments"])
+    ]
+    _insert(db, Experiment, experiments)
+    _insert(db, ExperimentResult, [
+        {"id": _uid(), "experiment_id": experiment["id"], "prompt_version_id": rng.choice(versions)["id"],
+         "avg_score": rng.random(), "total_examples": 25}
+        for experiment in experiments for _ in range(n["versions_per_prompt"])
+    ])
+    _insert(db, ExperimentExampleResult, [
+        {
+            "id": _uid(), "experiment_id": experiment["id"], "prompt_version_id": versions[c % len(versions)]["id"],
+            "golden_example_id": examples[c % len(examples)]["id"], "template_hash": f"t{c % 500}",
+            "example_hash": f"e{c}", "model": "bench", "judge_version": "j1", "score": rng.random(),
+        }
+        for i, experiment in enumerate(experiments)
+        for c in range(i * n["cells_per_experiment"], (i + 1) * n["cells_per_experiment"])
+    ])
+    # the hourly rollups of all those runs, and how far they have been refreshed
+    hours = n["runs"] * 7 // 3600 + 1
+    _insert(db, RunRollupHourly, [
+        {"id": _uid(), "bucket": START + timedelta(hours=h), "model": "bench", "prompt_version_id": version["id"],
+         "run_count": 3, "latency_histogram": [1, 2]}
+        for h in range(hours) for version in versions[:10]
+    ])
+    _insert(db, RollupWatermark, [{"name": "run_rollups_hourly", "watermark": START + timedelta(seconds=n["runs"] * 6)}])
+    db.commit()
+    db.execute(text("ANALYZE"))
+    db.commit()
+
+    return {
+        "api_key": "key-7-0",
+        "prompt_id": prompts[len(prompts) // 2]["id"],
+        "version_id": versions[len(versions) // 2]["id"],
+        "experiment_id": experiments[len(experiments) // 2]["id"],
+        "cursor": (START + timedelta(seconds=n["runs"] * 3), "8"),
+        "watermark": START + timedelta(seconds=n["runs"] * 6),
+        "window_start": START + timedelta(hours=hours - 24),
+    }
+
+
+def hot_queries(db, ids: dict) -> dict:
+    """The hot queries, built as in app/ (name -> ORM query)."""
+    cell = ExperimentExampleResult
+    reusable = (
+        db.query(
+            cell.id, cell.score, cell.output,
+            func.row_number().over(
+                partition_by=(cell.template_hash, cell.example_hash),
+                order_by=(cell.created_at.desc(), cell.id.desc()),
+            ).label("rank"),
+        )
+        .filter(
+            cell.template_hash.in_(["t1", "t2"]), cell.example_hash.in_(["e1", "e2"]),
+            cell.model == "bench", cell.judge_version == "j1", cell.reused_from_id.is_(None),
+        )
+        .subquery()
+    )
+    return {
+        # app/core/security.py, every authenticated request
+        "api_key_lookup": db.query(APIKey).filter(APIKey.key == ids["api_key"]).filter(APIKey.is_active == True),  # noqa: E712
+        # evaluate, experiments, golden example export
+        "golden_examples_of_prompt": db.query(GoldenExample).filter(GoldenExample.prompt_id == ids["prompt_id"])
+        .order_by(GoldenExample.created_at, GoldenExample.id),
+        # version history
+        "versions_of_prompt": db.query(PromptVersion).filter(PromptVersion.prompt_id == ids["prompt_id"])
+        .order_by(PromptVersion.created_at.desc()),
+        # experiment status polling
+        "experiment_results": db.query(ExperimentResult).filter(ExperimentResult.experiment_id == ids["experiment_id"]),
+        # experiment statistics / partial aggregates
+        "experiment_cells": db.query(cell.prompt_version_id, cell.score).filter(cell.experiment_id == ids["experiment_id"]),
+        # experiment cell reuse
+        "reusable_cells": db.query(reusable).filter(reusable.c.rank == 1),
+        # in-flight runs
+        "active_runs": db.query(Run).filter(Run.status.in_(["pending", "running"])).order_by(Run.created_at).limit(100),
+        # GET /runs, keyset page
+        "runs_page": db.query(Run).filter(tuple_(Run.created_at, Run.id) < tuple_(*ids["cursor"]))
+        .order_by(Run.created_at.desc(), Run.id.desc()).limit(101),
+        # run batch progress
+        "batch_progress": db.query(Run.status, func.count(Run.id)).filter(Run.batch_id == "batch").group_by(Run.status),
+        # evaluation history of a version
+        "evaluations_of_version": db.query(EvaluationResult)
+        .filter(EvaluationResult.prompt_version_id == ids["version_id"])
+        .order_by(EvaluationResult.created_at.desc()).limit(100),
+        # analytics refresh: runs finished since the watermark
+        "runs_finished_since": db.query(Run.finished_at, Run.status, Run.latency_ms)
+        .filter(Run.finished_at > ids["watermark"], Run.finished_at <= ids["watermark"] + timedelta(minutes=1)),
+        # analytics summary / timeseries window
+        "rollups_window": db.query(RunRollupHourly).filter(RunRollupHourly.bucket >= ids["window_start"]),
+    }
+
+
+def _sql(db, query) -> str:
+    return str(query.statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def full_scans(db, query) -> tuple:
+    """(plan text, tables read by a full sequential scan)."""
+    sql = _sql(db, query)
+    if db.bind.dialect.name == "postgresql":
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        plan = plan if isinstance(plan, list) else json.loads(plan)
+        scans, stack = [], [plan[0]["Plan"]]
+        while stack:
+            node = stack.pop()
+            if node["Node Type"] == "Seq Scan":
+                scans.append(node["Relation Name"])
+            stack.extend(node.get("Plans", []))
+        return json.dumps(plan, indent=1), scans
+
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    details = [row[-1] for row in rows]
+    # "SCAN runs" reads the whole table; "SCAN runs USING INDEX" walks an index in order.
+    # Scans of subquery results (co-routines) are not table reads.
+    scans = [
+        detail.split()[1] for detail in details
+        if detail.startswith("SCAN ") and " USING " not in detail and detail.split()[1] in Base.metadata.tables
+    ]
+    return "\n".join(details), scans
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier on the seeded row counts")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite" and os.path.exists(PLANS_DB):
+        os.remove(PLANS_DB)
+    Base.metadata.create_all(engine)
+
+    db = SessionLocal()
+    try:
+        if db.query(Prompt.id).first():
+            print("refusing to seed a non-empty database", file=sys.stderr)
+            return 2
+        print(f"seeding ({engine.dialect.name}, scale {args.scale}) ...")
+        ids = seed(db, args.scale)
+
+        failures = 0
+        for name, query in hot_queries(db, ids).items():
+            plan, scans = full_scans(db, query)
+            ok = not scans
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name}" + ("" if ok else f": full scan of {', '.join(scans)}"))
+            if args.verbose or not ok:
+                print("     " + plan.replace("\n", "\n     "))
+        print(f"{failures} hot queries with full scans")
+        return 1 if failures else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the API, the Celery queue and experiments.
+
+Runs fully offline: SQLite instead of Postgres, an in-memory Celery broker
+and result backend with an in-process worker, and the fake LLM backend
+(app/core/fake_llm.py). Redis-backed features (rate limit, LLM limiter,
+single-flight) degrade to their no-Redis behaviour unless a Redis is
+reachable on localhost.
+
+Usage (from the repo root):
+    python -m benchmarks.run
+    python -m benchmarks.run --concurrency 32 --requests 500 --scenarios run,runs
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+
+Results are written to benchmarks/results/<timestamp>-<git sha>.json.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "llmops-bench.db")
+
+# must be in place before app settings are imported
+os.environ.setdefault("DATABASE_URL_OVERRIDE", f"sqlite:///{BENCH_DB}")
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_TTFT_MS", "50")
+os.environ.setdefault("FAKE_LLM_TOKENS_PER_SECOND", "2000")
+
+import httpx  # noqa: E402
+from celery import signals  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core.celery_app import celery_app  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal, engine, get_async_engine  # noqa: E402
+from app.models import APIKey, Base, GoldenExample, Prompt, PromptVersion, User  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+API_KEY = "bench-key"
+
+
+# -- instrumentation ---------------------------------------------------------
+
+class Counters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.published = {}
+        self.started = {}
+        self.finished = {}
+
+    def snapshot_queries(self) -> int:
+        with self.lock:
+            return self.queries
+
+
+counters = Counters()
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    with counters.lock:
+        counters.queries += 1
+
+
+# sync routes and workers, and the async routes
+event.listen(engine, "before_cursor_execute", _count_query)
+event.listen(get_async_engine().sync_engine, "before_cursor_execute", _count_query)
+
+
+@signals.after_task_publish.connect
+def _on_publish(sender=None, headers=None, **kwargs):
+    counters.published[headers["id"]] = time.perf_counter()
+
+
+@signals.task_prerun.connect
+def _on_prerun(task_id=None, **kwargs):
+    counters.started[task_id] = time.perf_counter()
+
+
+@signals.task_postrun.connect
+def _on_postrun(task_id=None, **kwargs):
+    counters.finished[task_id] = time.perf_counter()
+
+
+def percentiles(samples) -> dict:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+# -- setup -------------------------------------------------------------------
+
+def setup_database(versions: int, examples: int) -> dict:
+    if os.path.exists(BENCH_DB):
+        os.remove(BENCH_DB)
+    Base.metadata.create_all(engine)
+
+    db = SessionLocal()
+    try:
+        user = User(email="bench@example.com")
+        db.add(user)
+        db.flush()
+        db.add(APIKey(user_id=user.id, key=API_KEY, is_active=True))
+
+        prompt = Prompt(name=f"bench-{uuid.uuid4().hex[:8]}", description="benchmark")
+        db.add(prompt)
+        db.flush()
+
+        version_ids = []
+        for i in range(versions):
+            version = PromptVersion(
+                prompt_id=prompt.id,
+                version=f"v{i + 1}",
+                template=f"Variant {i + 1}. Summarize the following text:\n{{text}}",
+            )
+            db.add(version)
+            db.flush()
+            version_ids.append(version.id)
+
+        for i in range(examples):
+            db.add(GoldenExample(
+                prompt_id=prompt.id,
+                input_data=json.dumps({"text": f"benchmark document number {i} about topic {i % 7}"}),
+                expected_output=f"a summary of document {i}",
+            ))
+        db.commit()
+        return {"prompt_id": prompt.id, "version_ids": version_ids}
+    finally:
+        db.close()
+
+
+def setup_celery():
+    celery_app.conf.update(
+        broker_url="memory://",
+        result_backend="cache+memory://",
+        # the memory transport polls; the default 1s interval would dominate queue wait
+        broker_transport_options={"polling_interval": 0.01},
+        task_always_eager=False,
+    )
+
+
+# -- load generation ---------------------------------------------------------
+
+async def drive(client, concurrency: int, count: int, make_request):
+    """Fire `count` requests with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors, responses = [], 0, []
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await make_request(client, i)
+                response.raise_for_status()
+                responses.append(response)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    queries_before = counters.snapshot_queries()
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    elapsed = time.perf_counter() - start
+    queries = counters.snapshot_queries() - queries_before
+
+    return responses, {
+        "requests": count,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_seconds": round(elapsed, 3),
+        "requests_per_second": round(count / elapsed, 2) if elapsed else None,
+        "latency": percentiles(latencies),
+        "db_queries": queries,
+        "db_queries_per_request": round(queries / count, 2) if count else None,
+    }
+
+
+async def scenario_run(client, args, data) -> dict:
+    payload = {
+        "prompt_version_id": data["version_ids"][0],
+        "variables": {"text": "benchmark input"},
+        "model": settings.llm_default_model,
+    }
+
+    async def post_run(client, i):
+        body = dict(payload, variables={"text": f"benchmark input {i}"})
+        return await client.post("/run", json=body)
+
+    responses, post_stats = await drive(client, args.concurrency, args.requests, post_run)
+    task_ids = [response.json()["task_id"] for response in responses]
+
+    # poll /task-status until every task has finished
+    poll_stats = []
+    pending = set(task_ids)
+    deadline = time.monotonic() + args.timeout
+    while pending and time.monotonic() < deadline:
+        ids = list(pending)
+
+        async def poll(client, i):
+            return await client.get(f"/task-status/{ids[i]}")
+
+        polled, stats = await drive(client, args.concurrency, len(ids), poll)
+        poll_stats.append(stats)
+        for response in polled:
+            body = response.json()
+            if body["status"] in ("success", "failed"):
+                pending.discard(body["task_id"])
+        if pending:
+            await asyncio.sleep(0.05)
+
+    # task_postrun fires just after the result is stored
+    await asyncio.sleep(0.2)
+    queue_wait = [
+        counters.started[t] - counters.published[t]
+        for t in task_ids if t in counters.started and t in counters.published
+    ]
+    end_to_end = [
+        counters.finished[t] - counters.published[t]
+        for t in task_ids if t in counters.finished and t in counters.published
+    ]
+    all_polls = [s for s in poll_stats if s["latency"]["count"]]
+    return {
+        "post_run": post_stats,
+        "task_status": {
+            "polls": sum(s["requests"] for s in poll_stats),
+            "rounds": len(poll_stats),
+            "p95_ms_worst_round": max((s["latency"]["p95_ms"] for s in all_polls), default=None),
+            "db_queries": sum(s["db_queries"] for s in poll_stats),
+        },
+        "tasks_unfinished": len(pending),
+        "queue_wait": percentiles(queue_wait),
+        "task_end_to_end": percentiles(end_to_end),
+    }
+
+
+async def scenario_runs(client, args, data) -> dict:
+    async def list_runs(client, i):
+        return await client.get("/runs", params={"limit": 100})
+
+    _, stats = await drive(client, args.concurrency, args.requests, list_runs)
+    return {"list_runs": stats}
+
+
+async def scenario_evaluate(client, args, data) -> dict:
+    version_id = data["version_ids"][0]
+
+    async def evaluate(client, i):
+        return await client.post(f"/prompts/{data['prompt_id']}/versions/{version_id}/evaluate")
+
+    start = time.perf_counter()
+    responses, stats = await drive(client, min(args.concurrency, 4), args.evaluations, evaluate)
+    stats["examples_per_evaluation"] = args.examples
+
+    # evaluations are queued jobs: poll until every one has finished
+    pending = {response.json()["job_id"] for response in responses}
+    deadline = time.monotonic() + args.timeout
+    while pending and time.monotonic() < deadline:
+        for job_id in list(pending):
+            body = (await client.get(f"/evaluations/{job_id}/status")).json()
+            if body["status"] in ("success", "failed"):
+                pending.discard(job_id)
+        if pending:
+            await asyncio.sleep(0.05)
+    stats["jobs_unfinished"] = len(pending)
+    stats["jobs_wall_seconds"] = round(time.perf_counter() - start, 3)
+    return {"evaluate": stats}
+
+
+async def scenario_experiment(client, args, data) -> dict:
+    from app.models import Experiment
+    from app.services.run_experiment import run_experiment
+
+    queries_before = counters.snapshot_queries()
+    start = time.perf_counter()
+    result = run_experiment.delay(data["prompt_id"], f"bench-{uuid.uuid4().hex[:8]}")
+    experiment_id = await asyncio.to_thread(result.get, timeout=args.timeout, propagate=False)
+
+    # the task only dispatches the shards; wait for the experiment row to settle
+    status = "running"
+    deadline = time.monotonic() + args.timeout
+    while status == "running" and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        db = SessionLocal()
+        try:
+            status = db.query(Experiment.status).filter(Experiment.id == experiment_id).scalar()
+        finally:
+            db.close()
+    elapsed = time.perf_counter() - start
+
+    return {"experiment": {
+        "status": status,
+        "versions": args.versions,
+        "examples": args.examples,
+        "cells": args.versions * args.examples,
+        "wall_seconds": round(elapsed, 3),
+        "cells_per_second": round(args.versions * args.examples / elapsed, 2),
+        "queue_wait": percentiles(
+            [counters.started[result.id] - counters.published[result.id]]
+            if result.id in counters.started else []
+        ),
+        "db_queries": counters.snapshot_queries() - queries_before,
+    }}
+
+
+SCENARIOS = {
+    "run": scenario_run,
+    "runs": scenario_runs,
+    "evaluate": scenario_evaluate,
+    "experiment": scenario_experiment,
+}
+
+
+# -- main --------------------------------------------------------------------
+
+def git_sha() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main(args) -> dict:
+    from celery.contrib.testing.worker import start_worker
+
+    from app.main import app
+
+    setup_celery()
+    data = setup_database(args.versions, args.examples)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    with start_worker(
+        celery_app,
+        pool="threads",
+        concurrency=args.workers,
+        queues=["llm_tasks_queue", "celery"],
+        perform_ping_check=False,
+        shutdown_timeout=args.timeout,
+    ):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench/api/v1", headers=headers, timeout=args.timeout
+        ) as client:
+            for name in args.scenarios:
+                print(f"running scenario: {name}", file=sys.stderr)
+                results[name] = await SCENARIOS[name](client, args, data)
+
+    return {
+        "git_sha": git_sha(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "workers": args.workers,
+            "versions": args.versions,
+            "examples": args.examples,
+            "evaluations": args.evaluations,
+            "database": settings.DATABASE_URL.split(":")[0],
+            "llm_backend": settings.llm_backend,
+            "fake_llm_ttft_ms": settings.fake_llm_ttft_ms,
+            "fake_llm_tokens_per_second": settings.fake_llm_tokens_per_second,
+        },
+        "scenarios": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated: " + ",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per HTTP scenario")
+    parser.add_argument("--workers", type=int, default=8, help="Celery worker threads")
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--examples", type=int, default=20)
+    parser.add_argument("--evaluations", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<timestamp>-<sha>.json)")
+    args = parser.parse_args(argv)
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.utcnow():%Y%m%d-%H%M%S}-{report['git_sha']}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(report["scenarios"], indent=2))
+    print(f"results written to {output}", file=sys.stderr)
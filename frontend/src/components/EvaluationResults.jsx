@@ -11,6 +11,7 @@ const EvaluationResults = ({ promptId, versionId, isOpen, onClose }) => {
   const [evaluating, setEvaluating] = useState(false);
   const [results, setResults] = useState(null);
   const [error, setError] = useState(null);
+  const [progress, setProgress] = useState(null);
 
   useEffect(() => {
     if (isOpen && promptId && versionId) {
@@ -18,16 +19,29 @@ const EvaluationResults = ({ promptId, versionId, isOpen, onClose }) => {
     }
   }, [isOpen, promptId, versionId]);
 
+  // queue the evaluation, then poll the job until it finishes
+  const evaluate = async () => {
+    const { job_id } = await evaluationService.run(promptId, versionId);
+    setProgress(null);
+    for (;;) {
+      await new Promise(resolve => setTimeout(resolve, 1500));
+      const job = await evaluationService.getStatus(job_id);
+      if (job.status === 'success') return job.result;
+      if (job.status === 'failed') throw new Error(job.error || 'Evaluation failed');
+      setProgress(job.progress);
+    }
+  };
+
   const runEvaluation = async () => {
     setLoading(true);
     setError(null);
     try {
-      const data = await evaluationService.run(promptId, versionId);
-      setResults(data);
+      setResults(await evaluate());
     } catch (err) {
-      setError(err.response?.data?.detail || err.friendlyMessage || 'Failed to run evaluation');
+      setError(err.response?.data?.detail || err.friendlyMessage || err.message || 'Failed to run evaluation');
     } finally {
       setLoading(false);
+      setProgress(null);
     }
   };
 
@@ -35,12 +49,12 @@ const EvaluationResults = ({ promptId, versionId, isOpen, onClose }) => {
     setEvaluating(true);
     setError(null);
     try {
-      const data = await evaluationService.run(promptId, versionId);
-      setResults(data);
+      setResults(await evaluate());
     } catch (err) {
-      setError(err.response?.data?.detail || err.friendlyMessage || 'Failed to run evaluation');
+      setError(err.response?.data?.detail || err.friendlyMessage || err.message || 'Failed to run evaluation');
     } finally {
       setEvaluating(false);
+      setProgress(null);
     }
   };
 
@@ -96,6 +110,11 @@ const EvaluationResults = ({ promptId, versionId, isOpen, onClose }) => {
           <div className="text-center py-12">
             <RefreshCw className="h-8 w-8 animate-spin text-primary-400 mx-auto mb-3" />
             <p className="text-sm text-slate-400">Running evaluation against golden examples...</p>
+            {progress && (
+              <p className="text-xs text-slate-500 mt-1">
+                {progress.phase === 'judging' ? 'Judging' : 'Generating'} · {progress.completed} / {progress.total} examples
+              </p>
+            )}
           </div>
         )}
 
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { goldenExampleService } from '../services/api';
 import { Plus, Download, Upload } from 'lucide-react';
 import Modal from './Modal';
@@ -11,6 +11,9 @@ const GoldenExamples = ({ promptId }) => {
   const [expectedOutput, setExpectedOutput] = useState('');
   const [formError, setFormError] = useState('');
   const [creating, setCreating] = useState(false);
+  const [importing, setImporting] = useState(false);
+  const [importSummary, setImportSummary] = useState(null);
+  const fileInput = useRef(null);
 
   useEffect(() => {
     if (promptId) fetchExamples();
@@ -58,13 +61,33 @@ const GoldenExamples = ({ promptId }) => {
     }
   };
 
-  const exportExamples = () => {
-    const blob = new Blob([JSON.stringify(examples, null, 2)], { type: 'application/json' });
-    const url = URL.createObjectURL(blob);
-    const a = document.createElement('a');
-    a.href = url;
-    a.download = `golden-examples-${promptId}.json`;
-    a.click();
+  const exportExamples = async () => {
+    try {
+      const blob = await goldenExampleService.export(promptId, 'jsonl');
+      const url = URL.createObjectURL(blob);
+      const a = document.createElement('a');
+      a.href = url;
+      a.download = `golden-examples-${promptId}.jsonl`;
+      a.click();
+    } catch (err) {
+      console.error('Failed to export golden examples', err);
+    }
+  };
+
+  const importExamples = async (e) => {
+    const file = e.target.files?.[0];
+    e.target.value = '';
+    if (!file) return;
+    setImporting(true);
+    setImportSummary(null);
+    try {
+      setImportSummary(await goldenExampleService.import(promptId, file));
+      fetchExamples();
+    } catch (err) {
+      setImportSummary({ error: err.friendlyMessage || 'Import failed' });
+    } finally {
+      setImporting(false);
+    }
   };
 
   const formatInput = (data) => {
@@ -84,6 +107,14 @@ const GoldenExamples = ({ promptId }) => {
           >
             <Plus className="h-3.5 w-3.5" /> Add
           </button>
+          <button
+            onClick={() => fileInput.current?.click()}
+            disabled={importing}
+            className="btn-ghost text-xs flex items-center gap-1.5 text-slate-400"
+          >
+            <Upload className="h-3.5 w-3.5" /> {importing ? 'Importing...' : 'Import'}
+          </button>
+          <input ref={fileInput} type="file" accept=".jsonl,.csv" className="hidden" onChange={importExamples} />
           {examples.length > 0 && (
             <button onClick={exportExamples} className="btn-ghost text-xs flex items-center gap-1.5 text-slate-400">
               <Download className="h-3.5 w-3.5" /> Export
@@ -93,6 +124,15 @@ const GoldenExamples = ({ promptId }) => {
         <span className="text-[11px] text-slate-500">{examples.length} example{examples.length !== 1 ? 's' : ''}</span>
       </div>
 
+      {importSummary && (
+        <p className={`text-[11px] ${importSummary.error ? 'text-red-400' : 'text-slate-400'}`}>
+          {importSummary.error
+            ? importSummary.error
+            : `Imported ${importSummary.imported}, skipped ${importSummary.skipped}` +
+              (importSummary.errors?.length ? ` (line ${importSummary.errors[0].line}: ${importSummary.errors[0].error})` : '')}
+        </p>
+      )}
+
       {loading ? (
         <div className="text-center py-4">
           <div className="h-4 skeleton w-32 mx-auto rounded" />
@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useCallback } from 'react';
-import { runApiService, promptService, experimentService } from '../services/api';
+import { analyticsService } from '../services/api';
 import {
   BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer,
   LineChart, Line, PieChart, Pie, Cell, AreaChart, Area, RadarChart, Radar,
@@ -10,22 +10,22 @@ import {
 } from 'lucide-react';
 import { format } from 'date-fns';
 
+const HOURS = 24;
+
 const Analytics = () => {
-  const [runs, setRuns] = useState([]);
-  const [prompts, setPrompts] = useState([]);
-  const [experiments, setExperiments] = useState([]);
+  const [summary, setSummary] = useState(null);
+  const [series, setSeries] = useState([]);
   const [loading, setLoading] = useState(true);
 
+  // server-side hourly rollups: the payload grows with hours x models, not with runs
   const fetchData = useCallback(async () => {
     try {
-      const [runsData, promptsData, experimentsData] = await Promise.all([
-        runApiService.list(0, 200),
-        promptService.list(0, 100),
-        experimentService.list(0, 100),
+      const [summaryData, seriesData] = await Promise.all([
+        analyticsService.summary(HOURS),
+        analyticsService.timeseries(HOURS),
       ]);
-      setRuns(runsData || []);
-      setPrompts(promptsData || []);
-      setExperiments(experimentsData || []);
+      setSummary(summaryData);
+      setSeries(seriesData?.points || []);
     } catch (err) {
       console.error(err);
     } finally {
@@ -35,56 +35,27 @@ const Analytics = () => {
 
   useEffect(() => { fetchData(); }, [fetchData]);
 
-  // Model usage pie
-  const modelUsage = runs.reduce((acc, r) => {
-    const model = r.model || 'unknown';
-    acc[model] = (acc[model] || 0) + 1;
-    return acc;
-  }, {});
-  const modelPieData = Object.entries(modelUsage).map(([name, value]) => ({ name, value }));
+  const totals = summary?.totals || { runs: 0, errors: 0, avg_latency_ms: null };
+  const byModel = summary?.by_model || [];
+  const successRate = totals.runs > 0 ? ((totals.runs - totals.errors) / totals.runs) * 100 : 0;
 
-  // Success rate over time (grouped by hour)  
-  const hourlyData = {};
-  runs.forEach(r => {
-    if (!r.created_at) return;
-    const hour = format(new Date(r.created_at), 'MM/dd HH:00');
-    if (!hourlyData[hour]) hourlyData[hour] = { total: 0, success: 0, latency: [] };
-    hourlyData[hour].total++;
-    if (r.status === 'success' || r.status === 'completed') hourlyData[hour].success++;
-    if (r.latency_ms) hourlyData[hour].latency.push(r.latency_ms);
-  });
+  // Model usage pie
+  const modelPieData = byModel.map(m => ({ name: m.model, value: m.runs }));
 
-  const timeSeriesData = Object.entries(hourlyData)
-    .sort(([a], [b]) => a.localeCompare(b))
-    .slice(-24)
-    .map(([time, data]) => ({
-      time,
-      successRate: data.total > 0 ? ((data.success / data.total) * 100).toFixed(1) : 0,
-      avgLatency: data.latency.length > 0 ? Math.round(data.latency.reduce((a, b) => a + b, 0) / data.latency.length) : 0,
-      runs: data.total,
-    }));
+  // Success rate and latency over time (hourly rollups)
+  const timeSeriesData = series.map(p => ({
+    time: format(new Date(p.bucket), 'MM/dd HH:00'),
+    successRate: p.runs > 0 ? (((p.runs - p.errors) / p.runs) * 100).toFixed(1) : 0,
+    avgLatency: p.avg_latency_ms ? Math.round(p.avg_latency_ms) : 0,
+    runs: p.runs,
+  }));
 
   // Latency distribution histogram
-  const latencyBuckets = { '0-100': 0, '100-500': 0, '500-1000': 0, '1000-2000': 0, '2000+': 0 };
-  runs.forEach(r => {
-    const ms = r.latency_ms || 0;
-    if (ms <= 100) latencyBuckets['0-100']++;
-    else if (ms <= 500) latencyBuckets['100-500']++;
-    else if (ms <= 1000) latencyBuckets['500-1000']++;
-    else if (ms <= 2000) latencyBuckets['1000-2000']++;
-    else latencyBuckets['2000+']++;
-  });
-  const latencyHistData = Object.entries(latencyBuckets).map(([range, count]) => ({ range, count }));
-
-  // Model comparison radar
-  const modelStats = {};
-  runs.forEach(r => {
-    const m = r.model || 'unknown';
-    if (!modelStats[m]) modelStats[m] = { total: 0, success: 0, totalLatency: 0, count: 0 };
-    modelStats[m].total++;
-    if (r.status === 'success' || r.status === 'completed') modelStats[m].success++;
-    if (r.latency_ms) { modelStats[m].totalLatency += r.latency_ms; modelStats[m].count++; }
-  });
+  const edges = summary?.latency_histogram?.edges_ms || [];
+  const latencyHistData = (summary?.latency_histogram?.counts || []).map((count, i) => ({
+    range: i < edges.length ? `${i ? edges[i - 1] : 0}-${edges[i]}` : `${edges[edges.length - 1]}+`,
+    count,
+  }));
 
   const CHART_COLORS = ['#8b5cf6', '#06b6d4', '#f59e0b', '#ef4444', '#10b981', '#ec4899'];
 
@@ -112,7 +83,10 @@ const Analytics = () => {
       <div className="flex justify-between items-center animate-fade-in">
         <div>
           <h2 className="text-2xl font-bold text-white">Analytics</h2>
-          <p className="text-sm text-slate-400 mt-1">Performance insights & trends</p>
+          <p className="text-sm text-slate-400 mt-1">
+            Performance insights & trends · last {HOURS} hours
+            {summary?.as_of && ` · updated ${format(new Date(summary.as_of), 'HH:mm')}`}
+          </p>
         </div>
         <button onClick={fetchData} className="btn-secondary flex items-center gap-2">
           <RefreshCw className="h-4 w-4" /> Refresh
@@ -121,16 +95,16 @@ const Analytics = () => {
 
       {/* Summary Stats */}
       <div className="grid grid-cols-2 sm:grid-cols-4 gap-4 animate-fade-in" style={{ animationDelay: '0.05s' }}>
-        <MiniStat label="Total Runs" value={runs.length} icon={TrendingUp} />
+        <MiniStat label="Total Runs" value={totals.runs} icon={TrendingUp} />
         <MiniStat
           label="Avg Latency"
-          value={`${runs.length > 0 ? Math.round(runs.reduce((a, r) => a + (r.latency_ms || 0), 0) / runs.length) : 0}ms`}
+          value={`${totals.avg_latency_ms ? Math.round(totals.avg_latency_ms) : 0}ms`}
           icon={Clock}
         />
-        <MiniStat label="Models Used" value={Object.keys(modelUsage).length} icon={Layers} />
+        <MiniStat label="Models Used" value={byModel.length} icon={Layers} />
         <MiniStat
           label="Success Rate"
-          value={`${runs.length > 0 ? ((runs.filter(r => r.status === 'success' || r.status === 'completed').length / runs.length) * 100).toFixed(1) : 0}%`}
+          value={`${successRate.toFixed(1)}%`}
           icon={Activity}
         />
       </div>
@@ -255,7 +229,7 @@ const Analytics = () => {
       </div>
 
       {/* Model Performance Table */}
-      {Object.keys(modelStats).length > 0 && (
+      {byModel.length > 0 && (
         <div className="glass-card rounded-2xl overflow-hidden animate-fade-in" style={{ animationDelay: '0.3s' }}>
           <div className="px-6 py-4 border-b border-white/5">
             <h3 className="text-sm font-semibold text-white">Model Performance Comparison</h3>
@@ -268,28 +242,40 @@ const Analytics = () => {
                   <th>Total Runs</th>
                   <th>Success Rate</th>
                   <th>Avg Latency</th>
+                  <th>p95 Latency</th>
+                  <th>Tokens</th>
+                  <th>Cost</th>
                 </tr>
               </thead>
               <tbody>
-                {Object.entries(modelStats).map(([model, stats]) => (
-                  <tr key={model}>
-                    <td><span className="text-white font-medium">{model}</span></td>
-                    <td>{stats.total}</td>
-                    <td>
-                      <span className={
-                        (stats.success / stats.total) >= 0.8 ? 'text-emerald-400' :
-                        (stats.success / stats.total) >= 0.5 ? 'text-amber-400' : 'text-red-400'
-                      }>
-                        {((stats.success / stats.total) * 100).toFixed(1)}%
-                      </span>
-                    </td>
-                    <td>
-                      <span className="font-mono text-xs">
-                        {stats.count > 0 ? `${Math.round(stats.totalLatency / stats.count)}ms` : '—'}
-                      </span>
-                    </td>
-                  </tr>
-                ))}
+                {byModel.map((stats) => {
+                  const success = stats.runs > 0 ? (stats.runs - stats.errors) / stats.runs : 0;
+                  const p95 = stats.latency_percentiles_ms?.p95;
+                  return (
+                    <tr key={stats.model}>
+                      <td><span className="text-white font-medium">{stats.model}</span></td>
+                      <td>{stats.runs}</td>
+                      <td>
+                        <span className={
+                          success >= 0.8 ? 'text-emerald-400' :
+                          success >= 0.5 ? 'text-amber-400' : 'text-red-400'
+                        }>
+                          {(success * 100).toFixed(1)}%
+                        </span>
+                      </td>
+                      <td>
+                        <span className="font-mono text-xs">
+                          {stats.avg_latency_ms ? `${Math.round(stats.avg_latency_ms)}ms` : '—'}
+                        </span>
+                      </td>
+                      <td>
+                        <span className="font-mono text-xs">{p95 ? `${Math.round(p95)}ms` : '—'}</span>
+                      </td>
+                      <td>{(stats.tokens_in + stats.tokens_out).toLocaleString()}</td>
+                      <td><span className="font-mono text-xs">${stats.cost_usd.toFixed(4)}</span></td>
+                    </tr>
+                  );
+                })}
               </tbody>
             </table>
           </div>
@@ -1,6 +1,6 @@
 import React, { useEffect, useState, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { promptService, runApiService, experimentService } from '../services/api';
+import { analyticsService, runApiService, experimentService } from '../services/api';
 import {
   BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer,
   LineChart, Line, PieChart, Pie, Cell, AreaChart, Area
@@ -11,10 +11,13 @@ import {
 } from 'lucide-react';
 import { format, formatDistanceToNow } from 'date-fns';
 
+const HOURS = 24;
+
 const Dashboard = () => {
   const navigate = useNavigate();
+  const [summary, setSummary] = useState(null);
+  const [series, setSeries] = useState([]);
   const [runs, setRuns] = useState([]);
-  const [prompts, setPrompts] = useState([]);
   const [experiments, setExperiments] = useState([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
@@ -24,14 +27,17 @@ const Dashboard = () => {
       if (isRefresh) setRefreshing(true);
       else setLoading(true);
 
-      const [runsData, promptsData, experimentsData] = await Promise.all([
-        runApiService.list(0, 50),
-        promptService.list(0, 100),
-        experimentService.list(0, 100),
+      // aggregates come from the server-side rollups; only the 5 most recent rows are listed
+      const [summaryData, seriesData, runsData, experimentsData] = await Promise.all([
+        analyticsService.summary(HOURS),
+        analyticsService.timeseries(HOURS),
+        runApiService.list(0, 5),
+        experimentService.list(0, 5),
       ]);
 
+      setSummary(summaryData);
+      setSeries(seriesData?.points || []);
       setRuns(runsData || []);
-      setPrompts(promptsData || []);
       setExperiments(experimentsData || []);
     } catch (error) {
       console.error('Error fetching data:', error);
@@ -47,32 +53,35 @@ const Dashboard = () => {
     return () => clearInterval(interval);
   }, [fetchData]);
 
-  // Calculate stats
-  const totalRuns = runs.length;
-  const successRuns = runs.filter(r => r.status === 'success' || r.status === 'completed').length;
-  const failedRuns = runs.filter(r => r.status === 'failed').length;
-  const pendingRuns = runs.filter(r => r.status === 'pending' || r.status === 'processing').length;
-  const successRate = totalRuns > 0 ? ((successRuns / totalRuns) * 100) : 0;
-  const avgLatency = totalRuns > 0 ? runs.reduce((a, r) => a + (r.latency_ms || 0), 0) / totalRuns : 0;
-  const activeModels = new Set(runs.map(r => r.model).filter(Boolean)).size;
+  // Stats over the last HOURS (finished runs) plus the runs still in flight
+  const totals = summary?.totals || { runs: 0, errors: 0, avg_latency_ms: null };
+  const inFlight = summary?.in_flight || {};
+  const totalRuns = totals.runs;
+  const successRate = totalRuns > 0 ? (((totalRuns - totals.errors) / totalRuns) * 100) : 0;
+  const avgLatency = totals.avg_latency_ms || 0;
+  const activeModels = (summary?.by_model || []).length;
 
   // Chart data
-  const latencyData = runs.slice().reverse().slice(-20).map(r => ({
-    time: r.created_at ? format(new Date(r.created_at), 'HH:mm') : '',
-    latency: r.latency_ms || 0,
-    status: r.status,
+  const latencyData = series.map(p => ({
+    time: format(new Date(p.bucket), 'HH:mm'),
+    latency: p.avg_latency_ms ? Math.round(p.avg_latency_ms) : 0,
+    p95: p.latency_percentiles_ms?.p95 ? Math.round(p.latency_percentiles_ms.p95) : 0,
   }));
 
-  const statusCounts = runs.reduce((acc, r) => {
-    acc[r.status] = (acc[r.status] || 0) + 1;
-    return acc;
-  }, {});
+  const statusCounts = {
+    completed: totalRuns - totals.errors,
+    failed: totals.errors,
+    pending: inFlight.pending || 0,
+    running: inFlight.running || 0,
+  };
 
-  const pieData = Object.entries(statusCounts).map(([name, value]) => ({ name, value }));
+  const pieData = Object.entries(statusCounts)
+    .filter(([, value]) => value > 0)
+    .map(([name, value]) => ({ name, value }));
 
   const COLORS = {
     success: '#34d399', completed: '#34d399', failed: '#f87171',
-    pending: '#fbbf24', processing: '#60a5fa',
+    pending: '#fbbf24', processing: '#60a5fa', running: '#60a5fa',
   };
 
   if (loading) {
@@ -113,7 +122,7 @@ const Dashboard = () => {
       {/* Stats Grid */}
       <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-6 gap-4">
         <StatCard
-          title="Total Runs"
+          title={`Runs (${HOURS}h)`}
           value={totalRuns}
           icon={TrendingUp}
           color="from-blue-500 to-cyan-400"
@@ -138,14 +147,14 @@ const Dashboard = () => {
         />
         <StatCard
           title="Prompts"
-          value={prompts.length}
+          value={summary?.prompts ?? 0}
           icon={Terminal}
           color="from-violet-500 to-purple-400"
           delay="stagger-4"
         />
         <StatCard
           title="Experiments"
-          value={experiments.length}
+          value={summary?.experiments ?? 0}
           icon={Beaker}
           color="from-pink-500 to-rose-400"
           delay="stagger-5"
@@ -182,7 +191,7 @@ const Dashboard = () => {
           <div className="flex items-center justify-between mb-6">
             <div>
               <h3 className="text-sm font-semibold text-white">Latency Trend</h3>
-              <p className="text-xs text-slate-500 mt-0.5">Last 20 runs (ms)</p>
+              <p className="text-xs text-slate-500 mt-0.5">Hourly avg and p95, last {HOURS} hours (ms)</p>
             </div>
             <Activity className="h-5 w-5 text-primary-400" />
           </div>
@@ -207,7 +216,8 @@ const Dashboard = () => {
                       color: '#e2e8f0'
                     }}
                   />
-                  <Area type="monotone" dataKey="latency" stroke="#8b5cf6" strokeWidth={2} fill="url(#latencyGradient)" />
+                  <Area type="monotone" dataKey="latency" stroke="#8b5cf6" strokeWidth={2} fill="url(#latencyGradient)" name="Avg" />
+                  <Area type="monotone" dataKey="p95" stroke="#f59e0b" strokeWidth={1.5} fill="none" name="p95" />
                 </AreaChart>
               </ResponsiveContainer>
             ) : (
@@ -77,6 +77,29 @@ const Experiments = () => {
     }
   };
 
+  const resumeExperiment = async () => {
+    try {
+      await experimentService.resume(experimentResults.experiment_id);
+      setExperimentResults(await experimentService.getStatus(experimentResults.experiment_id));
+      fetchExperiments();
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
+  // poll partial results while the experiment is still running
+  useEffect(() => {
+    if (!showResultsModal || experimentResults?.status !== 'running') return;
+    const timer = setTimeout(async () => {
+      try {
+        setExperimentResults(await experimentService.getStatus(experimentResults.experiment_id));
+      } catch (err) {
+        console.error(err);
+      }
+    }, 3000);
+    return () => clearTimeout(timer);
+  }, [showResultsModal, experimentResults]);
+
   const filtered = experiments.filter(exp => {
     if (statusFilter !== 'all' && exp.status !== statusFilter) return false;
     if (searchQuery) {
@@ -280,6 +303,27 @@ const Experiments = () => {
               )}
             </div>
 
+            {/* Progress */}
+            {experimentResults.status === 'running' && experimentResults.progress && (
+              <div className="glass-card rounded-xl p-4">
+                <div className="flex items-center justify-between mb-2">
+                  <p className="text-xs text-slate-500">
+                    {experimentResults.progress.completed_cells} / {experimentResults.progress.total_cells} cells
+                  </p>
+                  <p className="text-xs text-slate-400">
+                    {experimentResults.progress.percent}%
+                    {experimentResults.progress.eta_seconds != null && ` · ~${Math.ceil(experimentResults.progress.eta_seconds)}s left`}
+                  </p>
+                </div>
+                <div className="h-2 rounded-full bg-white/5 overflow-hidden">
+                  <div
+                    className="h-full bg-primary-500 transition-all duration-500"
+                    style={{ width: `${experimentResults.progress.percent}%` }}
+                  />
+                </div>
+              </div>
+            )}
+
             {/* Score Chart */}
             {getChartData().length > 0 && (
               <div className="glass-card rounded-xl p-6">
@@ -347,7 +391,7 @@ const Experiments = () => {
                       </div>
 
                       {/* Test Metrics */}
-                      <div className="grid grid-cols-2 gap-2 mt-2">
+                      <div className="grid grid-cols-2 sm:grid-cols-4 gap-2 mt-2">
                         <div className="bg-white/5 rounded-lg p-2.5">
                           <p className="text-[10px] text-slate-500">Failures</p>
                           <p className="text-sm font-bold text-slate-300">{res.failure_count || 0}</p>
@@ -356,6 +400,20 @@ const Experiments = () => {
                           <p className="text-[10px] text-slate-500">Total Examples</p>
                           <p className="text-sm font-bold text-slate-300">{res.total_examples || 0}</p>
                         </div>
+                        <div className="bg-white/5 rounded-lg p-2.5">
+                          <p className="text-[10px] text-slate-500">Median</p>
+                          <p className="text-sm font-bold text-slate-300">
+                            {res.median_score != null ? (res.median_score * 100).toFixed(0) + '%' : 'N/A'}
+                          </p>
+                        </div>
+                        <div className="bg-white/5 rounded-lg p-2.5">
+                          <p className="text-[10px] text-slate-500">95% CI</p>
+                          <p className="text-sm font-bold text-slate-300">
+                            {res.ci_low != null
+                              ? `${(res.ci_low * 100).toFixed(0)}–${(res.ci_high * 100).toFixed(0)}%`
+                              : 'N/A'}
+                          </p>
+                        </div>
                       </div>
                     </div>
                   ))}
@@ -365,6 +423,11 @@ const Experiments = () => {
 
             {/* Export */}
             <div className="flex justify-end gap-3">
+              {experimentResults.status === 'failed' && (
+                <button onClick={resumeExperiment} className="btn-secondary text-xs flex items-center gap-1.5">
+                  <Play className="h-3.5 w-3.5" /> Resume
+                </button>
+              )}
               <button
                 onClick={() => {
                   const blob = new Blob([JSON.stringify(experimentResults, null, 2)], { type: 'application/json' });
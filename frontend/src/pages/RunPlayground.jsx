@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useCallback } from 'react';
-import { runApiService, promptService } from '../services/api';
+import { runApiService, promptService, modelService } from '../services/api';
 import { format, formatDistanceToNow } from 'date-fns';
 import {
   Play, RefreshCw, Search, Filter, Eye, RotateCcw,
@@ -23,8 +23,10 @@ const RunPlayground = () => {
   const [formData, setFormData] = useState({
     prompt_version_id: '',
     input_data: '{\n  \n}',
-    model: 'gpt-4o',
+    model: '',
   });
+  const [models, setModels] = useState([]);
+  const [streamOutput, setStreamOutput] = useState(true);
   const [submitting, setSubmitting] = useState(false);
   const [submitResult, setSubmitResult] = useState(null);
 
@@ -55,10 +57,14 @@ const RunPlayground = () => {
     return () => clearInterval(interval);
   }, [autoRefresh, fetchRuns]);
 
-  // Load prompts for create modal
+  // Load prompts and models for create modal
   useEffect(() => {
     if (showCreateModal) {
       promptService.list().then(setPrompts).catch(console.error);
+      modelService.list().then(data => {
+        setModels(data.models || []);
+        setFormData(prev => ({ ...prev, model: prev.model || data.default }));
+      }).catch(console.error);
     }
   }, [showCreateModal]);
 
@@ -96,11 +102,18 @@ const RunPlayground = () => {
         return;
       }
 
-      const res = await runApiService.create({
+      const payload = {
         prompt_version_id: formData.prompt_version_id,
         model: formData.model,
         variables: parsedVars,
-      });
+      };
+
+      if (streamOutput) {
+        await handleStreamRun(payload);
+        return;
+      }
+
+      const res = await runApiService.create(payload);
 
       setSubmitResult({
         type: 'success',
@@ -121,6 +134,27 @@ const RunPlayground = () => {
     }
   };
 
+  const handleStreamRun = async (payload) => {
+    setSubmitResult({ type: 'success', message: 'Streaming...', streamed: '' });
+
+    await runApiService.stream(payload, {
+      onStart: ({ run_id }) => {
+        setSubmitResult(prev => ({ ...prev, message: `Run created! ID: ${run_id}` }));
+      },
+      onToken: (token) => {
+        setSubmitResult(prev => ({ ...prev, streamed: (prev?.streamed || '') + token }));
+      },
+      onDone: (metrics) => {
+        setSubmitResult(prev => ({ ...prev, finalStatus: metrics }));
+        fetchRuns();
+      },
+      onError: ({ error }) => {
+        setSubmitResult(prev => ({ ...prev, type: 'error', message: error || 'Streaming failed' }));
+        fetchRuns();
+      },
+    });
+  };
+
   const pollRunStatus = async (taskId) => {
     const interval = setInterval(async () => {
       try {
@@ -345,9 +379,7 @@ const RunPlayground = () => {
               onChange={(e) => setFormData({ ...formData, model: e.target.value })}
               className="input-dark w-full"
             >
-              <option value="gpt-4o">gpt-4o</option>
-              <option value="gpt-3.5-turbo">gpt-3.5-turbo</option>
-              <option value="gpt-4o-mini">gpt-4o-mini</option>
+              {models.map(m => <option key={m} value={m}>{m}</option>)}
             </select>
           </div>
 
@@ -363,6 +395,16 @@ const RunPlayground = () => {
             />
           </div>
 
+          {/* Streaming */}
+          <label className="flex items-center gap-2 text-sm text-slate-300">
+            <input
+              type="checkbox"
+              checked={streamOutput}
+              onChange={(e) => setStreamOutput(e.target.checked)}
+            />
+            Stream output as it is generated
+          </label>
+
           {/* Result */}
           {submitResult && (
             <div className={`rounded-xl p-4 ${
@@ -380,6 +422,11 @@ const RunPlayground = () => {
                   {submitResult.message}
                 </span>
               </div>
+              {submitResult.streamed !== undefined && (
+                <pre className="code-block text-xs max-h-60 overflow-auto mt-3 whitespace-pre-wrap">
+                  {submitResult.streamed}
+                </pre>
+              )}
               {submitResult.finalStatus && (
                 <div className="mt-3">
                   <p className="text-xs text-slate-400 mb-1">Result:</p>
@@ -426,6 +473,18 @@ const RunPlayground = () => {
                 <p className="text-xs text-slate-500 mb-1">Latency</p>
                 <p className="text-sm font-mono text-white">{runDetail.latency_ms ? `${runDetail.latency_ms}ms` : '—'}</p>
               </div>
+              {runDetail.ttft_ms != null && (
+                <div className="glass-card rounded-xl p-4">
+                  <p className="text-xs text-slate-500 mb-1">Time to First Token</p>
+                  <p className="text-sm font-mono text-white">{runDetail.ttft_ms}ms</p>
+                </div>
+              )}
+              {runDetail.tokens_per_second != null && (
+                <div className="glass-card rounded-xl p-4">
+                  <p className="text-xs text-slate-500 mb-1">Tokens / sec</p>
+                  <p className="text-sm font-mono text-white">{runDetail.tokens_per_second}</p>
+                </div>
+              )}
             </div>
 
             {runDetail.output && (
@@ -28,6 +28,12 @@ api.interceptors.response.use(
   }
 );
 
+// Keyset pagination: pass the previous page's nextCursor to get the next page
+const listPage = async (url, cursor, limit) => {
+  const response = await api.get(url, { params: { limit, ...(cursor ? { cursor } : {}) } });
+  return { items: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+};
+
 // ===== Prompts =====
 export const promptService = {
   list: async (skip = 0, limit = 100) => {
@@ -35,6 +41,8 @@ export const promptService = {
     return data;
   },
 
+  listPage: (cursor = null, limit = 100) => listPage('/prompts', cursor, limit),
+
   create: async (payload) => {
     const { data } = await api.post('/prompts', payload);
     return data;
@@ -70,6 +78,8 @@ export const runApiService = {
     return data;
   },
 
+  listPage: (cursor = null, limit = 100) => listPage('/runs', cursor, limit),
+
   create: async (payload) => {
     const { data } = await api.post('/run', payload);
     return data;
@@ -79,6 +89,71 @@ export const runApiService = {
     const { data } = await api.get(`/task-status/${taskId}`);
     return data;
   },
+
+  // many runs of one version at once: { prompt_version_id, model, variables: [...] }
+  createBatch: async (payload) => {
+    const { data } = await api.post('/runs/batch', payload, { timeout: 0 });
+    return data;
+  },
+
+  getBatch: async (batchId) => {
+    const { data } = await api.get(`/runs/batch/${batchId}`);
+    return data;
+  },
+
+  // Streams tokens over SSE (axios can't read a response body incrementally in the browser)
+  stream: async (payload, { onStart, onToken, onDone, onError } = {}) => {
+    const response = await fetch(`${API_URL}/run/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Authorization: `Bearer ${getApiKey()}`,
+      },
+      body: JSON.stringify(payload),
+    });
+
+    if (!response.ok) {
+      const body = await response.json().catch(() => ({}));
+      throw { friendlyMessage: body.detail || `Request failed with status ${response.status}` };
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      const events = buffer.split('\n\n');
+      buffer = events.pop();
+
+      for (const raw of events) {
+        let event = 'message';
+        let data = '';
+        for (const line of raw.split('\n')) {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) data += line.slice(5).trim();
+        }
+        if (!data) continue;
+        const parsed = JSON.parse(data);
+
+        if (event === 'start') onStart?.(parsed);
+        else if (event === 'done') onDone?.(parsed);
+        else if (event === 'error') onError?.(parsed);
+        else onToken?.(parsed.token);
+      }
+    }
+  },
+};
+
+// ===== Models =====
+export const modelService = {
+  list: async () => {
+    const { data } = await api.get('/models');
+    return data;
+  },
 };
 
 // ===== Golden Examples =====
@@ -92,14 +167,40 @@ export const goldenExampleService = {
     const { data } = await api.post(`/prompts/${promptId}/golden-examples`, payload);
     return data;
   },
+
+  // bulk import of a .jsonl or .csv file; large files can take a while
+  import: async (promptId, file) => {
+    const form = new FormData();
+    form.append('file', file);
+    const { data } = await api.post(`/prompts/${promptId}/golden-examples/import`, form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+      timeout: 0,
+    });
+    return data;
+  },
+
+  export: async (promptId, format = 'jsonl') => {
+    const { data } = await api.get(`/prompts/${promptId}/golden-examples/export`, {
+      params: { format },
+      responseType: 'blob',
+      timeout: 0,
+    });
+    return data;
+  },
 };
 
 // ===== Evaluations =====
 export const evaluationService = {
+  // queues the evaluation; poll getStatus with the returned job_id
   run: async (promptId, versionId) => {
     const { data } = await api.post(`/prompts/${promptId}/versions/${versionId}/evaluate`);
     return data;
   },
+
+  getStatus: async (jobId) => {
+    const { data } = await api.get(`/evaluations/${jobId}/status`);
+    return data;
+  },
 };
 
 // ===== Experiments =====
@@ -109,6 +210,8 @@ export const experimentService = {
     return data;
   },
 
+  listPage: (cursor = null, limit = 100) => listPage('/experiments', cursor, limit),
+
   run: async (promptId, experimentName) => {
     const { data } = await api.post('/experiments/run', null, {
       params: { prompt_id: promptId, experiment_name: experimentName }
@@ -120,6 +223,28 @@ export const experimentService = {
     const { data } = await api.get(`/experiments/${experimentId}/status`);
     return data;
   },
+
+  resume: async (experimentId) => {
+    const { data } = await api.post(`/experiments/${experimentId}/resume`);
+    return data;
+  },
+};
+
+// ===== Analytics (server-side hourly rollups) =====
+export const analyticsService = {
+  // totals, per model and per prompt version over the last `hours`
+  summary: async (hours = 24, params = {}) => {
+    const { data } = await api.get('/analytics/summary', { params: { hours, ...params } });
+    return data;
+  },
+
+  // one point per hour; byModel splits each hour per model
+  timeseries: async (hours = 24, { byModel = false, ...params } = {}) => {
+    const { data } = await api.get('/analytics/timeseries', {
+      params: { hours, by_model: byModel, ...params },
+    });
+    return data;
+  },
 };
 
 // ===== Health =====